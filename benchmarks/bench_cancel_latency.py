@@ -0,0 +1,126 @@
+# benchmarks/bench_cancel_latency.py
+"""
+Benchmark: cancellation latency of a running download (cancel request -> download() returns).
+
+A local HTTP server streams a large file slowly; YtDlpDownloader downloads it with the
+worker's progress callback (CancellationToken.check), the job is canceled in the DB
+after a random delay and the time until the download aborts is recorded.
+
+Run from project root:
+    python -m benchmarks.bench_cancel_latency
+    python -m benchmarks.bench_cancel_latency --interval-ms 100 250 500 1000 --runs 10
+"""
+
+from __future__ import annotations
+
+import argparse
+import http.server
+import os
+import random
+import shutil
+import statistics
+import tempfile
+import threading
+import time
+from typing import List
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from video_downloader_api.db.models import Base
+from video_downloader_api.downloader.base import DownloadCanceledError
+from video_downloader_api.repositories.job_repo import JobRepository
+
+_SIZE = 200_000_000
+_CHUNK = 65536
+
+
+class _SlowHandler(http.server.BaseHTTPRequestHandler):
+    def log_message(self, *args) -> None:
+        pass
+
+    def _headers(self) -> None:
+        self.send_response(200)
+        self.send_header("Content-Type", "video/mp4")
+        self.send_header("Content-Length", str(_SIZE))
+        self.end_headers()
+
+    def do_HEAD(self) -> None:
+        self._headers()
+
+    def do_GET(self) -> None:
+        self._headers()
+        try:
+            for _ in range(_SIZE // _CHUNK):
+                self.wfile.write(b"\0" * _CHUNK)
+                time.sleep(0.005)
+        except OSError:
+            pass
+
+
+def _p95(values: List[float]) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(round(0.95 * (len(ordered) - 1))))]
+
+
+def main() -> None:
+    from video_downloader_api.downloader.ytdlp_downloader import YtDlpDownloader
+    from video_downloader_api.services.cancellation import CancellationToken
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--interval-ms", type=int, nargs="+", default=[100, 500, 1000])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _SlowHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/bench.mp4"
+
+    tmp_dir = tempfile.mkdtemp()
+    engine = create_engine(f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    make_session = sessionmaker(bind=engine, expire_on_commit=False)
+    downloader = YtDlpDownloader()
+
+    print(f"{'interval':>9} {'runs':>5} {'mean':>9} {'p95':>9} {'max':>9}")
+    try:
+        for interval_ms in args.interval_ms:
+            latencies: List[float] = []
+            for _ in range(args.runs):
+                with make_session() as db:
+                    repo = JobRepository(db)
+                    job_id = repo.create_job(source_url=url, platform="unknown", format_id="best", quality=None).id
+                    repo.update_status(job_id, "downloading")
+                    token = CancellationToken(job_id, lambda: repo, check_interval_ms=interval_ms)
+
+                    canceled_at: List[float] = []
+
+                    def _cancel(job_id: str = job_id) -> None:
+                        time.sleep(random.uniform(0.5, 1.5))
+                        with make_session() as other:
+                            canceled_at.append(time.perf_counter())
+                            JobRepository(other).cancel_jobs([job_id], active_statuses=("downloading",))
+
+                    threading.Thread(target=_cancel, daemon=True).start()
+                    try:
+                        downloader.download(
+                            url=url,
+                            format_id="best",
+                            output_path=os.path.join(tmp_dir, f"{job_id}.mp4"),
+                            progress_cb=lambda hook: token.check(),
+                        )
+                    except DownloadCanceledError:
+                        latencies.append((time.perf_counter() - canceled_at[0]) * 1000.0)
+            if latencies:
+                print(
+                    f"{interval_ms:>7}ms {len(latencies):>5} {statistics.mean(latencies):>7.0f}ms "
+                    f"{_p95(latencies):>7.0f}ms {max(latencies):>7.0f}ms"
+                )
+    finally:
+        server.shutdown()
+        engine.dispose()
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
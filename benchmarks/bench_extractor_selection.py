@@ -0,0 +1,98 @@
+# benchmarks/bench_extractor_selection.py
+"""
+Micro-benchmark: yt-dlp extractor selection overhead per call.
+
+Compares yt-dlp's generic URL matching (every extractor's suitable() in order,
+as YoutubeDL.extract_info does without ie_key) against the pinned selection
+used by YtDlpDownloader (pinned_ie_key: only the detected platform's extractors).
+
+No network access: only extractor selection is measured, which is the part the
+pinning removes. "cold" runs in a fresh interpreter (includes regex compilation
+on first use), "warm" is the steady-state cost per call.
+
+Run from project root:
+    python -m benchmarks.bench_extractor_selection
+"""
+
+from __future__ import annotations
+
+import statistics
+import subprocess
+import sys
+import time
+
+URLS = [
+    ("youtube", "https://youtube.com/watch?v=dQw4w9WgXcQ"),
+    ("youtube", "https://youtu.be/dQw4w9WgXcQ"),
+    ("instagram", "https://instagram.com/reel/Cabc123/"),
+    ("facebook", "https://facebook.com/watch/?v=123456"),
+    ("tiktok", "https://vm.tiktok.com/ZMabc/"),
+]
+
+_COLD_SNIPPET = """
+import time, sys
+from yt_dlp.extractor import gen_extractor_classes
+from video_downloader_api.downloader.ytdlp_downloader import pinned_ie_key
+url, platform, mode = sys.argv[1], sys.argv[2], sys.argv[3]
+classes = list(gen_extractor_classes())
+t = time.perf_counter()
+if mode == "generic":
+    next(ie for ie in classes if ie.suitable(url))
+else:
+    pinned_ie_key(url, platform)
+print(time.perf_counter() - t)
+"""
+
+
+def _generic(url: str, classes) -> str:
+    for ie in classes:
+        if ie.suitable(url):
+            return ie.ie_key()
+    return "Generic"
+
+
+def _cold(url: str, platform: str, mode: str) -> float:
+    out = subprocess.run(
+        [sys.executable, "-c", _COLD_SNIPPET, url, platform, mode],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    return float(out.stdout.strip().splitlines()[-1])
+
+
+def main(iterations: int = 200) -> None:
+    from yt_dlp.extractor import gen_extractor_classes
+
+    from video_downloader_api.downloader.ytdlp_downloader import pinned_ie_key
+
+    classes = list(gen_extractor_classes())
+    print(f"extractors: {len(classes)}  iterations: {iterations}")
+    print(f"{'url':<45} {'cold generic':>13} {'cold pinned':>12} {'warm generic':>13} {'warm pinned':>12}")
+
+    for platform, url in URLS:
+        # warm up both paths (regex compile) before timing steady state
+        _generic(url, classes)
+        pinned_ie_key(url, platform)
+
+        generic_times = []
+        pinned_times = []
+        for _ in range(iterations):
+            t = time.perf_counter()
+            _generic(url, classes)
+            generic_times.append(time.perf_counter() - t)
+
+            t = time.perf_counter()
+            pinned_ie_key(url, platform)
+            pinned_times.append(time.perf_counter() - t)
+
+        cold_generic = _cold(url, platform, "generic")
+        cold_pinned = _cold(url, platform, "pinned")
+        print(
+            f"{url:<45} {cold_generic * 1000:>11.2f}ms {cold_pinned * 1000:>10.2f}ms "
+            f"{statistics.median(generic_times) * 1e6:>11.1f}us {statistics.median(pinned_times) * 1e6:>10.1f}us"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,107 @@
+# benchmarks/bench_fair_queue.py
+"""
+Benchmark: weighted fair queuing of downloads across tenants (FairDispatcher on Redis).
+
+Tenant 0 submits a large playlist first, the other tenants a few jobs right after.
+Slots are freed one at a time (the oldest in-flight job completes) until every backlog
+is drained. Reports, per tenant: share of the first releases vs its plan weight, and the
+release position of its last job under FIFO (one shared queue) vs fair queuing.
+Needs a Redis server; uses a throwaway key prefix and deletes it afterwards.
+
+Run from project root:
+    python -m benchmarks.bench_fair_queue
+    python -m benchmarks.bench_fair_queue --redis-url redis://localhost:6379/0 --weights 1 1 4 --big 500
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+import uuid
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import Dict, List
+
+from video_downloader_api.core.config import get_settings
+from video_downloader_api.services.download_queues import DEFAULT_QUEUE
+from video_downloader_api.services.fair_queue import FairDispatcher
+
+
+def _jobs(tenant: str, n: int, start: datetime) -> List[SimpleNamespace]:
+    return [
+        SimpleNamespace(
+            id=f"{tenant}-{i}",
+            platform="unknown",
+            priority=5,
+            created_at=start + timedelta(milliseconds=i),
+        )
+        for i in range(n)
+    ]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--redis-url", default=get_settings().REDIS_URL)
+    parser.add_argument("--weights", type=int, nargs="+", default=[1, 1, 4], help="plan weight per tenant")
+    parser.add_argument("--big", type=int, default=500, help="jobs of tenant 0")
+    parser.add_argument("--small", type=int, default=20, help="jobs of every other tenant")
+    parser.add_argument("--capacity", type=int, default=4)
+    args = parser.parse_args()
+
+    prefix = f"bench:fair:{uuid.uuid4().hex[:8]}:"
+    dispatcher = FairDispatcher(args.redis_url, key_prefix=prefix, capacity={"default": args.capacity})
+    client = dispatcher._client()
+    if client is None:
+        raise SystemExit(f"Redis unavailable at {args.redis_url}")
+
+    tenants = [f"t{i}" for i in range(len(args.weights))]
+    weights: Dict[str, int] = dict(zip(tenants, args.weights))
+    # plan_weight() reads TENANT_PLANS/PLAN_WEIGHTS: one plan per tenant
+    settings = get_settings()
+    settings.TENANT_PLANS = {t: t for t in tenants}
+    settings.PLAN_WEIGHTS = dict(weights)
+
+    released: List[str] = []
+    dispatcher._publish = lambda queue, job_id, priority: released.append(job_id) or True
+
+    now = datetime.now(timezone.utc)
+    fifo: List[str] = []
+    try:
+        for i, tenant in enumerate(tenants):
+            jobs = _jobs(tenant, args.big if i == 0 else args.small, now + timedelta(seconds=i))
+            fifo.extend(job.id for job in jobs)
+            dispatcher.submit(tenant, jobs)
+        dispatcher.dispatch([DEFAULT_QUEUE])
+
+        t0 = time.perf_counter()
+        completed = 0
+        while completed < len(released):
+            dispatcher.complete(DEFAULT_QUEUE, released[completed])
+            completed += 1
+        elapsed = time.perf_counter() - t0
+    finally:
+        keys = list(client.scan_iter(match=f"{prefix}*"))
+        if keys:
+            client.delete(*keys)
+
+    # Releases while every tenant still has backlog: shares should follow the weights
+    counts = {t: args.big if i == 0 else args.small for i, t in enumerate(tenants)}
+    total = sum(weights.values())
+    window = min(len(released), int(min(counts[t] * total / weights[t] for t in tenants)))
+    first = Counter(job_id.split("-")[0] for job_id in released[:window])
+    print(f"jobs={len(fifo)} capacity={args.capacity} released={len(released)}")
+    print(f"{'tenant':>7} {'weight':>6} {'jobs':>5} {'share':>7} {'expected':>8} {'fifo last':>10} {'fair last':>10}")
+    for tenant in tenants:
+        share = first[tenant] / window if window else 0.0
+        fifo_last = max(n for n, j in enumerate(fifo) if j.startswith(f"{tenant}-")) + 1
+        fair_last = max(n for n, j in enumerate(released) if j.startswith(f"{tenant}-")) + 1
+        print(
+            f"{tenant:>7} {weights[tenant]:>6} {counts[tenant]:>5} {share:>6.1%} {weights[tenant] / total:>7.1%} "
+            f"{fifo_last:>10} {fair_last:>10}"
+        )
+    print(f"complete()+release: {elapsed / max(1, completed) * 1000:.3f} ms per job ({completed} jobs)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,135 @@
+# benchmarks/bench_info_memory.py
+"""
+Memory benchmark: retained size of one extraction result in the shapes we keep.
+
+- raw:      yt-dlp info dict as returned by extract_info (json.loads of a recording)
+- handoff:  compact_info(raw), what InfoHandoffStore serializes for the worker
+- VideoInfo: projection kept by MetadataService (raw dict dropped)
+- VideoInfoOut: deduped API response (what MetadataCache holds)
+
+Inputs are recorded info JSONs, e.g.:
+    yt-dlp -J "https://youtube.com/watch?v=..." > recordings/yt.json
+Without arguments a synthetic YouTube-like info (hundreds of formats with
+fragments/http_headers) is generated instead.
+
+Run from project root:
+    python -m benchmarks.bench_info_memory recordings/
+    python -m benchmarks.bench_info_memory a.json b.json
+"""
+
+from __future__ import annotations
+
+import argparse
+import gc
+import json
+import os
+import tracemalloc
+from typing import Any, Callable, Dict, List, Tuple
+
+
+def _synthetic_info(n_formats: int = 240) -> Dict[str, Any]:
+    headers = {
+        "User-Agent": "Mozilla/5.0 (X11; Linux x86_64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0",
+        "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+        "Accept-Language": "en-us,en;q=0.5",
+        "Sec-Fetch-Mode": "navigate",
+    }
+    heights = [144, 240, 360, 480, 720, 1080, 1440, 2160]
+    formats = []
+    for i in range(n_formats):
+        height = heights[i % len(heights)]
+        video = i % 3 != 0
+        formats.append(
+            {
+                "format_id": str(100 + i),
+                "format_note": f"{height}p",
+                "ext": "mp4" if i % 2 else "webm",
+                "height": height if video else None,
+                "width": height * 16 // 9 if video else None,
+                "fps": 30 if video else None,
+                "vcodec": "avc1.64001F" if video else "none",
+                "acodec": "mp4a.40.2" if not video or i % 5 == 0 else "none",
+                "filesize": 1_000_000 + i * 12_345,
+                "tbr": 1200.5 + i,
+                "url": f"https://rr1---sn-abc.googlevideo.com/videoplayback?expire=1700000000&itag={i}&" + "x" * 600,
+                "http_headers": dict(headers),
+                "fragments": [{"url": f"sq/{n}", "duration": 5.0} for n in range(40)] if i % 4 == 0 else None,
+                "protocol": "https",
+                "format": f"{100 + i} - {height}p",
+            }
+        )
+    return {
+        "id": "dQw4w9WgXcQ",
+        "title": "Synthetic video",
+        "duration": 212,
+        "thumbnail": "https://i.ytimg.com/vi/dQw4w9WgXcQ/maxresdefault.jpg",
+        "thumbnails": [{"url": f"https://i.ytimg.com/{n}.jpg", "id": str(n)} for n in range(40)],
+        "description": "lorem ipsum " * 200,
+        "automatic_captions": {
+            f"l{n}": [{"ext": "vtt", "url": "https://www.youtube.com/api/timedtext?" + "y" * 300}] * 6
+            for n in range(150)
+        },
+        "formats": formats,
+    }
+
+
+def _retained(build: Callable[[], Any]) -> Tuple[Any, int]:
+    """Bytes still allocated after build() returns (intermediates freed)."""
+    gc.collect()
+    tracemalloc.start()
+    base = tracemalloc.get_traced_memory()[0]
+    obj = build()
+    gc.collect()
+    size = tracemalloc.get_traced_memory()[0] - base
+    tracemalloc.stop()
+    return obj, size
+
+
+def _load_inputs(paths: List[str]) -> List[Tuple[str, str]]:
+    files: List[str] = []
+    for p in paths:
+        if os.path.isdir(p):
+            files.extend(os.path.join(p, f) for f in sorted(os.listdir(p)) if f.endswith(".json"))
+        else:
+            files.append(p)
+    out = []
+    for f in files:
+        with open(f, encoding="utf-8") as fh:
+            out.append((os.path.basename(f), fh.read()))
+    return out
+
+
+def main() -> None:
+    from video_downloader_api.downloader.ytdlp_downloader import YtDlpDownloader
+    from video_downloader_api.models.video_info import VideoInfo
+    from video_downloader_api.services.info_handoff import compact_info
+    from video_downloader_api.services.metadata_service import MetadataService
+    from video_downloader_api.services.platform_detector import PlatformDetector
+
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("paths", nargs="*", help="info JSON files or directories (default: synthetic)")
+    args = parser.parse_args()
+
+    inputs = _load_inputs(args.paths) or [("synthetic", json.dumps(_synthetic_info()))]
+    downloader = YtDlpDownloader()
+    service = MetadataService(downloader=downloader, detector=PlatformDetector(), playlist_workers=1)
+
+    print(f"{'input':<24} {'formats':>7} {'raw':>10} {'handoff':>10} {'VideoInfo':>10} {'response':>10} {'ratio':>7}")
+    for name, text in inputs:
+        raw, raw_size = _retained(lambda: json.loads(text))
+        _, handoff_size = _retained(lambda: compact_info(json.loads(text)))
+        url = str(raw.get("webpage_url") or "https://youtube.com/watch?v=x")
+        projected, info_size = _retained(
+            lambda: VideoInfo.from_raw("youtube", url, json.loads(text), downloader.list_formats(json.loads(text)))
+        )
+        _, out_size = _retained(lambda: service._build_video_info(projected))
+        n_formats = len(downloader.list_formats(raw))
+        ratio = raw_size / info_size if info_size else float("inf")
+        print(
+            f"{name[:24]:<24} {n_formats:>7} {raw_size / 1024:>8.1f}KB {handoff_size / 1024:>8.1f}KB "
+            f"{info_size / 1024:>8.1f}KB {out_size / 1024:>8.1f}KB {ratio:>6.0f}x"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,111 @@
+# benchmarks/bench_job_updates.py
+"""
+Benchmark: per-job progress update cost in JobRepository.
+
+- orm:     previous pattern (SELECT row via get_job, modify, COMMIT), one job at a time
+- direct:  update_progress (single UPDATE ... WHERE id=, COMMIT), one job at a time
+
+Each round ("tick") writes progress for every active job once.
+
+Run from project root (SQLite temp file by default; pass any SQLAlchemy URL,
+e.g. PostgreSQL with a driver installed):
+    python -m benchmarks.bench_job_updates
+    python -m benchmarks.bench_job_updates --database-url postgresql+psycopg://user:pw@localhost/bench
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import tempfile
+import time
+from typing import Callable, List
+
+from sqlalchemy import create_engine, delete
+from sqlalchemy.orm import Session, sessionmaker
+
+from video_downloader_api.db.models import Base, DownloadJob
+from video_downloader_api.repositories.job_repo import JobRepository, utc_now
+
+
+def _orm_update(repo: JobRepository, job_id: str, n: int) -> None:
+    job = repo.get_job(job_id)
+    if not job:
+        return
+    job.downloaded_bytes = n
+    job.total_bytes = 1_000_000
+    job.speed_bps = 1234.5
+    job.eta_sec = 10
+    job.updated_at = utc_now()
+    repo.db.add(job)
+    repo.db.commit()
+
+
+def _run(db: Session, job_ids: List[str], ticks: int, mode: str) -> float:
+    """Mean microseconds per job update."""
+    repo = JobRepository(db)
+    per_tick: List[float] = []
+    for tick in range(ticks):
+        t = time.perf_counter()
+        for jid in job_ids:
+            if mode == "orm":
+                _orm_update(repo, jid, tick)
+            else:
+                repo.update_progress(jid, tick, 1_000_000, 1234.5, 10)
+        per_tick.append(time.perf_counter() - t)
+        # A real worker has a fresh identity map per job; don't let cached rows skew "orm"
+        db.expunge_all()
+    return statistics.mean(per_tick) / len(job_ids) * 1e6
+
+
+def bench(url: str, jobs: int, ticks: int) -> None:
+    connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+    engine = create_engine(url, connect_args=connect_args)
+    Base.metadata.create_all(engine)
+    make_session: Callable[[], Session] = sessionmaker(bind=engine, expire_on_commit=False)
+
+    with make_session() as db:
+        db.execute(delete(DownloadJob).where(DownloadJob.platform == "bench"))
+        db.commit()
+        created = JobRepository(db).create_jobs([{"source_url": "bench", "platform": "bench"} for _ in range(jobs)])
+        job_ids = [j.id for j in created]
+
+    print(f"{engine.url.render_as_string(hide_password=True)}  jobs={jobs} ticks={ticks}")
+    results = {}
+    for mode in ("orm", "direct"):
+        with make_session() as db:
+            results[mode] = _run(db, job_ids, ticks, mode)
+    base = results["orm"]
+    for mode, us in results.items():
+        print(f"  {mode:<8} {us:>9.1f} us/job-update   x{base / us:>5.1f}")
+
+    with make_session() as db:
+        db.execute(delete(DownloadJob).where(DownloadJob.platform == "bench"))
+        db.commit()
+    engine.dispose()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--database-url", action="append", default=[], help="SQLAlchemy URL (repeatable)")
+    parser.add_argument("--jobs", type=int, default=50, help="active jobs per tick")
+    parser.add_argument("--ticks", type=int, default=20)
+    args = parser.parse_args()
+
+    urls = args.database_url
+    tmp_path = None
+    if not urls:
+        fd, tmp_path = tempfile.mkstemp(suffix=".db")
+        os.close(fd)
+        urls = [f"sqlite:///{tmp_path}"]
+    try:
+        for url in urls:
+            bench(url, args.jobs, args.ticks)
+    finally:
+        if tmp_path:
+            os.unlink(tmp_path)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+# benchmarks/bench_progress_board.py
+"""
+Benchmark: progress write/read cost, DB vs shared-memory ProgressBoard.
+
+- db:    JobRepository.update_progress (worker hook) / DownloadService.get_status (API poll)
+- board: ProgressBoard.write / DownloadService.get_status served from the board slot
+
+Run from project root (SQLite temp file by default; pass any SQLAlchemy URL):
+    python -m benchmarks.bench_progress_board
+    python -m benchmarks.bench_progress_board --database-url postgresql+psycopg://user:pw@localhost/bench
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import shutil
+import tempfile
+import time
+from typing import Callable
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from video_downloader_api.db.models import Base
+from video_downloader_api.repositories.job_repo import JobRepository
+from video_downloader_api.services.download_service import DownloadService
+from video_downloader_api.services.platform_detector import PlatformDetector
+from video_downloader_api.services.progress_board import ProgressBoard
+from video_downloader_api.services.storage_service import StorageService
+
+
+def _us_per_call(fn: Callable[[int], object], n: int) -> float:
+    t = time.perf_counter()
+    for i in range(n):
+        fn(i)
+    return (time.perf_counter() - t) / n * 1e6
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--database-url", default=None, help="SQLAlchemy URL (default: SQLite temp file)")
+    parser.add_argument("-n", type=int, default=2000, help="calls per measurement")
+    args = parser.parse_args()
+
+    tmp_dir = tempfile.mkdtemp()
+    url = args.database_url or f"sqlite:///{os.path.join(tmp_dir, 'bench.db')}"
+    connect_args = {"check_same_thread": False} if url.startswith("sqlite") else {}
+    engine = create_engine(url, connect_args=connect_args)
+    Base.metadata.create_all(engine)
+    db = sessionmaker(bind=engine, expire_on_commit=False)()
+    repo = JobRepository(db)
+    job_id = repo.create_job(source_url="bench", platform="bench", format_id=None, quality=None).id
+    repo.update_status(job_id, "downloading")
+
+    board = ProgressBoard(path=os.path.join(tmp_dir, "bench.board"), slots=1024)
+    storage = StorageService(base_dir=tmp_dir)
+    plain = DownloadService(PlatformDetector(), None, storage, lambda: repo)
+    boarded = DownloadService(PlatformDetector(), None, storage, lambda: repo, board=board)
+    board.write(job_id, "downloading", 0, 10**9, 1.0, 60)
+
+    rows = [
+        ("write  db", _us_per_call(lambda i: repo.update_progress(job_id, i, 10**9, 1.0, 60), args.n)),
+        ("write  board", _us_per_call(lambda i: board.write(job_id, "downloading", i, 10**9, 1.0, 60), args.n)),
+        ("status db", _us_per_call(lambda i: plain.get_status(job_id), args.n)),
+        ("status board", _us_per_call(lambda i: boarded.get_status(job_id), args.n)),
+        ("read   board", _us_per_call(lambda i: board.read(job_id), args.n)),
+    ]
+    print(f"{engine.url.render_as_string(hide_password=True)}  n={args.n}")
+    for name, us in rows:
+        print(f"  {name:<13} {us:>9.1f} us/call")
+
+    db.close()
+    engine.dispose()
+    shutil.rmtree(tmp_dir, ignore_errors=True)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+# benchmarks/bench_sjf_wait.py
+"""
+Benchmark: queue wait per size bucket, FIFO vs shortest-job-first with aging.
+
+Discrete-event simulation of one download lane: Poisson arrivals of a mixed job set
+(clips to multi-GB 4K files), N workers at a fixed download speed. The SJF run uses the
+scheduler's own size_bucket/aged_priority and models the Redis broker the way the worker
+sees it: strict priority lists, FIFO inside a list, aging re-enqueues a copy one step
+higher every aging pass and stale copies are skipped (JobRepository.claim_job).
+
+Run from project root:
+    python -m benchmarks.bench_sjf_wait
+    python -m benchmarks.bench_sjf_wait --load 0.95 --workers 4 --aging-sec 60 --jobs 20000
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import random
+from collections import deque
+from typing import Deque, Dict, List, Tuple
+
+from video_downloader_api.services.download_scheduler import (
+    BUCKET_NAMES,
+    aged_priority,
+    base_priority,
+    size_bucket,
+    wait_stats,
+)
+
+_MB = 1024 * 1024
+
+# (share, size range in MB, seconds of video per MB): short clips ... long 4K files
+_MIX = (
+    (0.50, (2, 25), 1.5),
+    (0.30, (25, 150), 1.0),
+    (0.15, (150, 750), 0.6),
+    (0.05, (750, 4000), 0.3),
+)
+
+
+def _jobs(n: int, rate: float, seed: int) -> List[Tuple[float, str, float]]:
+    """(arrival time, bucket, service seconds at 1 MB/s)."""
+    rng = random.Random(seed)
+    out = []
+    t = 0.0
+    for _ in range(n):
+        t += rng.expovariate(rate)
+        r = rng.random()
+        for share, (lo, hi), sec_per_mb in _MIX:
+            if r < share:
+                break
+            r -= share
+        size_mb = rng.uniform(lo, hi)
+        bucket = size_bucket(int(size_mb * sec_per_mb), int(size_mb * _MB))
+        out.append((t, bucket, size_mb))
+    return out
+
+
+def _mean_service_mb() -> float:
+    return sum(share * (lo + hi) / 2 for share, (lo, hi), _ in _MIX)
+
+
+def simulate(
+    jobs: List[Tuple[float, str, float]],
+    workers: int,
+    speed_mb: float,
+    sjf: bool,
+    aging_sec: float,
+) -> Dict[str, Dict[str, float]]:
+    lists: Dict[int, Deque[int]] = {p: deque() for p in range(10)}
+    priority: Dict[int, int] = {}
+    started: Dict[int, float] = {}
+    free_at: List[float] = [0.0] * workers
+    heapq.heapify(free_at)
+    tick = max(5.0, aging_sec / 4)
+    next_tick = tick
+    i = 0
+    waits: List[Tuple[str, float]] = []
+
+    def _enqueue(job: int, pri: int) -> None:
+        priority[job] = pri
+        lists[pri].append(job)
+
+    def _pop() -> int:
+        for pri in range(10):
+            while lists[pri]:
+                job = lists[pri].popleft()
+                if job not in started and priority[job] == pri:
+                    return job
+        return -1
+
+    while i < len(jobs) or any(lists.values()):
+        now = heapq.heappop(free_at)
+        # Everything that happened until this worker became free
+        while True:
+            events = []
+            if i < len(jobs):
+                events.append(jobs[i][0])
+            if sjf:
+                events.append(next_tick)
+            t = min(events) if events else None
+            if t is None or t > now:
+                break
+            if i < len(jobs) and jobs[i][0] == t:
+                _enqueue(i, base_priority(jobs[i][1]) if sjf else 0)
+                i += 1
+            else:
+                for pri in range(1, 10):
+                    for job in list(lists[pri]):
+                        if job in started or priority[job] != pri:
+                            continue
+                        target = aged_priority(jobs[job][1], next_tick - jobs[job][0], aging_sec)
+                        if target < pri:
+                            _enqueue(job, target)
+                next_tick += tick
+        job = _pop()
+        if job < 0:
+            # Idle: wait for the next arrival
+            if i >= len(jobs):
+                break
+            heapq.heappush(free_at, jobs[i][0])
+            continue
+        started[job] = now
+        waits.append((jobs[job][1], now - jobs[job][0]))
+        heapq.heappush(free_at, now + jobs[job][2] / speed_mb)
+    return wait_stats(waits)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument("--jobs", type=int, default=10000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--speed-mb", type=float, default=20.0, help="download speed per worker (MB/s)")
+    parser.add_argument("--load", type=float, default=0.9, help="offered load (arrival rate / capacity)")
+    parser.add_argument("--aging-sec", type=float, default=60.0)
+    parser.add_argument("--seed", type=int, default=1)
+    args = parser.parse_args()
+
+    rate = args.load * args.workers * args.speed_mb / _mean_service_mb()
+    jobs = _jobs(args.jobs, rate, args.seed)
+    fifo = simulate(jobs, args.workers, args.speed_mb, sjf=False, aging_sec=args.aging_sec)
+    sjf = simulate(jobs, args.workers, args.speed_mb, sjf=True, aging_sec=args.aging_sec)
+
+    print(f"jobs={args.jobs} workers={args.workers} load={args.load} aging={args.aging_sec:.0f}s")
+    print(f"{'bucket':>8} {'jobs':>6} {'fifo mean':>10} {'fifo p95':>10} {'sjf mean':>10} {'sjf p95':>10}")
+    for bucket in BUCKET_NAMES:
+        if bucket not in fifo:
+            continue
+        f, s = fifo[bucket], sjf[bucket]
+        print(
+            f"{bucket:>8} {f['jobs']:>6} {f['mean_wait_sec']:>9.1f}s {f['p95_wait_sec']:>9.1f}s "
+            f"{s['mean_wait_sec']:>9.1f}s {s['p95_wait_sec']:>9.1f}s"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+# benchmarks/bench_startup_importtime.py
+"""
+API cold-start budget based on `python -X importtime`.
+
+Imports video_downloader_api.main in fresh interpreters and checks that:
+- heavy dependencies (yt_dlp, celery) are NOT imported at API boot
+  (they are imported lazily on first use)
+- the cumulative import time of video_downloader_api.main stays within budget
+
+Exits with status 1 when a check fails, so CI can run it as a gate.
+
+Run from project root:
+    python -m benchmarks.bench_startup_importtime [--budget-ms 1500] [--runs 5]
+"""
+
+from __future__ import annotations
+
+import argparse
+import re
+import statistics
+import subprocess
+import sys
+from typing import Dict, List, Tuple
+
+TARGET_MODULE = "video_downloader_api.main"
+
+# Top-level packages that must stay out of the API import graph
+LAZY_MODULES = ("yt_dlp", "celery")
+
+# import time:      self [us] |  cumulative | imported package
+_LINE = re.compile(r"^import time:\s+(\d+)\s+\|\s+(\d+)\s+\|(\s*)(\S+)\s*$")
+
+
+def _run_once() -> Tuple[float, Dict[str, int]]:
+    """Import TARGET_MODULE in a fresh interpreter; return (total_ms, {module: cumulative_us})."""
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {TARGET_MODULE}"],
+        check=True,
+        capture_output=True,
+        text=True,
+    )
+    cumulative: Dict[str, int] = {}
+    for line in proc.stderr.splitlines():
+        m = _LINE.match(line)
+        if m:
+            cumulative[m.group(4)] = int(m.group(2))
+    total_us = cumulative.get(TARGET_MODULE)
+    if total_us is None:
+        raise RuntimeError(f"{TARGET_MODULE} missing from -X importtime output")
+    return total_us / 1000.0, cumulative
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--budget-ms", type=float, default=1500.0, help="Max median import time of the API.")
+    parser.add_argument("--runs", type=int, default=5, help="Number of fresh interpreters to measure.")
+    parser.add_argument("--top", type=int, default=10, help="Show the N slowest top-level imports.")
+    args = parser.parse_args(argv)
+
+    totals: List[float] = []
+    last: Dict[str, int] = {}
+    for _ in range(max(1, args.runs)):
+        total_ms, last = _run_once()
+        totals.append(total_ms)
+
+    median_ms = statistics.median(totals)
+    print(f"{TARGET_MODULE}: median {median_ms:.1f} ms over {len(totals)} runs (budget {args.budget_ms:.0f} ms)")
+
+    top_level = sorted(
+        ((mod, us) for mod, us in last.items() if "." not in mod),
+        key=lambda x: x[1],
+        reverse=True,
+    )[: args.top]
+    for mod, us in top_level:
+        print(f"  {mod:<30} {us / 1000.0:8.1f} ms")
+
+    failed = False
+    leaked = [m for m in LAZY_MODULES if m in last]
+    if leaked:
+        print(f"FAIL: imported at API startup (must be lazy): {', '.join(leaked)}")
+        failed = True
+    if median_ms > args.budget_ms:
+        print(f"FAIL: startup import time {median_ms:.1f} ms exceeds budget {args.budget_ms:.0f} ms")
+        failed = True
+
+    if not failed:
+        print("OK")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,46 @@
+# tests/conftest.py
+
+from __future__ import annotations
+
+from typing import Callable, Dict, Iterator
+
+import fakeredis
+import pytest
+import redis
+
+from video_downloader_api.core.config import Settings, get_settings
+
+
+@pytest.fixture
+def redis_server(monkeypatch: pytest.MonkeyPatch) -> Iterator[fakeredis.FakeRedis]:
+    """
+    In-memory Redis (fakeredis + lupa for Lua) behind every redis.Redis.from_url():
+    LazyRedis clients of all instances created in a test share it, like API processes
+    and workers sharing REDIS_URL. Yields a client for inspecting keys.
+    """
+    server = fakeredis.FakeServer()
+    monkeypatch.setattr(redis.Redis, "from_url", lambda *args, **kwargs: fakeredis.FakeRedis(server=server))
+    yield fakeredis.FakeRedis(server=server)
+
+
+@pytest.fixture
+def settings(monkeypatch: pytest.MonkeyPatch) -> Settings:
+    """Process settings with the values the tests depend on pinned (a local .env may differ)."""
+    current = get_settings()
+    monkeypatch.setattr(current, "TENANT_PLANS", {})
+    monkeypatch.setattr(current, "PLAN_WEIGHTS", {"free": 1})
+    monkeypatch.setattr(current, "DEFAULT_PLAN", "free")
+    monkeypatch.setattr(current, "DOWNLOAD_QUEUE_PER_PLATFORM", True)
+    monkeypatch.setattr(current, "DOWNLOAD_SJF_ENABLED", True)
+    return current
+
+
+@pytest.fixture
+def set_weights(settings: Settings) -> Callable[[Dict[str, int]], None]:
+    """set_weights({"acme": 2, "zeta": 1}): one plan per tenant, named after it, with that weight."""
+
+    def _set(weights: Dict[str, int]) -> None:
+        settings.TENANT_PLANS = {tenant: tenant for tenant in weights}
+        settings.PLAN_WEIGHTS = {"free": 1, **weights}
+
+    return _set
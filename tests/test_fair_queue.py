@@ -0,0 +1,332 @@
+# tests/test_fair_queue.py
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from typing import List
+
+import pytest
+
+from video_downloader_api.services.download_queues import DEFAULT_QUEUE
+from video_downloader_api.services.fair_queue import FairDispatcher, FairShareBusyError, FairShareLimiter
+
+_T0 = datetime(2026, 1, 1, tzinfo=timezone.utc)
+
+
+def _jobs(tenant: str, n: int, priority: int = 5) -> List[SimpleNamespace]:
+    # Backlog scores keep whole seconds of created_at: one second apart keeps FIFO order exact
+    return [
+        SimpleNamespace(
+            id=f"{tenant}-{i}",
+            platform="unknown",
+            priority=priority,
+            created_at=_T0 + timedelta(seconds=i),
+        )
+        for i in range(n)
+    ]
+
+
+def _tenant(job_id: str) -> str:
+    return job_id.split("-")[0]
+
+
+@pytest.fixture
+def released() -> List[str]:
+    return []
+
+
+@pytest.fixture
+def dispatcher(redis_server, settings, released) -> FairDispatcher:
+    """Dispatcher of one slot on the default lane; published job ids are recorded instead of sent to Celery."""
+    dispatcher = FairDispatcher("redis://test", key_prefix="test:fair:", capacity={"default": 1})
+    dispatcher._publish = lambda queue, job_id, priority: released.append(job_id) or True
+    return dispatcher
+
+
+def _drain(dispatcher: FairDispatcher, released: List[str]) -> None:
+    """Complete released jobs oldest first until every backlog is empty."""
+    completed = 0
+    while completed < len(released):
+        dispatcher.complete(DEFAULT_QUEUE, released[completed])
+        completed += 1
+
+
+# ---- FairDispatcher (SUBMIT / RELEASE / REPRIORITIZE scripts) ----
+
+
+def test_release_follows_plan_weights(dispatcher, released, set_weights):
+    set_weights({"acme": 2, "zeta": 1})
+    assert dispatcher.submit("acme", _jobs("acme", 12))
+    assert dispatcher.submit("zeta", _jobs("zeta", 12))
+
+    dispatcher.dispatch([DEFAULT_QUEUE])
+    _drain(dispatcher, released)
+
+    assert len(released) == 24
+    # While both have backlog, every 3 releases are 2 acme + 1 zeta
+    for start in range(0, 12, 3):
+        assert Counter(_tenant(j) for j in released[start:start + 3]) == {"acme": 2, "zeta": 1}
+
+
+def test_equal_weights_alternate(dispatcher, released):
+    dispatcher.submit("acme", _jobs("acme", 4))
+    dispatcher.submit("zeta", _jobs("zeta", 4))
+
+    dispatcher.dispatch([DEFAULT_QUEUE])
+    _drain(dispatcher, released)
+
+    assert [_tenant(j) for j in released] == ["acme", "zeta"] * 4
+
+
+def test_late_tenant_is_not_stuck_behind_a_large_backlog(dispatcher, released):
+    dispatcher.submit("acme", _jobs("acme", 50))
+    dispatcher.dispatch([DEFAULT_QUEUE])
+    dispatcher.submit("zeta", _jobs("zeta", 1))
+
+    dispatcher.complete(DEFAULT_QUEUE, released[0])
+
+    assert released[:2] == ["acme-0", "zeta-0"]
+
+
+def test_idle_time_earns_no_credit(dispatcher, released):
+    dispatcher.submit("acme", _jobs("acme", 20))
+    dispatcher.dispatch([DEFAULT_QUEUE])
+    for i in range(9):
+        dispatcher.complete(DEFAULT_QUEUE, released[i])
+    assert len(released) == 10
+
+    # zeta joins at the current virtual time: it shares from now on instead of catching up
+    dispatcher.submit("zeta", _jobs("zeta", 10))
+    for i in range(9, 13):
+        dispatcher.complete(DEFAULT_QUEUE, released[i])
+
+    assert Counter(_tenant(j) for j in released[10:14]) == {"acme": 2, "zeta": 2}
+
+
+def test_backlog_is_shortest_job_first_then_fifo(dispatcher, released):
+    jobs = _jobs("acme", 3)
+    jobs[1].priority = 2
+    dispatcher.submit("acme", jobs)
+
+    dispatcher.dispatch([DEFAULT_QUEUE])
+    _drain(dispatcher, released)
+
+    assert released == ["acme-1", "acme-0", "acme-2"]
+
+
+def test_release_is_bounded_by_lane_capacity(redis_server, settings, released):
+    dispatcher = FairDispatcher("redis://test", key_prefix="test:fair:", capacity={"default": 2})
+    dispatcher._publish = lambda queue, job_id, priority: released.append(job_id) or True
+    dispatcher.submit("acme", _jobs("acme", 5))
+
+    assert dispatcher.dispatch([DEFAULT_QUEUE]) == 2
+    assert dispatcher.dispatch([DEFAULT_QUEUE]) == 0
+    lane = dispatcher.stats()["lanes"][DEFAULT_QUEUE]
+    assert lane["in_flight"] == 2
+    assert lane["backlog"] == {"acme": 3}
+
+    dispatcher.complete(DEFAULT_QUEUE, released[0])
+    assert len(released) == 3
+
+
+def test_priority_is_passed_to_celery(dispatcher):
+    priorities = []
+    dispatcher._publish = lambda queue, job_id, priority: priorities.append((queue, priority)) or True
+    dispatcher.submit("acme", _jobs("acme", 1, priority=7))
+
+    dispatcher.dispatch([DEFAULT_QUEUE])
+
+    assert priorities == [(DEFAULT_QUEUE, 7)]
+
+
+def test_failed_publish_puts_the_job_back(dispatcher, released):
+    dispatcher.submit("acme", _jobs("acme", 2))
+    dispatcher._publish = lambda queue, job_id, priority: False
+
+    assert dispatcher.dispatch([DEFAULT_QUEUE]) == 0
+    lane = dispatcher.stats()["lanes"][DEFAULT_QUEUE]
+    assert lane["in_flight"] == 0
+    assert lane["backlog"] == {"acme": 2}
+
+    dispatcher._publish = lambda queue, job_id, priority: released.append(job_id) or True
+    assert dispatcher.dispatch([DEFAULT_QUEUE]) == 1
+    assert released == ["acme-0"]
+
+
+def test_reprioritize_moves_a_waiting_job_ahead(dispatcher, released):
+    dispatcher.submit("acme", _jobs("acme", 3))
+
+    assert dispatcher.reprioritize(DEFAULT_QUEUE, "acme", "acme-2", 1)
+    assert not dispatcher.reprioritize(DEFAULT_QUEUE, "acme", "missing", 1)
+    assert not dispatcher.reprioritize(DEFAULT_QUEUE, None, "acme-0", 1)
+
+    dispatcher.dispatch([DEFAULT_QUEUE])
+    assert released == ["acme-2"]
+    # Released jobs are no longer in the backlog
+    assert not dispatcher.reprioritize(DEFAULT_QUEUE, "acme", "acme-2", 0)
+
+    _drain(dispatcher, released)
+    assert released == ["acme-2", "acme-0", "acme-1"]
+
+
+def test_reprioritize_keeps_fifo_among_equal_priorities(dispatcher, released):
+    dispatcher.submit("acme", _jobs("acme", 3, priority=5))
+    dispatcher.reprioritize(DEFAULT_QUEUE, "acme", "acme-2", 3)
+    dispatcher.reprioritize(DEFAULT_QUEUE, "acme", "acme-1", 3)
+
+    dispatcher.dispatch([DEFAULT_QUEUE])
+    _drain(dispatcher, released)
+
+    assert released == ["acme-1", "acme-2", "acme-0"]
+
+
+def test_cancel_drops_backlog_entries_and_frees_the_slot(dispatcher, released):
+    dispatcher.submit("acme", _jobs("acme", 3))
+    dispatcher.dispatch([DEFAULT_QUEUE])
+    assert released == ["acme-0"]
+
+    dispatcher.cancel([("acme-0", "unknown", "acme"), ("acme-1", "unknown", "acme")])
+
+    assert released == ["acme-0", "acme-2"]
+    assert dispatcher.stats()["lanes"][DEFAULT_QUEUE]["backlog"] == {}
+
+
+def test_expired_leases_free_their_slot(dispatcher, released, redis_server):
+    # A worker died with the job in flight: its lease (score = expiry) is in the past
+    redis_server.zadd(f"test:fair:dl:{DEFAULT_QUEUE}:inflight", {"ghost": 1})
+    dispatcher.submit("acme", _jobs("acme", 1))
+
+    assert dispatcher.dispatch([DEFAULT_QUEUE]) == 1
+    assert released == ["acme-0"]
+
+
+def test_reconcile_drops_terminal_and_missing_jobs(dispatcher, released, redis_server):
+    inflight = f"test:fair:dl:{DEFAULT_QUEUE}:inflight"
+    redis_server.zadd(inflight, {"done": 9e12, "running": 9e12, "gone": 9e12})
+    repo = SimpleNamespace(
+        list_jobs=lambda ids: [
+            SimpleNamespace(id="done", status="finished"),
+            SimpleNamespace(id="running", status="downloading"),
+        ]
+    )
+
+    assert dispatcher.reconcile(DEFAULT_QUEUE, repo) == 2
+    assert [m.decode() for m in redis_server.zrange(inflight, 0, -1)] == ["running"]
+
+
+def test_platform_jobs_use_their_own_lane(redis_server, settings):
+    queues = []
+    dispatcher = FairDispatcher("redis://test", key_prefix="test:fair:", capacity={"default": 1, "youtube": 1})
+    dispatcher._publish = lambda queue, job_id, priority: queues.append(queue) or True
+    jobs = _jobs("acme", 2)
+    jobs[1].platform = "youtube"
+    dispatcher.submit("acme", jobs)
+
+    dispatcher.dispatch(dispatcher.capacity)
+
+    assert sorted(queues) == sorted([DEFAULT_QUEUE, f"{DEFAULT_QUEUE}.youtube"])
+
+
+def test_without_redis_callers_enqueue_directly(settings):
+    dispatcher = FairDispatcher(None)
+
+    assert not dispatcher.submit("acme", _jobs("acme", 1))
+    assert dispatcher.dispatch([DEFAULT_QUEUE]) == 0
+    assert dispatcher.stats() == {"available": False}
+
+
+# ---- FairShareLimiter (ACQUIRE / RELEASE scripts) ----
+
+
+@pytest.fixture
+def limiter(redis_server, settings) -> FairShareLimiter:
+    return FairShareLimiter("redis://test", key_prefix="test:fair:", slots=4, hold_ttl_sec=60.0)
+
+
+def test_a_lone_tenant_may_use_every_slot(limiter):
+    tokens = [limiter.try_acquire("acme") for _ in range(4)]
+
+    assert all(tokens)
+    assert limiter.try_acquire("acme") is None
+    assert limiter.stats()["held"] == {"acme": 4}
+
+
+def test_freed_slots_go_to_waiting_tenants(limiter):
+    tokens = [limiter.try_acquire("acme") for _ in range(4)]
+    assert limiter.try_acquire("zeta") is None  # now waiting
+
+    limiter.release("acme", tokens[0])
+    # acme holds 3, over its share of ceil(4 * 1 / 2) = 2 while zeta waits
+    assert limiter.try_acquire("acme") is None
+    assert limiter.try_acquire("zeta")
+
+    limiter.release("acme", tokens[1])
+    assert limiter.try_acquire("zeta")
+    assert limiter.stats()["held"] == {"acme": 2, "zeta": 2}
+
+
+def test_shares_follow_plan_weights(limiter, set_weights):
+    set_weights({"acme": 3, "zeta": 1})
+    assert limiter.try_acquire("acme")
+    assert limiter.try_acquire("zeta")
+    assert limiter.try_acquire("zeta") is None  # zeta's share: ceil(4 * 1 / 4) = 1
+
+    granted = [limiter.try_acquire("acme") for _ in range(3)]
+
+    # acme's share: ceil(4 * 3 / 4) = 3
+    assert [bool(t) for t in granted] == [True, True, False]
+    assert limiter.stats()["held"] == {"acme": 3, "zeta": 1}
+
+
+def test_release_is_idempotent_and_ignores_foreign_tokens(limiter):
+    token = limiter.try_acquire("acme")
+
+    limiter.release("acme", "not-a-token")
+    limiter.release("zeta", token)
+    assert limiter.stats()["held"] == {"acme": 1}
+
+    limiter.release("acme", token)
+    limiter.release("acme", token)
+    assert limiter.stats()["held"] == {}
+
+
+def test_expired_holds_come_back(redis_server, settings):
+    # hold_ttl_sec=0: a crashed instance's hold expires right away
+    limiter = FairShareLimiter("redis://test", key_prefix="test:fair:", slots=1, hold_ttl_sec=0.0)
+    assert limiter.try_acquire("acme")
+
+    assert limiter.try_acquire("zeta")
+    assert limiter.stats()["held"] == {"zeta": 1}
+
+
+def test_acquire_gives_up_after_the_wait(limiter):
+    for _ in range(4):
+        limiter.try_acquire("acme")
+
+    with pytest.raises(FairShareBusyError):
+        asyncio.run(limiter.acquire("acme", wait_sec=0.05))
+
+
+def test_acquire_waits_for_a_release(limiter):
+    tokens = [limiter.try_acquire("acme") for _ in range(4)]
+
+    async def _scenario() -> str:
+        waiter = asyncio.create_task(limiter.acquire("zeta", wait_sec=2.0))
+        await asyncio.sleep(0.05)
+        limiter.release("acme", tokens[0])
+        return await waiter
+
+    assert asyncio.run(_scenario())
+
+
+def test_without_redis_requests_are_admitted_untracked(settings):
+    limiter = FairShareLimiter(None)
+
+    token = limiter.try_acquire("acme")
+
+    assert token == FairShareLimiter.UNTRACKED
+    limiter.release("acme", token)
+    assert limiter.stats() == {"available": False, "slots": limiter.slots}
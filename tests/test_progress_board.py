@@ -0,0 +1,209 @@
+# tests/test_progress_board.py
+
+from __future__ import annotations
+
+import threading
+import zlib
+
+import pytest
+
+from video_downloader_api.services import progress_board
+from video_downloader_api.services.progress_board import _SEQ, ProgressBoard
+
+
+@pytest.fixture
+def board_path(tmp_path) -> str:
+    return str(tmp_path / "progress.board")
+
+
+def _colliding_ids(slots: int, n: int) -> list:
+    """n job ids with the same home slot (one probe chain)."""
+    home = None
+    found = []
+    i = 0
+    while len(found) < n:
+        job_id = f"job-{i}"
+        i += 1
+        h = zlib.crc32(job_id.encode()) % slots
+        if home is None:
+            home = h
+        if h == home:
+            found.append(job_id)
+    return found
+
+
+def test_write_then_read(board_path):
+    board = ProgressBoard(path=board_path, slots=16)
+
+    assert board.write("job-1", "downloading", downloaded_bytes=50, total_bytes=200, speed_bps=1.5, eta_sec=3)
+
+    entry = board.read("job-1")
+    assert entry.job_id == "job-1"
+    assert entry.status == "downloading"
+    assert (entry.downloaded_bytes, entry.total_bytes, entry.speed_bps, entry.eta_sec) == (50, 200, 1.5, 3)
+    assert entry.percent == 25.0
+    assert entry.seq % 2 == 0
+
+
+def test_unknown_values_read_back_as_none(board_path):
+    board = ProgressBoard(path=board_path, slots=16)
+    board.write("job-1", "downloading")
+
+    entry = board.read("job-1")
+
+    assert (entry.total_bytes, entry.speed_bps, entry.eta_sec, entry.percent) == (None, None, None, None)
+    assert board.read("job-2") is None
+
+
+def test_processes_sharing_the_file_see_each_other(board_path):
+    worker = ProgressBoard(path=board_path, slots=16)
+    # A later process keeps the size the board was created with
+    api = ProgressBoard(path=board_path, slots=64)
+    assert api.slots == 16
+
+    worker.write("job-1", "downloading", downloaded_bytes=10)
+    assert api.read("job-1").downloaded_bytes == 10
+
+    worker.write("job-1", "downloading", downloaded_bytes=20)
+    entry = api.read("job-1")
+    assert entry.downloaded_bytes == 20
+
+
+def test_seq_changes_on_every_write(board_path):
+    board = ProgressBoard(path=board_path, slots=16)
+    board.write("job-1", "downloading", downloaded_bytes=1)
+    first = board.read("job-1").seq
+
+    board.write("job-1", "downloading", downloaded_bytes=2)
+
+    assert board.read("job-1").seq == first + 2
+
+
+def test_foreign_file_is_reinitialized(board_path):
+    with open(board_path, "wb") as f:
+        f.write(b"not a board" * 100)
+
+    board = ProgressBoard(path=board_path, slots=8)
+
+    assert board.slots == 8
+    assert board.read("job-1") is None
+    assert board.stats()["used"] == 0
+
+
+def test_colliding_jobs_share_a_probe_chain(board_path):
+    board = ProgressBoard(path=board_path, slots=8)
+    job_ids = _colliding_ids(8, 3)
+
+    for n, job_id in enumerate(job_ids):
+        assert board.write(job_id, "downloading", downloaded_bytes=n)
+
+    assert [board.read(job_id).downloaded_bytes for job_id in job_ids] == [0, 1, 2]
+
+
+def test_full_board_rejects_new_jobs(board_path):
+    board = ProgressBoard(path=board_path, slots=4)
+    for n in range(4):
+        assert board.write(f"job-{n}", "downloading")
+
+    assert not board.write("job-4", "downloading")
+    assert board.read("job-4") is None
+    assert board.stats() == {"slots": 4, "used": 4, "active": 4, "owned_here": 4}
+
+
+def test_terminal_slots_are_reused_after_a_while(board_path, monkeypatch):
+    board = ProgressBoard(path=board_path, slots=1)
+    board.write("job-1", "finished")
+    assert not board.write("job-2", "downloading")
+
+    monkeypatch.setattr(progress_board, "_TERMINAL_REUSE_SEC", 0.0)
+
+    assert board.write("job-2", "downloading")
+    assert board.read("job-1") is None
+    assert board.read("job-2").status == "downloading"
+
+
+def test_stale_running_slots_are_reused(board_path):
+    # A worker that died mid-download never marks its job terminal
+    board = ProgressBoard(path=board_path, slots=1, stale_sec=0.0)
+    ProgressBoard(path=board_path).write("job-1", "downloading")
+
+    assert board.write("job-2", "downloading")
+
+
+def test_reuse_keeps_later_entries_of_the_chain_reachable(board_path, monkeypatch):
+    board = ProgressBoard(path=board_path, slots=8)
+    first, second, third = _colliding_ids(8, 3)
+    board.write(first, "finished")
+    board.write(second, "downloading")
+    monkeypatch.setattr(progress_board, "_TERMINAL_REUSE_SEC", 0.0)
+
+    board.write(third, "downloading")
+
+    assert board.read(first) is None
+    assert board.read(second).status == "downloading"
+    assert board.read(third).status == "downloading"
+
+
+def test_set_status_keeps_progress(board_path):
+    board = ProgressBoard(path=board_path, slots=16)
+    board.write("job-1", "downloading", downloaded_bytes=75, total_bytes=100)
+
+    board.set_status("job-1", "canceled")
+
+    entry = board.read("job-1")
+    assert (entry.status, entry.downloaded_bytes, entry.total_bytes) == ("canceled", 75, 100)
+    assert board.stats()["active"] == 0
+
+
+def test_read_during_a_write_gives_up(board_path):
+    board = ProgressBoard(path=board_path, slots=16)
+    board.write("job-1", "downloading")
+    index = board._owned["job-1"]
+    offset = board._offset(index)
+    seq = _SEQ.unpack_from(board._mm, offset)[0]
+
+    # Odd seq: a writer is mid-update; readers retry, then fall back (None -> DB)
+    _SEQ.pack_into(board._mm, offset, seq + 1)
+    assert board.read("job-1") is None
+
+    _SEQ.pack_into(board._mm, offset, seq + 2)
+    assert board.read("job-1").seq == seq + 2
+
+
+def test_claim_recovers_a_slot_left_mid_write(board_path, monkeypatch):
+    board = ProgressBoard(path=board_path, slots=1)
+    board.write("job-1", "finished")
+    offset = board._offset(0)
+    seq = _SEQ.unpack_from(board._mm, offset)[0]
+    _SEQ.pack_into(board._mm, offset, seq + 1)  # writer died mid-write
+    monkeypatch.setattr(progress_board, "_TERMINAL_REUSE_SEC", 0.0)
+
+    assert board.write("job-2", "downloading")
+    assert board.read("job-2").seq % 2 == 0
+
+
+def test_concurrent_reads_are_never_torn(board_path):
+    writer = ProgressBoard(path=board_path, slots=16)
+    reader = ProgressBoard(path=board_path)
+    writer.write("job-1", "downloading", downloaded_bytes=0, total_bytes=0)
+    stop = threading.Event()
+    torn = []
+
+    def _write() -> None:
+        n = 0
+        while not stop.is_set():
+            n += 1
+            writer.write("job-1", "downloading", downloaded_bytes=n, total_bytes=n, eta_sec=n)
+
+    thread = threading.Thread(target=_write)
+    thread.start()
+    try:
+        for _ in range(20000):
+            entry = reader.read("job-1")
+            if entry is not None and not (entry.downloaded_bytes == entry.total_bytes == (entry.eta_sec or 0)):
+                torn.append(entry)
+    finally:
+        stop.set()
+        thread.join()
+
+    assert torn == []
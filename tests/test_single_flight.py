@@ -0,0 +1,168 @@
+# tests/test_single_flight.py
+
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, List
+
+import pytest
+
+from video_downloader_api.models.video_info import VideoInfo
+from video_downloader_api.services.single_flight import RedisSingleFlight, SingleFlight
+
+
+def _gated(result: Any = "result", error: BaseException = None):
+    """fn that blocks until released and counts its runs."""
+    gate = threading.Event()
+    calls: List[int] = []
+
+    def fn() -> Any:
+        calls.append(1)
+        gate.wait(5)
+        if error is not None:
+            raise error
+        return result
+
+    return fn, gate, calls
+
+
+def _run_concurrently(n: int, call: Callable[[], Any], gate: threading.Event, settle_sec: float = 0.1) -> list:
+    with ThreadPoolExecutor(max_workers=n) as pool:
+        futures = [pool.submit(call) for _ in range(n)]
+        time.sleep(settle_sec)  # everyone is waiting on the leader
+        gate.set()
+        return [f.exception() or f.result() for f in futures]
+
+
+# ---- in-process ----
+
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    fn, gate, calls = _gated()
+
+    results = _run_concurrently(8, lambda: flight.do("k", fn), gate)
+
+    assert results == ["result"] * 8
+    assert len(calls) == 1
+
+
+def test_followers_get_the_leaders_exception():
+    flight = SingleFlight()
+    error = RuntimeError("boom")
+    fn, gate, calls = _gated(error=error)
+
+    results = _run_concurrently(4, lambda: flight.do("k", fn), gate)
+
+    assert results == [error] * 4
+    assert len(calls) == 1
+
+
+def test_finished_calls_are_not_cached():
+    flight = SingleFlight()
+    calls = []
+
+    flight.do("k", lambda: calls.append(1))
+    flight.do("k", lambda: calls.append(1))
+
+    assert len(calls) == 2
+    assert flight._calls == {}
+
+
+def test_different_keys_run_independently():
+    flight = SingleFlight()
+    fn_a, gate_a, _ = _gated("a")
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        pending = pool.submit(flight.do, "a", fn_a)
+        time.sleep(0.05)
+
+        assert flight.do("b", lambda: "b") == "b"
+
+        gate_a.set()
+        assert pending.result() == "a"
+
+
+# ---- across instances (Redis lock) ----
+
+
+def _instance(**kwargs: Any) -> RedisSingleFlight:
+    kwargs.setdefault("poll_interval_sec", 0.01)
+    return RedisSingleFlight("redis://test", key_prefix="test:sf:", **kwargs)
+
+
+def test_other_instances_wait_for_the_lock_owners_result(redis_server):
+    leader, follower = _instance(), _instance()
+    fn, gate, calls = _gated({"title": "t"})
+    follower_calls = []
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        pending = pool.submit(leader.do, "k", fn)
+        time.sleep(0.05)
+        waiting = pool.submit(follower.do, "k", lambda: follower_calls.append(1) or {"title": "local"})
+        time.sleep(0.05)
+        gate.set()
+
+        assert pending.result() == {"title": "t"}
+        assert waiting.result(timeout=2) == {"title": "t"}
+
+    assert len(calls) == 1
+    assert follower_calls == []
+    assert redis_server.get("test:sf:lock:k") is None
+
+
+def test_results_round_trip_through_the_codec(redis_server):
+    info = VideoInfo(source_url="https://youtu.be/x", platform="youtube", title="t", duration_sec=3)
+    leader = _instance(encode=VideoInfo.to_json, decode=VideoInfo.from_json)
+    follower = _instance(encode=VideoInfo.to_json, decode=VideoInfo.from_json)
+    fn, gate, _ = _gated(info)
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        pending = pool.submit(leader.do, "k", fn)
+        time.sleep(0.05)
+        waiting = pool.submit(follower.do, "k", lambda: None)
+        time.sleep(0.05)
+        gate.set()
+
+        assert pending.result() == info
+        assert waiting.result(timeout=2) == info
+
+
+def test_follower_runs_itself_when_the_owner_fails(redis_server):
+    leader, follower = _instance(), _instance()
+    fn, gate, _ = _gated(error=RuntimeError("upstream"))
+
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        pending = pool.submit(leader.do, "k", fn)
+        time.sleep(0.05)
+        waiting = pool.submit(follower.do, "k", lambda: "local")
+        time.sleep(0.05)
+        gate.set()
+
+        with pytest.raises(RuntimeError):
+            pending.result()
+        # Lock released without a result: the follower extracts on its own
+        assert waiting.result(timeout=2) == "local"
+
+
+def test_follower_stops_waiting_after_the_timeout(redis_server):
+    follower = _instance(wait_timeout_sec=0.1)
+    # Another instance holds the lock and never publishes
+    redis_server.set("test:sf:lock:k", "someone-else", px=60000)
+
+    started = time.monotonic()
+    assert follower.do("k", lambda: "local") == "local"
+    assert time.monotonic() - started < 1.0
+    # Not ours: the other owner's lock is left alone
+    assert redis_server.get("test:sf:lock:k") == b"someone-else"
+
+
+def test_without_redis_it_is_in_process_only():
+    flight = RedisSingleFlight("", key_prefix="test:sf:")
+    fn, gate, calls = _gated()
+
+    results = _run_concurrently(4, lambda: flight.do("k", fn), gate)
+
+    assert results == ["result"] * 4
+    assert len(calls) == 1
@@ -2,35 +2,64 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter, Depends, HTTPException, status
+import asyncio
+import threading
+from typing import Any, AsyncIterator, Callable, Literal, Optional, TypeVar
+
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, status
+from fastapi.responses import StreamingResponse
+from starlette.types import Receive, Scope, Send
 from sqlalchemy.orm import Session
 
 from video_downloader_api.core.config import get_settings
+from video_downloader_api.core.logger import get_logger
 from video_downloader_api.db.session import get_db
 from video_downloader_api.downloader.ytdlp_downloader import YtDlpDownloader
-from video_downloader_api.middleware.auth import verify_api_key
+from video_downloader_api.middleware.auth import get_tenant, verify_api_key
 from video_downloader_api.middleware.security import validate_url_safe
 from video_downloader_api.repositories.job_repo import JobRepository
 from video_downloader_api.schemas.download import (
+    DownloadBatchStartRequest,
+    DownloadBatchStartResponse,
     DownloadStartRequest,
     DownloadStartResponse,
     LinkCheckRequest,
     LinkCheckResponse,
+    PlaylistInfoRequest,
 )
 from video_downloader_api.schemas.video import PlaylistInfoOut, VideoInfoOut
 from video_downloader_api.services.download_service import DownloadService
-from video_downloader_api.services.metadata_service import MetadataService
+from video_downloader_api.services.extraction_executor import (
+    ExtractionBusyError,
+    ExtractionTimeoutError,
+    get_extraction_executor,
+)
+from video_downloader_api.services.fair_queue import FairShareBusyError, get_fair_dispatcher, get_fair_share_limiter
+from video_downloader_api.services.info_handoff import get_info_handoff_store
+from video_downloader_api.services.metadata_cache import get_metadata_cache
+from video_downloader_api.services.metadata_service import ExtractionUnavailableError, MetadataService
 from video_downloader_api.services.platform_detector import PlatformDetector
+from video_downloader_api.services.single_flight import get_single_flight
 from video_downloader_api.services.storage_service import StorageService
 
 router = APIRouter(prefix="/download")
+logger = get_logger("download.route")
+
+T = TypeVar("T")
 
 
 def _build_services(db: Session):
     settings = get_settings()
     detector = PlatformDetector()
     downloader = YtDlpDownloader()
-    metadata = MetadataService(downloader=downloader, detector=detector)
+    info_store = get_info_handoff_store()
+    metadata = MetadataService(
+        downloader=downloader,
+        detector=detector,
+        cache=get_metadata_cache(),
+        single_flight=get_single_flight(),
+        info_store=info_store,
+    )
     storage = StorageService(base_dir=settings.DOWNLOAD_DIR)
     repo_factory = lambda: JobRepository(db)
     download_service = DownloadService(
@@ -38,10 +67,83 @@ def _build_services(db: Session):
         metadata=metadata,
         storage=storage,
         repo_factory=repo_factory,
+        info_store=info_store,
+        dispatcher=get_fair_dispatcher(),
     )
     return settings, detector, metadata, download_service
 
 
+async def _run_extraction(fn: Callable[[threading.Event], T], timeout_sec: float) -> T:
+    """
+    Run a metadata extraction on the dedicated executor (not Starlette's threadpool)
+    with a deadline, mapping errors to HTTP: busy or transient upstream failure -> 503,
+    deadline -> 504, ValueError -> 400, anything else -> 500.
+    """
+    try:
+        return await get_extraction_executor().run(fn, timeout_sec=timeout_sec)
+    except HTTPException:
+        raise
+    except ExtractionBusyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
+    except ExtractionUnavailableError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "5"},
+        )
+    except ExtractionTimeoutError as e:
+        raise HTTPException(status_code=status.HTTP_504_GATEWAY_TIMEOUT, detail=str(e))
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+
+async def _acquire_fair_slot(tenant: str) -> Optional[str]:
+    """Tenant's fair share of metadata slots (METADATA_FAIR_*): 503 + Retry-After when not granted in time."""
+    limiter = get_fair_share_limiter()
+    if limiter is None:
+        return None
+    try:
+        return await limiter.acquire(tenant, get_settings().METADATA_FAIR_WAIT_SEC)
+    except FairShareBusyError as e:
+        raise HTTPException(
+            status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+            detail=str(e),
+            headers={"Retry-After": "1"},
+        )
+
+
+def _release_fair_slot(tenant: str, token: Optional[str]) -> None:
+    """Free the slot off the event loop without awaiting it (also safe while the request is being cancelled)."""
+    limiter = get_fair_share_limiter()
+    if limiter is not None and token is not None:
+        asyncio.get_running_loop().run_in_executor(None, limiter.release, tenant, token)
+
+
+class _SlotStreamingResponse(StreamingResponse):
+    """
+    StreamingResponse that frees a fair-share slot when the response ends, however it ends:
+    body streamed, client gone mid-stream, or gone before the body was ever iterated
+    (a generator's own finally never runs in that case).
+    """
+
+    def __init__(self, content: AsyncIterator[str], tenant: str, token: Optional[str], **kwargs: Any) -> None:
+        super().__init__(content, **kwargs)
+        self.tenant = tenant
+        self.token = token
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        try:
+            await super().__call__(scope, receive, send)
+        finally:
+            _release_fair_slot(self.tenant, self.token)
+
+
 @router.post("/check", response_model=LinkCheckResponse, dependencies=[Depends(verify_api_key)])
 def check_link(payload: LinkCheckRequest, db: Session = Depends(get_db)) -> LinkCheckResponse:
     """
@@ -71,21 +173,40 @@ def check_link(payload: LinkCheckRequest, db: Session = Depends(get_db)) -> Link
 
 
 @router.post("/info", response_model=VideoInfoOut, dependencies=[Depends(verify_api_key)])
-def get_info(payload: LinkCheckRequest, db: Session = Depends(get_db)) -> VideoInfoOut:
+async def get_info(
+    payload: LinkCheckRequest,
+    db: Session = Depends(get_db),
+    tenant: str = Depends(get_tenant),
+) -> VideoInfoOut:
     """
     Returns video metadata + available formats (quality + size if available).
+    Served from the metadata cache when possible (set bypass_cache=true to force a fresh extraction).
+    Runs on the extraction executor with a METADATA_INFO_TIMEOUT_SEC deadline (504 when exceeded).
+    Extractions (cache misses) take one of the API key's fair-share slots (503 when it stays exhausted).
     """
     settings, _, metadata, _ = _build_services(db)
 
     url_str = str(payload.url)
-    validate_url_safe(url_str)
 
+    def _lookup(cancel: threading.Event) -> Optional[VideoInfoOut]:
+        validate_url_safe(url_str)  # resolves DNS: keep it off the event loop too
+        if payload.bypass_cache:
+            return None
+        return metadata.lookup_video_info(url_str, allowed_domains=settings.ALLOWED_DOMAINS)
+
+    def _extract(cancel: threading.Event) -> VideoInfoOut:
+        # Cache already looked up (or bypassed): extract and refresh it
+        return metadata.get_video_info(url_str, allowed_domains=settings.ALLOWED_DOMAINS, use_cache=False)
+
+    cached = await _run_extraction(_lookup, settings.METADATA_INFO_TIMEOUT_SEC)
+    if cached is not None:
+        return cached
+
+    token = await _acquire_fair_slot(tenant)
     try:
-        return metadata.get_video_info(url_str, allowed_domains=settings.ALLOWED_DOMAINS)
-    except ValueError as e:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+        return await _run_extraction(_extract, settings.METADATA_INFO_TIMEOUT_SEC)
+    finally:
+        _release_fair_slot(tenant, token)
 
 
 @router.post(
@@ -93,27 +214,136 @@ def get_info(payload: LinkCheckRequest, db: Session = Depends(get_db)) -> VideoI
     response_model=PlaylistInfoOut,
     dependencies=[Depends(verify_api_key)],
 )
-def get_playlist_info(payload: LinkCheckRequest, db: Session = Depends(get_db)) -> PlaylistInfoOut:
+async def get_playlist_info(
+    payload: PlaylistInfoRequest,
+    db: Session = Depends(get_db),
+    tenant: str = Depends(get_tenant),
+) -> PlaylistInfoOut:
     """
     Returns metadata (title, thumbnail, formats) for each video in a playlist URL.
+    Supports paging (offset/limit -> next_offset) and flat=true for a format-less entry list.
+    Runs on the extraction executor with a METADATA_PLAYLIST_TIMEOUT_SEC deadline; past it,
+    entry resolution is cancelled and the request answers 504. Holds one of the API key's
+    fair-share extraction slots.
     """
     settings, _, metadata, _ = _build_services(db)
 
     url_str = str(payload.url)
-    validate_url_safe(url_str)
 
+    def _extract(cancel: threading.Event) -> PlaylistInfoOut:
+        validate_url_safe(url_str)
+        return metadata.get_playlist_info(
+            url_str,
+            allowed_domains=settings.ALLOWED_DOMAINS,
+            offset=payload.offset,
+            limit=payload.limit,
+            flat=payload.flat,
+            cancel=cancel,
+        )
+
+    token = await _acquire_fair_slot(tenant)
     try:
-        return metadata.get_playlist_info(url_str, allowed_domains=settings.ALLOWED_DOMAINS)
-    except ValueError as e:
-        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
-    except Exception as e:
-        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+        return await _run_extraction(_extract, settings.METADATA_PLAYLIST_TIMEOUT_SEC)
+    finally:
+        _release_fair_slot(tenant, token)
+
+
+@router.post("/playlist-info/stream", dependencies=[Depends(verify_api_key)])
+async def stream_playlist_info(
+    payload: PlaylistInfoRequest,
+    request: Request,
+    order: Literal["playlist", "completion"] = Query(
+        default="playlist",
+        description='"playlist" keeps playlist order, "completion" emits items as soon as they resolve.',
+    ),
+    db: Session = Depends(get_db),
+    tenant: str = Depends(get_tenant),
+) -> StreamingResponse:
+    """
+    Streaming variant of /playlist-info.
+    Yields one VideoInfoOut JSON object per line (NDJSON) as soon as each entry is resolved.
+    Honors offset/limit; flat is ignored (use /playlist-info with flat=true instead).
+    Entries are resolved on the extraction executor; the stream ends early once
+    METADATA_PLAYLIST_TIMEOUT_SEC has passed or the client disconnects.
+    The API key's fair-share extraction slot is held until the stream ends.
+    """
+    settings, _, metadata, _ = _build_services(db)
+
+    url_str = str(payload.url)
+
+    def _extract(cancel: threading.Event) -> Any:
+        validate_url_safe(url_str)
+        _, _, info = metadata.validate_and_extract_playlist(
+            url_str,
+            allowed_domains=settings.ALLOWED_DOMAINS,
+            offset=payload.offset,
+            limit=payload.limit,
+        )
+        return info
+
+    token = await _acquire_fair_slot(tenant)
+    try:
+        # Extract the playlist itself up-front so errors still map to proper HTTP status codes
+        info = await _run_extraction(_extract, settings.METADATA_PLAYLIST_TIMEOUT_SEC)
+        entry_urls = metadata.playlist_entry_urls(info)
+    except BaseException:
+        _release_fair_slot(tenant, token)
+        raise
+
+    stop = threading.Event()
+    videos = metadata.iter_playlist_videos(
+        entry_urls,
+        allowed_domains=settings.ALLOWED_DOMAINS,
+        ordered=(order == "playlist"),
+        cancel=stop,
+    )
+
+    def _next_video(cancel: threading.Event) -> Optional[VideoInfoOut]:
+        try:
+            return next(videos, None)
+        finally:
+            # Deadline/disconnect hit while this item resolved: close here, on the generator's thread
+            if cancel.is_set():
+                stop.set()
+                videos.close()
+
+    async def ndjson_generator() -> AsyncIterator[str]:
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + settings.METADATA_PLAYLIST_TIMEOUT_SEC
+        in_flight = False
+        try:
+            while not await request.is_disconnected():
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    raise ExtractionTimeoutError("Playlist stream deadline exceeded.")
+                in_flight = True
+                video = await get_extraction_executor().run(_next_video, timeout_sec=remaining)
+                in_flight = False
+                if video is None:
+                    return
+                yield video.model_dump_json() + "\n"
+        except (ExtractionBusyError, ExtractionTimeoutError) as e:
+            # Headers are already sent: end the stream short (busy: the item was never submitted)
+            in_flight = in_flight and not isinstance(e, ExtractionBusyError)
+            logger.warning("Playlist stream for url=%s ended early: %s", url_str, e)
+        finally:
+            stop.set()
+            # An item still resolving closes the generator itself (see _next_video)
+            if not in_flight:
+                videos.close()
+
+    # The slot is freed when the response ends (see _SlotStreamingResponse)
+    return _SlotStreamingResponse(ndjson_generator(), tenant, token, media_type="application/x-ndjson")
 
 
 @router.post("/start", response_model=DownloadStartResponse, dependencies=[Depends(verify_api_key)])
-def start_download(payload: DownloadStartRequest, db: Session = Depends(get_db)) -> DownloadStartResponse:
+def start_download(
+    payload: DownloadStartRequest,
+    db: Session = Depends(get_db),
+    tenant: str = Depends(get_tenant),
+) -> DownloadStartResponse:
     """
-    Creates a download job and enqueues Celery task.
+    Creates a download job and enqueues Celery task (through the API key's fair-queue backlog).
     """
     _, _, _, download_service = _build_services(db)
 
@@ -124,8 +354,38 @@ def start_download(payload: DownloadStartRequest, db: Session = Depends(get_db))
             url=payload.url,
             format_id=payload.format_id,
             filename_hint=payload.filename_hint,
+            tenant=tenant,
         )
     except ValueError as e:
         raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+
+@router.post(
+    "/start-batch",
+    response_model=DownloadBatchStartResponse,
+    dependencies=[Depends(verify_api_key)],
+)
+def start_download_batch(
+    payload: DownloadBatchStartRequest,
+    db: Session = Depends(get_db),
+    tenant: str = Depends(get_tenant),
+) -> DownloadBatchStartResponse:
+    """
+    Creates many download jobs in one DB transaction and enqueues them as one Celery group.
+    Poll aggregated progress via status_url (/download/batch/{batch_id}).
+    With the fair queue on, the jobs wait in the API key's backlog and are released to Celery
+    in weighted round-robin with other API keys.
+    """
+    _, _, _, download_service = _build_services(db)
+
+    for url in dict.fromkeys(item.url for item in payload.items):
+        validate_url_safe(url)
+
+    try:
+        return download_service.create_batch(payload.items, tenant=tenant)
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
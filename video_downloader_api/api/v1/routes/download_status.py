@@ -7,26 +7,33 @@ from sqlalchemy.orm import Session
 
 from video_downloader_api.core.config import get_settings
 from video_downloader_api.db.session import get_db
-from video_downloader_api.downloader.ytdlp_downloader import YtDlpDownloader
 from video_downloader_api.middleware.auth import verify_api_key
 from video_downloader_api.repositories.job_repo import JobRepository
-from video_downloader_api.schemas.status import JobStatusOut
+from video_downloader_api.schemas.status import BatchStatusOut, JobStatusOut
 from video_downloader_api.services.download_service import DownloadService
-from video_downloader_api.services.metadata_service import MetadataService
+from video_downloader_api.services.fair_queue import get_fair_dispatcher
 from video_downloader_api.services.platform_detector import PlatformDetector
+from video_downloader_api.services.progress_board import get_progress_board
 from video_downloader_api.services.storage_service import StorageService
 
 router = APIRouter(prefix="/download")
 
 
 def _download_service(db: Session) -> DownloadService:
+    # Status reads only touch the DB: no downloader/metadata service (keeps yt-dlp out of this route)
     settings = get_settings()
     detector = PlatformDetector()
-    downloader = YtDlpDownloader()
-    metadata = MetadataService(downloader=downloader, detector=detector)
     storage = StorageService(base_dir=settings.DOWNLOAD_DIR)
     repo_factory = lambda: JobRepository(db)
-    return DownloadService(detector=detector, metadata=metadata, storage=storage, repo_factory=repo_factory)
+    return DownloadService(
+        detector=detector,
+        metadata=None,
+        storage=storage,
+        repo_factory=repo_factory,
+        board=get_progress_board(),
+        # Cancels drop jobs from the fair-queue backlogs and free their slots
+        dispatcher=get_fair_dispatcher(),
+    )
 
 
 @router.get("/status/{job_id}", response_model=JobStatusOut, dependencies=[Depends(verify_api_key)])
@@ -42,3 +49,50 @@ def get_download_status(job_id: str, db: Session = Depends(get_db)) -> JobStatus
         raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
     except Exception as e:
         raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+
+@router.get("/batch/{batch_id}", response_model=BatchStatusOut, dependencies=[Depends(verify_api_key)])
+def get_batch_status(batch_id: str, db: Session = Depends(get_db)) -> BatchStatusOut:
+    """
+    Returns aggregated status/progress of a batch + per-job status.
+    """
+    service = _download_service(db)
+    try:
+        return service.get_batch_status(batch_id)
+    except ValueError as e:
+        # "Batch not found."
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+
+@router.delete("/batch/{batch_id}", response_model=BatchStatusOut, dependencies=[Depends(verify_api_key)])
+def cancel_batch(batch_id: str, db: Session = Depends(get_db)) -> BatchStatusOut:
+    """
+    Cancels every queued/downloading job of a batch; returns the batch status.
+    """
+    service = _download_service(db)
+    try:
+        return service.cancel_batch(batch_id)
+    except ValueError as e:
+        # "Batch not found."
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+
+@router.delete("/{job_id}", response_model=JobStatusOut, dependencies=[Depends(verify_api_key)])
+def cancel_download(job_id: str, db: Session = Depends(get_db)) -> JobStatusOut:
+    """
+    Cancels a queued/downloading job (idempotent). Queued jobs never start; a running
+    download stops within CANCEL_CHECK_INTERVAL_MS and its partial files are removed.
+    Finished/failed jobs are returned unchanged.
+    """
+    service = _download_service(db)
+    try:
+        return service.cancel_job(job_id)
+    except ValueError as e:
+        # "Job not found."
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+    except Exception as e:
+        raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
@@ -2,7 +2,19 @@
 
 from __future__ import annotations
 
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, Query
+from sqlalchemy.orm import Session
+
+from video_downloader_api.core.config import get_settings
+from video_downloader_api.db.session import get_db
+from video_downloader_api.middleware.auth import verify_api_key
+from video_downloader_api.repositories.job_repo import JobRepository
+from video_downloader_api.services.download_queues import DEFAULT_LANE, all_lanes, get_queue_depth_probe
+from video_downloader_api.services.download_scheduler import queue_wait_stats
+from video_downloader_api.services.extraction_executor import get_extraction_executor
+from video_downloader_api.services.fair_queue import get_fair_dispatcher, get_fair_share_limiter
+from video_downloader_api.services.metadata_cache import get_metadata_cache
+from video_downloader_api.services.progress_board import get_progress_board
 
 router = APIRouter()
 
@@ -10,3 +22,94 @@ router = APIRouter()
 @router.get("/health")
 def health_check() -> dict:
     return {"status": "ok"}
+
+
+@router.get("/health/metadata-cache", dependencies=[Depends(verify_api_key)])
+def metadata_cache_stats() -> dict:
+    """
+    Hit/miss counters of the metadata cache for this API process.
+    """
+    cache = get_metadata_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
+
+
+@router.get("/health/metadata-executor", dependencies=[Depends(verify_api_key)])
+def metadata_executor_stats() -> dict:
+    """
+    Load of the metadata extraction executor for this API process
+    (in_flight, rejected with 503, timed out with 504).
+    """
+    return get_extraction_executor().stats()
+
+
+@router.get("/health/progress-board", dependencies=[Depends(verify_api_key)])
+def progress_board_stats() -> dict:
+    """
+    Slot usage of the shared-memory progress board (PROGRESS_BOARD_ENABLED).
+    """
+    board = get_progress_board()
+    if board is None:
+        return {"enabled": False}
+    return {"enabled": True, "path": board.path, **board.stats()}
+
+
+@router.get("/health/download-queues", dependencies=[Depends(verify_api_key)])
+def download_queue_stats(db: Session = Depends(get_db)) -> dict:
+    """
+    Per-platform download queues: messages waiting on the broker (None if Redis is
+    unreachable), queued/downloading jobs in the DB and the lane's worker settings.
+    """
+    lanes = all_lanes()
+    depths = get_queue_depth_probe().depths(lane.queue for lane in lanes)
+    counts = JobRepository(db).count_by_platform(("queued", "downloading"))
+    # Jobs of platforms without their own lane (unknown) are on the default queue
+    unlaned = {p for p, _ in counts} - {lane.name for lane in lanes}
+
+    out = {}
+    for lane in lanes:
+        platforms = unlaned if lane.name == DEFAULT_LANE else {lane.name}
+        out[lane.name] = {
+            "queue": lane.queue,
+            "broker_depth": depths.get(lane.queue),
+            "queued": sum(counts.get((p, "queued"), 0) for p in platforms),
+            "downloading": sum(counts.get((p, "downloading"), 0) for p in platforms),
+            "concurrency": lane.concurrency,
+            "prefetch_multiplier": lane.prefetch_multiplier,
+        }
+    return {"per_platform": get_settings().DOWNLOAD_QUEUE_PER_PLATFORM, "queues": out}
+
+
+@router.get("/health/queue-wait", dependencies=[Depends(verify_api_key)])
+def queue_wait(
+    window_sec: float = Query(3600.0, gt=0, le=7 * 86400),
+    db: Session = Depends(get_db),
+) -> dict:
+    """
+    Queue wait (job created -> picked up by a worker) per size bucket, mean and p95,
+    for jobs started in the last window_sec. Compare with DOWNLOAD_SJF_ENABLED on/off.
+    """
+    settings = get_settings()
+    return {
+        "sjf_enabled": settings.DOWNLOAD_SJF_ENABLED,
+        "aging_sec": settings.DOWNLOAD_SJF_AGING_SEC,
+        "window_sec": window_sec,
+        "buckets": queue_wait_stats(JobRepository(db), window_sec),
+    }
+
+
+@router.get("/health/fair-queue", dependencies=[Depends(verify_api_key)])
+def fair_queue_stats() -> dict:
+    """
+    Weighted fair queuing across API keys: per download lane, jobs in flight vs capacity and
+    each tenant's backlog; metadata extraction slots held per tenant and tenants waiting.
+    """
+    settings = get_settings()
+    dispatcher = get_fair_dispatcher()
+    limiter = get_fair_share_limiter()
+    return {
+        "plan_weights": settings.PLAN_WEIGHTS,
+        "downloads": dispatcher.stats() if dispatcher is not None else {"enabled": False},
+        "metadata": limiter.stats() if limiter is not None else {"enabled": False},
+    }
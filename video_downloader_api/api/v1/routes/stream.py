@@ -2,32 +2,306 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
-from typing import Iterator
+from typing import Any, AsyncIterator, Dict, List, Optional, Set
 
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Header, HTTPException, Request, WebSocket, WebSocketDisconnect, status
 from fastapi.responses import StreamingResponse
+from starlette.concurrency import run_in_threadpool
 
-from video_downloader_api.middleware.auth import verify_api_key
-from video_downloader_api.services.events_service import EventsService
+from video_downloader_api.core.config import get_settings
+from video_downloader_api.db.session import SessionLocal
+from video_downloader_api.enums import TERMINAL_STATUSES
+from video_downloader_api.middleware.auth import is_valid_api_key, verify_api_key
+from video_downloader_api.repositories.job_repo import JobRepository
+from video_downloader_api.schemas.status import JobStatusOut
+from video_downloader_api.services.download_service import DownloadService
+from video_downloader_api.services.platform_detector import PlatformDetector
+from video_downloader_api.services.progress_board import get_progress_board
+from video_downloader_api.services.progress_hub import ProgressBatch, get_progress_hub, is_terminal_event
+from video_downloader_api.services.storage_service import StorageService
 
 router = APIRouter(prefix="/download")
 
-# NOTE:
-# This is an in-memory events bus.
-# For real production (separate worker process), replace EventsService with Redis pubsub.
-events = EventsService()
+# Client reconnect delay sent once per stream (EventSource "retry:" field, ms)
+_RETRY_MS = 3000
+
+# WebSocket clients without a handshake key must send {"action": "auth"} within this
+_WS_AUTH_TIMEOUT_SEC = 10.0
+
+
+def _sse(event_id: int, data: dict) -> str:
+    return f"id: {event_id}\ndata: {json.dumps(data, ensure_ascii=False, default=str)}\n\n"
+
+
+def _parse_last_event_id(value: Optional[str]) -> Optional[int]:
+    try:
+        return int(value) if value else None
+    except ValueError:
+        return None
+
+
+def _status_service(db: Any) -> DownloadService:
+    settings = get_settings()
+    return DownloadService(
+        detector=PlatformDetector(),
+        metadata=None,
+        storage=StorageService(base_dir=settings.DOWNLOAD_DIR),
+        repo_factory=lambda: JobRepository(db),
+        board=get_progress_board(),
+    )
+
+
+def _load_snapshot(job_id: str) -> JobStatusOut:
+    """Current job state from the DB (runs in the threadpool: one short query)."""
+    db = SessionLocal()
+    try:
+        return _status_service(db).get_status(job_id)
+    finally:
+        db.close()
+
+
+def _load_snapshots(job_ids: List[str]) -> Dict[str, JobStatusOut]:
+    """Current state of many jobs, one query (threadpool). Unknown ids are missing."""
+    db = SessionLocal()
+    try:
+        return _status_service(db).get_statuses(job_ids)
+    finally:
+        db.close()
 
 
 @router.get("/stream/{job_id}", dependencies=[Depends(verify_api_key)])
-def stream_progress(job_id: str) -> StreamingResponse:
+async def stream_progress(
+    job_id: str,
+    request: Request,
+    last_event_id: Optional[str] = Header(default=None, alias="Last-Event-ID"),
+) -> StreamingResponse:
     """
     SSE stream of progress updates.
-    Yields: data: {json}\n\n
+
+    - first event: DB snapshot (JobStatusOut), or on reconnect with Last-Event-ID
+      the events missed since then when this process still buffers them
+    - then live events (data: {json}); a slow client only gets the latest one
+    - ": keep-alive" comments every SSE_HEARTBEAT_SEC while idle
+    - the stream ends after finished/failed/canceled
+    Watchers are asyncio tasks: no thread is held per client.
     """
+    settings = get_settings()
+    hub = get_progress_hub()
+
+    # Register before reading the DB so nothing published in between is lost
+    watcher, replay, seq = hub.watch(job_id, _parse_last_event_id(last_event_id))
+    snapshot: Optional[JobStatusOut] = None
+    if replay is None:
+        try:
+            snapshot = await run_in_threadpool(_load_snapshot, job_id)
+        except ValueError as e:
+            hub.unwatch(watcher)
+            # "Job not found."
+            raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail=str(e))
+        except Exception as e:
+            hub.unwatch(watcher)
+            raise HTTPException(status_code=status.HTTP_500_INTERNAL_SERVER_ERROR, detail=str(e))
+
+    async def event_generator() -> AsyncIterator[str]:
+        try:
+            yield f"retry: {_RETRY_MS}\n\n"
+            if snapshot is not None:
+                yield _sse(seq, snapshot.model_dump(mode="json"))
+                if snapshot.status in TERMINAL_STATUSES:
+                    return
+            else:
+                for event_id, payload in replay:
+                    yield _sse(event_id, payload)
+                    if is_terminal_event(payload):
+                        return
+
+            while True:
+                event = await watcher.next(timeout=settings.SSE_HEARTBEAT_SEC)
+                if event is None:
+                    if await request.is_disconnected():
+                        return
+                    yield ": keep-alive\n\n"
+                    continue
+                event_id, payload = event
+                yield _sse(event_id, payload)
+                if is_terminal_event(payload):
+                    return
+        finally:
+            hub.unwatch(watcher)
+
+    return StreamingResponse(
+        event_generator(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
+
+
+async def _receive_json(websocket: WebSocket) -> Any:
+    """Next client message as JSON; None for a binary or non-JSON frame. Raises WebSocketDisconnect."""
+    message = await websocket.receive()
+    if message["type"] == "websocket.disconnect":
+        raise WebSocketDisconnect(message.get("code", 1000), message.get("reason"))
+    text = message.get("text")
+    if text is None:
+        return None
+    try:
+        return json.loads(text)
+    except ValueError:
+        return None
+
+
+async def _ws_authenticate(websocket: WebSocket) -> bool:
+    """
+    Same rule as verify_api_key. Accepts the connection unless a handshake key is rejected.
+
+    The key comes from the X-API-KEY header, else ?api_key=, else (browsers cannot set
+    headers on WebSockets) the first message: {"action": "auth", "api_key": "..."},
+    sent within _WS_AUTH_TIMEOUT_SEC. Prefer the first message over ?api_key=: the query
+    string, key included, is written to server and proxy access logs.
+    """
+    key = websocket.headers.get("x-api-key") or websocket.query_params.get("api_key")
+    if key or is_valid_api_key(None):
+        if not is_valid_api_key(key):
+            await websocket.close(code=1008)
+            return False
+        await websocket.accept()
+        return True
+
+    await websocket.accept()
+    try:
+        message = await asyncio.wait_for(_receive_json(websocket), timeout=_WS_AUTH_TIMEOUT_SEC)
+    except asyncio.TimeoutError:
+        message = None
+    except WebSocketDisconnect:
+        return False
+    if isinstance(message, dict) and message.get("action") == "auth" and is_valid_api_key(message.get("api_key")):
+        return True
+    await websocket.close(code=1008)
+    return False
+
+
+@router.websocket("/ws")
+async def progress_websocket(websocket: WebSocket) -> None:
+    """
+    Progress of many jobs over one connection.
+
+    Client -> server (JSON):
+        {"action": "auth", "api_key": "..."} first, if the key is not sent with the handshake
+        {"action": "subscribe", "job_ids": ["..."], "last_event_ids": {"<job_id>": 12}}
+        {"action": "unsubscribe", "job_ids": ["..."]}
+    Server -> client (JSON), at most one frame per WS_TICK_MS:
+        {"type": "updates", "events": [{"id": 13, "job_id": "...", "status": ..., ...}, ...]}
+        {"type": "error", "job_ids": [...], "detail": "..."}
+        {"type": "ping"} when idle for SSE_HEARTBEAT_SEC
+
+    Each event is the latest state of one job in that tick (DB snapshot right after
+    subscribe, then live events); jobs are dropped from the subscription after
+    finished/failed/canceled. Backed by the same ProgressHub as the SSE route.
+    """
+    if not await _ws_authenticate(websocket):
+        return
+
+    settings = get_settings()
+    hub = get_progress_hub()
+    batch = ProgressBatch(asyncio.get_running_loop())
+    subscribed: Set[str] = set()
+    tick_sec = max(0, settings.WS_TICK_MS) / 1000.0
+    max_jobs = settings.WS_MAX_JOBS_PER_CONNECTION
+    # Reader (errors) and writer (updates) both send frames
+    send_lock = asyncio.Lock()
+
+    async def _send(message: dict) -> None:
+        async with send_lock:
+            await websocket.send_json(message)
+
+    def _drop(job_id: str) -> None:
+        if job_id in subscribed:
+            subscribed.discard(job_id)
+            hub.unsubscribe(job_id, batch)
+        batch.discard(job_id)
+
+    async def _subscribe(job_ids: List[str], last_event_ids: Dict[str, Any]) -> None:
+        new = [j for j in dict.fromkeys(job_ids) if j not in subscribed]
+        room = max(0, max_jobs - len(subscribed))
+        if len(new) > room:
+            await _send({"type": "error", "job_ids": new[room:], "detail": f"At most {max_jobs} jobs per connection."})
+            new = new[:room]
+
+        need_snapshot: Dict[str, int] = {}
+        for job_id in new:
+            subscribed.add(job_id)
+            replay, seq = hub.subscribe(job_id, batch, _parse_last_event_id(str(last_event_ids.get(job_id) or "")))
+            if replay is None:
+                need_snapshot[job_id] = seq
+            elif replay:
+                batch.offer(job_id, replay[-1])
+        if not need_snapshot:
+            return
+
+        try:
+            snapshots = await run_in_threadpool(_load_snapshots, list(need_snapshot))
+        except Exception as e:
+            for job_id in need_snapshot:
+                _drop(job_id)
+            await _send({"type": "error", "job_ids": list(need_snapshot), "detail": str(e)})
+            return
+        missing = [j for j in need_snapshot if j not in snapshots]
+        for job_id in missing:
+            _drop(job_id)
+        if missing:
+            await _send({"type": "error", "job_ids": missing, "detail": "Job not found."})
+        for job_id, snap in snapshots.items():
+            if job_id not in subscribed:
+                continue
+            batch.offer(job_id, (need_snapshot[job_id], snap.model_dump(mode="json")))
+            if snap.status in TERMINAL_STATUSES:
+                # Already done: send the snapshot, no live events will follow
+                subscribed.discard(job_id)
+                hub.unsubscribe(job_id, batch)
+
+    async def _reader() -> None:
+        try:
+            while True:
+                message = await _receive_json(websocket)
+                if not isinstance(message, dict):
+                    continue
+                raw_ids = message.get("job_ids")
+                job_ids = [str(j) for j in raw_ids if j] if isinstance(raw_ids, list) else []
+                action = message.get("action")
+                if action == "subscribe":
+                    last_event_ids = message.get("last_event_ids")
+                    await _subscribe(job_ids, last_event_ids if isinstance(last_event_ids, dict) else {})
+                elif action == "unsubscribe":
+                    for job_id in job_ids:
+                        _drop(job_id)
+        except (WebSocketDisconnect, RuntimeError):
+            # Client gone
+            pass
+        finally:
+            batch.close()
 
-    def event_generator() -> Iterator[str]:
-        for payload in events.subscribe(job_id):
-            yield f"data: {json.dumps(payload, ensure_ascii=False)}\n\n"
+    reader = asyncio.create_task(_reader())
+    try:
+        while True:
+            pending = await batch.drain(timeout=settings.SSE_HEARTBEAT_SEC)
+            if batch.closed:
+                break
+            if not pending:
+                await _send({"type": "ping"})
+                continue
 
-    return StreamingResponse(event_generator(), media_type="text/event-stream")
+            out = []
+            for job_id, (event_id, payload) in pending.items():
+                out.append({"id": event_id, **payload})
+                if is_terminal_event(payload):
+                    _drop(job_id)
+            await _send({"type": "updates", "events": out})
+            await asyncio.sleep(tick_sec)
+    except (WebSocketDisconnect, RuntimeError):
+        pass
+    finally:
+        reader.cancel()
+        for job_id in list(subscribed):
+            hub.unsubscribe(job_id, batch)
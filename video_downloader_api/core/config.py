@@ -4,11 +4,14 @@ from __future__ import annotations
 
 import os
 from functools import lru_cache
-from typing import List, Optional, Any
+from typing import Dict, List, Optional, Any
 
 from pydantic import Field, field_validator
 from pydantic_settings import BaseSettings, SettingsConfigDict
 
+# Tenant of API_KEY and of unauthenticated (dev mode) requests
+DEFAULT_TENANT = "default"
+
 
 def _project_root() -> str:
     """Directory that contains the video_downloader_api package. Same for API and worker."""
@@ -125,10 +128,159 @@ class Settings(BaseSettings):
     CELERY_BROKER_URL: str = "redis://localhost:6379/0"
     CELERY_RESULT_BACKEND: str = "redis://localhost:6379/0"
 
+    # Download queues: jobs go to "downloads.<platform>" (unknown platforms -> "downloads",
+    # lane "default"). Concurrency/prefetch apply to a worker consuming that lane
+    # (python -m video_downloader_api.worker.launch runs one worker per lane);
+    # lanes missing here use MAX_CONCURRENT_DOWNLOADS / prefetch 1.
+    DOWNLOAD_QUEUE_PER_PLATFORM: bool = True
+    DOWNLOAD_QUEUE_CONCURRENCY: Dict[str, int] = Field(
+        default_factory=lambda: {
+            "youtube": 4,
+            "instagram": 2,
+            "facebook": 2,
+            "tiktok": 3,
+        }
+    )
+    DOWNLOAD_QUEUE_PREFETCH: Dict[str, int] = Field(default_factory=dict)
+    # Shortest-job-first inside each queue: jobs get a Celery priority from their size
+    # bucket (est. filesize/duration from the /info metadata cache); every AGING_SEC a
+    # queued job waits it moves up one step, so large downloads cannot starve.
+    DOWNLOAD_SJF_ENABLED: bool = True
+    DOWNLOAD_SJF_AGING_SEC: float = 60.0
+    # Weighted fair queuing across tenants (API_KEYS), Redis on REDIS_URL: jobs wait in
+    # per-tenant backlogs and are released to each lane's Celery queue weighted by plan,
+    # at most CAPACITY per lane in flight (default 2 x the lane's concurrency: set it to
+    # the lane's slots across all worker hosts). Leases cover jobs lost without a status.
+    FAIR_QUEUE_ENABLED: bool = True
+    FAIR_QUEUE_CAPACITY: Dict[str, int] = Field(default_factory=dict)
+    FAIR_QUEUE_LEASE_SEC: int = 21600
+    FAIR_QUEUE_PUMP_SEC: float = 5.0
+    FAIR_QUEUE_KEY_PREFIX: str = "vda:fair:"
+    # Lanes this worker consumes when started without -Q, CSV: "youtube,tiktok" (empty = all)
+    WORKER_QUEUES: str = ""
+
+    # Progress events (SSE): "memory" (API and worker in one process) | "redis" (Pub/Sub on REDIS_URL)
+    # | "postgres" (LISTEN/NOTIFY on DATABASE_URL, for deployments without Redis)
+    # | "board" (polls the shared-memory progress board, single host; see PROGRESS_BOARD_*)
+    EVENTS_BACKEND: str = "redis"
+    EVENTS_REDIS_CHANNEL_PREFIX: str = "vda:events:"
+    EVENTS_PG_CHANNEL: str = "vda_events"
+
+    # SSE (/download/stream): keep-alive comment interval, per-job replay buffer for
+    # Last-Event-ID reconnects, and how long a job's buffer outlives its last client
+    SSE_HEARTBEAT_SEC: float = 15.0
+    SSE_REPLAY_BUFFER_SIZE: int = 32
+    SSE_JOB_LINGER_SEC: float = 60.0
+
+    # WebSocket (/download/ws): many jobs per connection, updates sent as one frame per
+    # tick (SSE_HEARTBEAT_SEC also sets the idle ping interval)
+    WS_TICK_MS: int = 250
+    WS_MAX_JOBS_PER_CONNECTION: int = 200
+
+    # Progress hook throttling (per job): write to DB + publish at most every N ms,
+    # or sooner when percent moved by the delta. Status changes/finished always write.
+    PROGRESS_MIN_INTERVAL_MS: int = 500
+    PROGRESS_MIN_PERCENT_DELTA: float = 1.0
+
+    # Running jobs poll their cancel flag (DB status) at most this often from the
+    # progress hook: upper bound of DELETE /download/{job_id} -> download stopped
+    CANCEL_CHECK_INTERVAL_MS: int = 500
+
+    # Shared-memory progress board (single host: API and workers on one machine).
+    # Workers write every hook into an mmap'd slot; /download/status and SSE read it
+    # without the DB. PATH defaults to /dev/shm/vda-progress.board.
+    # EVENTS_BACKEND=board streams SSE/WebSocket updates from it (polled every POLL_MS).
+    PROGRESS_BOARD_ENABLED: bool = False
+    PROGRESS_BOARD_PATH: Optional[str] = None
+    PROGRESS_BOARD_SLOTS: int = 4096
+    PROGRESS_BOARD_STALE_SEC: int = 3600
+    PROGRESS_BOARD_POLL_MS: int = 250
+
+    # Preload yt-dlp/DB/ffmpeg in every worker child before it takes tasks
+    WORKER_WARMUP_ENABLED: bool = True
+
+    # -------------------------
+    # yt-dlp instance pool (per process: API workers + Celery children)
+    # -------------------------
+    YTDL_POOL_ENABLED: bool = True
+    YTDL_POOL_MAX_IDLE_PER_PROFILE: int = 4
+    YTDL_POOL_MAX_USES: int = 200
+    YTDL_POOL_MAX_AGE_SEC: int = 900
+
+    # -------------------------
+    # Metadata cache (POST /download/info)
+    # -------------------------
+    # L1 = in-process LRU (per uvicorn worker), L2 = Redis (shared by all workers/nodes, uses REDIS_URL)
+    METADATA_CACHE_ENABLED: bool = True
+    METADATA_CACHE_REDIS_ENABLED: bool = True
+    METADATA_CACHE_MAX_ITEMS: int = 1024
+    METADATA_CACHE_TTL_SEC: int = 600
+    # Per-platform TTL override (seconds). .env format:
+    # METADATA_CACHE_PLATFORM_TTL_SEC={"youtube":1800,"tiktok":300}
+    METADATA_CACHE_PLATFORM_TTL_SEC: Dict[str, int] = Field(
+        default_factory=lambda: {
+            "youtube": 1800,
+            "instagram": 300,
+            "facebook": 300,
+            "tiktok": 300,
+        }
+    )
+    METADATA_CACHE_KEY_PREFIX: str = "vda:meta:"
+
+    # Negative cache: remember failed extractions (private/deleted/geo-blocked...) per error class.
+    # Rate limiting/bot checks, network errors and unclassified failures are never cached
+    # (answered 503 and retried on the next request).
+    METADATA_NEGATIVE_CACHE_TTL_SEC: Dict[str, int] = Field(
+        default_factory=lambda: {
+            "unavailable": 3600,
+            "private": 1800,
+            "geo_blocked": 1800,
+            "unsupported": 3600,
+            "login_required": 600,
+        }
+    )
+
+    # Playlist expansion: entries resolved in parallel (bounded per request)
+    METADATA_PLAYLIST_WORKERS: int = 8
+
+    # /info and /playlist-info run on a dedicated bounded pool (not Starlette's threadpool).
+    # Requests beyond workers + pending get 503; requests past their deadline get 504.
+    METADATA_EXECUTOR_WORKERS: int = 8
+    METADATA_EXECUTOR_MAX_PENDING: int = 64
+    METADATA_INFO_TIMEOUT_SEC: float = 30.0
+    METADATA_PLAYLIST_TIMEOUT_SEC: float = 120.0
+
+    # Single-flight: concurrent extractions of the same URL share one yt-dlp call
+    # "off" | "local" (per process) | "redis" (across processes/nodes)
+    METADATA_SINGLE_FLIGHT_BACKEND: str = "local"
+    METADATA_SINGLE_FLIGHT_LOCK_TTL_SEC: int = 60
+    METADATA_SINGLE_FLIGHT_WAIT_SEC: int = 60
+
+    # Fair share of metadata extractions across tenants (all API instances, Redis): while
+    # others wait, a tenant holds at most its plan-weighted share of METADATA_FAIR_SLOTS
+    # (set to API instances x METADATA_EXECUTOR_WORKERS); no slot within WAIT_SEC -> 503
+    METADATA_FAIR_ENABLED: bool = True
+    METADATA_FAIR_SLOTS: int = 16
+    METADATA_FAIR_WAIT_SEC: float = 10.0
+
+    # Hand the /info extraction result to the worker (Redis, uses REDIS_URL) so the
+    # download skips re-extraction. TTL follows the signed format URLs' expiry minus a margin.
+    INFO_HANDOFF_ENABLED: bool = True
+    INFO_HANDOFF_MAX_TTL_SEC: int = 3600
+    INFO_HANDOFF_EXPIRY_MARGIN_SEC: int = 300
+    INFO_HANDOFF_KEY_PREFIX: str = "vda:info:"
+
     # -------------------------
     # Security
     # -------------------------
     API_KEY: Optional[str] = None
+    # Per-tenant keys, accepted in addition to API_KEY (whose tenant is "default").
+    # .env format: API_KEYS={"key-abc":"acme","key-def":"globex"}
+    API_KEYS: Dict[str, str] = Field(default_factory=dict)
+    # Fair-share weights: tenant -> plan, plan -> weight (unlisted tenants: DEFAULT_PLAN)
+    TENANT_PLANS: Dict[str, str] = Field(default_factory=dict)
+    PLAN_WEIGHTS: Dict[str, int] = Field(default_factory=lambda: {"free": 1, "pro": 4, "business": 8})
+    DEFAULT_PLAN: str = "free"
 
     # CORS
     # .env accepted formats:
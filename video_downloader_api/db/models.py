@@ -6,7 +6,7 @@ import uuid
 from datetime import datetime, timezone
 from typing import Optional
 
-from sqlalchemy import DateTime, Float, Integer, String, Text
+from sqlalchemy import BigInteger, DateTime, Float, Integer, String, Text
 from sqlalchemy.orm import DeclarativeBase, Mapped, mapped_column
 
 
@@ -37,6 +37,17 @@ class DownloadJob(Base):
     quality: Mapped[Optional[str]] = mapped_column(String(32), nullable=True)
     title: Mapped[Optional[str]] = mapped_column(String(512), nullable=True)
 
+    # Canonical "platform:content_id" (same for youtu.be/X, watch?v=X, shorts/X, ...)
+    content_key: Mapped[Optional[str]] = mapped_column(String(128), nullable=True, index=True)
+
+    # Set when the job was created through /download/start-batch
+    batch_id: Mapped[Optional[str]] = mapped_column(String(36), nullable=True, index=True)
+    # Position of the item in that request (GET /batch/{id} lists jobs in request order)
+    batch_index: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+
+    # Stored /info extraction result the worker can download from (see InfoHandoffStore)
+    info_ref: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+
     downloaded_bytes: Mapped[int] = mapped_column(Integer, nullable=False, default=0)
     total_bytes: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
 
@@ -48,6 +59,22 @@ class DownloadJob(Base):
 
     error: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
 
+    # Fair-share unit the job was submitted by (API key's tenant, see middleware/auth.py)
+    tenant: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
+
+    # Size estimate from the /info metadata at enqueue time (see download_scheduler):
+    # bucket xs/s/m/l/unknown and the Celery priority the job was (last) enqueued with
+    duration_sec: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+    est_bytes: Mapped[Optional[int]] = mapped_column(BigInteger, nullable=True)
+    size_bucket: Mapped[Optional[str]] = mapped_column(String(16), nullable=True)
+    priority: Mapped[Optional[int]] = mapped_column(Integer, nullable=True)
+
+    # When a worker picked the job up (queue wait = started_at - created_at)
+    started_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True, index=True)
+
+    # When DELETE /download/{job_id} was received (worker measures cancel latency from it)
+    canceled_at: Mapped[Optional[datetime]] = mapped_column(DateTime(timezone=True), nullable=True)
+
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False, default=utc_now)
     updated_at: Mapped[datetime] = mapped_column(
         DateTime(timezone=True),
@@ -3,7 +3,14 @@
 from __future__ import annotations
 
 from abc import ABC, abstractmethod
-from typing import Callable, Dict, List, Any
+from typing import Callable, Dict, List, Any, Optional
+
+
+class DownloadCanceledError(Exception):
+    """
+    Raised from a download's progress_cb to abort it (job canceled).
+    Implementations must let it propagate unchanged out of download().
+    """
 
 
 class BaseDownloader(ABC):
@@ -17,12 +24,13 @@ class BaseDownloader(ABC):
     """
 
     @abstractmethod
-    def extract_info(self, url: str) -> Dict[str, Any]:
+    def extract_info(self, url: str, platform: Optional[str] = None) -> Dict[str, Any]:
         """
         Fetch video metadata without downloading.
 
         Args:
             url: Video URL
+            platform: Detected platform (lets implementations skip URL matching)
 
         Returns:
             Raw info dict (implementation-specific). Services will map this into schemas.
@@ -49,6 +57,9 @@ class BaseDownloader(ABC):
         format_id: str,
         output_path: str,
         progress_cb: Callable[[Dict[str, Any]], None],
+        platform: Optional[str] = None,
+        info: Optional[Dict[str, Any]] = None,
+        cancel_check: Optional[Callable[[], None]] = None,
     ) -> str:
         """
         Download a specific format.
@@ -57,7 +68,13 @@ class BaseDownloader(ABC):
             url: Video URL
             format_id: Downloader-specific format identifier
             output_path: Final file path to write on disk
-            progress_cb: Callback invoked repeatedly with progress hook data
+            progress_cb: Callback invoked repeatedly with progress hook data; raising
+                DownloadCanceledError from it aborts the download
+            platform: Detected platform (lets implementations skip URL matching)
+            info: Earlier extract_info() result to download from (skips re-extraction;
+                implementations fall back to extracting when it is stale)
+            cancel_check: Called where no progress hook fires (post-processing steps,
+                before a fallback extraction); raising DownloadCanceledError aborts
 
         Returns:
             Final file path (usually output_path).
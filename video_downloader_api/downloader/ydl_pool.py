@@ -0,0 +1,201 @@
+# video_downloader_api/downloader/ydl_pool.py
+
+from __future__ import annotations
+
+import os
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from functools import lru_cache
+from typing import Any, Callable, Deque, Dict, Iterator, Optional
+
+from video_downloader_api.core.config import get_settings
+from video_downloader_api.core.logger import get_logger
+
+
+class PooledYDL:
+    """
+    A long-lived yt_dlp.YoutubeDL plus pool bookkeeping.
+
+    progress_cb / postprocess_cb: per-checkout progress and post-processing callbacks.
+    The YoutubeDL instance is created with a single dispatch hook of each kind that
+    forwards to whatever callback the current user set here, so hooks never accumulate
+    on a reused instance.
+    """
+
+    __slots__ = ("ydl", "profile", "created_at", "uses", "progress_cb", "postprocess_cb")
+
+    def __init__(self, profile: str, opts: Dict[str, Any]) -> None:
+        import yt_dlp  # lazy: keeps yt-dlp out of API startup (pip install yt-dlp)
+
+        self.profile = profile
+        self.created_at = time.monotonic()
+        self.uses = 0
+        self.progress_cb: Optional[Callable[[Dict[str, Any]], None]] = None
+        self.postprocess_cb: Optional[Callable[[Dict[str, Any]], None]] = None
+
+        ydl_opts = dict(opts)
+        ydl_opts["progress_hooks"] = [self._dispatch_progress]
+        ydl_opts["postprocessor_hooks"] = [self._dispatch_postprocess]
+        self.ydl = yt_dlp.YoutubeDL(ydl_opts)
+
+    def _dispatch_progress(self, d: Dict[str, Any]) -> None:
+        cb = self.progress_cb
+        if cb is not None:
+            cb(d)
+
+    def _dispatch_postprocess(self, d: Dict[str, Any]) -> None:
+        cb = self.postprocess_cb
+        if cb is not None:
+            cb(d)
+
+    def close(self) -> None:
+        try:
+            self.ydl.close()
+        except Exception:
+            pass
+
+
+class YoutubeDLPool:
+    """
+    Per-process pool of long-lived YoutubeDL instances keyed by profile
+    (e.g. "extract", "playlist").
+
+    Reusing an instance skips extractor registration, cookie jar and HTTP
+    handler/connection setup on every call. Only profiles whose options are the
+    same on every call are pooled; downloads (format selector, output template and
+    per-run state such as the return code) get a fresh instance from fresh().
+
+    - checkout(profile, opts) gives exclusive use of one instance (YoutubeDL is not thread-safe)
+    - instances are recycled after max_uses checkouts or max_age_sec seconds
+    - at most max_idle_per_profile idle instances are kept per profile
+    - enabled=False: a fresh instance per checkout (old behavior), closed afterwards
+    - the pool resets itself after fork (Celery prefork children never share sockets)
+    """
+
+    def __init__(
+        self,
+        enabled: bool = True,
+        max_idle_per_profile: int = 4,
+        max_uses: int = 200,
+        max_age_sec: float = 900.0,
+    ) -> None:
+        self.enabled = enabled
+        self.max_idle_per_profile = max(1, int(max_idle_per_profile))
+        self.max_uses = max(1, int(max_uses))
+        self.max_age_sec = float(max_age_sec)
+        self.logger = get_logger(self.__class__.__name__)
+
+        self._lock = threading.Lock()
+        self._idle: Dict[str, Deque[PooledYDL]] = {}
+        self._pid = os.getpid()
+        self._created = 0
+        self._reused = 0
+        self._recycled = 0
+
+    def _expired(self, pooled: PooledYDL) -> bool:
+        return pooled.uses >= self.max_uses or (time.monotonic() - pooled.created_at) >= self.max_age_sec
+
+    def _check_fork(self) -> None:
+        # Caller holds self._lock
+        pid = os.getpid()
+        if pid != self._pid:
+            # Inherited instances belong to the parent process: drop without closing shared sockets
+            self._idle = {}
+            self._pid = pid
+
+    def _acquire(self, profile: str) -> Optional[PooledYDL]:
+        stale = []
+        pooled: Optional[PooledYDL] = None
+        with self._lock:
+            self._check_fork()
+            idle = self._idle.get(profile)
+            while idle:
+                candidate = idle.pop()
+                if self._expired(candidate):
+                    stale.append(candidate)
+                    continue
+                pooled = candidate
+                self._reused += 1
+                break
+            self._recycled += len(stale)
+        for old in stale:
+            old.close()
+        return pooled
+
+    def _release(self, pooled: PooledYDL) -> None:
+        if not self._expired(pooled):
+            with self._lock:
+                self._check_fork()
+                idle = self._idle.setdefault(pooled.profile, deque())
+                if len(idle) < self.max_idle_per_profile:
+                    idle.append(pooled)
+                    return
+        with self._lock:
+            self._recycled += 1
+        pooled.close()
+
+    @contextmanager
+    def checkout(self, profile: str, opts: Dict[str, Any]) -> Iterator[PooledYDL]:
+        """Borrow a YoutubeDL for `profile` (created from `opts` if none is idle)."""
+        pooled = self._acquire(profile) if self.enabled else None
+        if pooled is None:
+            pooled = PooledYDL(profile, opts)
+            with self._lock:
+                self._created += 1
+
+        pooled.uses += 1
+        try:
+            yield pooled
+        finally:
+            pooled.progress_cb = None
+            pooled.postprocess_cb = None
+            if self.enabled:
+                self._release(pooled)
+            else:
+                pooled.close()
+
+    @contextmanager
+    def fresh(self, profile: str, opts: Dict[str, Any]) -> Iterator[PooledYDL]:
+        """A new, never pooled YoutubeDL built from `opts` (per-call options included), closed afterwards."""
+        pooled = PooledYDL(profile, opts)
+        with self._lock:
+            self._created += 1
+        pooled.uses += 1
+        try:
+            yield pooled
+        finally:
+            pooled.close()
+
+    def clear(self) -> None:
+        """Close all idle instances."""
+        with self._lock:
+            idle = [p for q in self._idle.values() for p in q]
+            self._idle = {}
+        for pooled in idle:
+            pooled.close()
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "enabled": self.enabled,
+                "created": self._created,
+                "reused": self._reused,
+                "recycled": self._recycled,
+                "idle": {k: len(v) for k, v in self._idle.items()},
+            }
+
+
+@lru_cache(maxsize=1)
+def get_ydl_pool() -> YoutubeDLPool:
+    """
+    Process-wide YoutubeDL pool (shared by API routes and Celery tasks in the same process).
+    """
+    settings = get_settings()
+    return YoutubeDLPool(
+        enabled=settings.YTDL_POOL_ENABLED,
+        max_idle_per_profile=settings.YTDL_POOL_MAX_IDLE_PER_PROFILE,
+        max_uses=settings.YTDL_POOL_MAX_USES,
+        max_age_sec=settings.YTDL_POOL_MAX_AGE_SEC,
+    )
@@ -4,18 +4,88 @@ from __future__ import annotations
 
 import os
 import re
+from functools import lru_cache
 from logging import Logger
-from typing import Any, Callable, Dict, List, Optional
-
-import yt_dlp  # pip install yt-dlp
+from typing import Any, Callable, Dict, List, Optional, Tuple
 
 from video_downloader_api.core.logger import get_logger
-from video_downloader_api.downloader.base import BaseDownloader
+from video_downloader_api.downloader.base import BaseDownloader, DownloadCanceledError
+from video_downloader_api.downloader.ydl_pool import YoutubeDLPool, get_ydl_pool
+from video_downloader_api.enums import Platform
 
 # Quality format_id from our API: "best" or numeric "144", "720", "1080" (optionally "720p")
 _QUALITY_PATTERN = re.compile(r"^(?:best|\d+p?)$", re.IGNORECASE)
 
 
+# Option profiles: extract/playlist instances are pooled (playlist_items is set on checkout);
+# downloads get a fresh instance with the format selector and output template in its options
+_EXTRACT_OPTS: Dict[str, Any] = {
+    "quiet": True,
+    "no_warnings": True,
+    "noplaylist": True,
+    "skip_download": True,
+}
+
+_PLAYLIST_OPTS: Dict[str, Any] = {
+    "quiet": True,
+    "no_warnings": True,
+    "noplaylist": False,
+    "extract_flat": True,
+    "skip_download": True,
+}
+
+_DOWNLOAD_OPTS: Dict[str, Any] = {
+    "quiet": True,
+    "no_warnings": True,
+    "noplaylist": True,
+    "continuedl": True,
+    "retries": 3,
+}
+
+_DOWNLOAD_MERGE_OPTS: Dict[str, Any] = {
+    **_DOWNLOAD_OPTS,
+    # Ensure merged output is mp4 (fixes corruption/container issues)
+    "postprocessors": [
+        {"key": "FFmpegVideoConvertor", "preferedformat": "mp4"},
+    ],
+}
+
+
+# yt-dlp extractor name prefix per known platform (e.g. "Youtube" -> Youtube, YoutubeTab, YoutubeClip, ...)
+_PLATFORM_IE_PREFIX: Dict[str, str] = {
+    Platform.YOUTUBE.value: "Youtube",
+    Platform.INSTAGRAM.value: "Instagram",
+    Platform.FACEBOOK.value: "Facebook",
+    Platform.TIKTOK.value: "TikTok",
+}
+
+
+@lru_cache(maxsize=None)
+def _platform_extractors(platform: str) -> Tuple[Any, ...]:
+    """yt-dlp extractor classes for a platform, in yt-dlp's own matching order."""
+    prefix = _PLATFORM_IE_PREFIX.get(platform)
+    if not prefix:
+        return ()
+    from yt_dlp.extractor import gen_extractor_classes
+
+    return tuple(ie for ie in gen_extractor_classes() if ie.ie_key().startswith(prefix))
+
+
+def pinned_ie_key(url: str, platform: Optional[str]) -> Optional[str]:
+    """
+    Extractor key to force for a URL of a known platform, so yt-dlp does not test the
+    URL against its whole extractor list (~1800 regexes). Only the platform's few
+    extractors are checked. Returns None (generic matching) for unknown platforms
+    or URL shapes none of them accept.
+    """
+    if not platform or platform == Platform.UNKNOWN.value:
+        return None
+    for ie in _platform_extractors(platform):
+        if ie.suitable(url):
+            return ie.ie_key()
+    return None
+
+
 def _format_selector(format_id: str) -> str:
     """
     Build yt-dlp format string so we get video+audio (merged). Avoids video-only
@@ -54,47 +124,67 @@ class YtDlpDownloader(BaseDownloader):
     - download(...): download a chosen format and report progress via callback
     """
 
-    def __init__(self, logger: Optional[Logger] = None) -> None:
+    def __init__(self, logger: Optional[Logger] = None, pool: Optional[YoutubeDLPool] = None) -> None:
         self.logger: Logger = logger or get_logger(self.__class__.__name__)
+        self.pool: YoutubeDLPool = pool or get_ydl_pool()
 
-    def extract_info(self, url: str) -> Dict[str, Any]:
+    def warm_up(self) -> None:
+        """
+        Pay one-time yt-dlp costs ahead of the first job: import yt_dlp, load extractor
+        classes, compile the known platforms' URL patterns and build (then close) one
+        download YoutubeDL so the lazily imported networking/post-processing modules are loaded.
+        """
+        for platform in _PLATFORM_IE_PREFIX:
+            for ie in _platform_extractors(platform):
+                ie.suitable("")  # compiles and caches _VALID_URL on the class
+        with self.pool.fresh("download_merge", _DOWNLOAD_MERGE_OPTS):
+            pass
+
+    def extract_info(self, url: str, platform: Optional[str] = None) -> Dict[str, Any]:
         """
         Calls yt-dlp with download=False to retrieve metadata.
+        A known platform pins the extractor (see pinned_ie_key).
 
         Returns:
             Raw yt-dlp info dict.
         """
-        ydl_opts: Dict[str, Any] = {
-            "quiet": True,
-            "no_warnings": True,
-            "noplaylist": True,
-            "skip_download": True,
-        }
-
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
+            with self.pool.checkout("extract", _EXTRACT_OPTS) as pooled:
+                info = pooled.ydl.extract_info(url, download=False, ie_key=pinned_ie_key(url, platform))
                 return info or {}
         except Exception as e:
             self.logger.exception("yt-dlp extract_info failed for url=%s", url)
             raise RuntimeError(f"Failed to extract video info: {e}") from e
 
-    def extract_playlist(self, url: str) -> Dict[str, Any]:
+    def extract_playlist(
+        self,
+        url: str,
+        offset: int = 0,
+        limit: Optional[int] = None,
+        platform: Optional[str] = None,
+    ) -> Dict[str, Any]:
         """
         Extract high-level playlist information (entries) without downloading.
         Used for playlist metadata; does not change single-video behavior.
+
+        offset/limit select a window of entries (mapped onto yt-dlp playlist_items),
+        so huge channels do not need to be paged through completely.
         """
-        ydl_opts: Dict[str, Any] = {
-            "quiet": True,
-            "no_warnings": True,
-            "noplaylist": False,
-            "extract_flat": True,
-            "skip_download": True,
-        }
+        playlist_items: Optional[str] = None
+        if offset > 0 or limit is not None:
+            # playlist_items is 1-based and inclusive: "11:30" -> entries 11..30
+            start = max(0, int(offset)) + 1
+            end = str(start + int(limit) - 1) if limit is not None else ""
+            playlist_items = f"{start}:{end}"
 
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                info = ydl.extract_info(url, download=False)
+            with self.pool.checkout("playlist", _PLAYLIST_OPTS) as pooled:
+                ydl = pooled.ydl
+                ydl.params["playlist_items"] = playlist_items
+                try:
+                    info = ydl.extract_info(url, download=False, ie_key=pinned_ie_key(url, platform))
+                finally:
+                    ydl.params.pop("playlist_items", None)
                 return info or {}
         except Exception as e:
             self.logger.exception("yt-dlp extract_playlist failed for url=%s", url)
@@ -115,10 +205,20 @@ class YtDlpDownloader(BaseDownloader):
         format_id: str,
         output_path: str,
         progress_cb: Callable[[Dict[str, Any]], None],
+        platform: Optional[str] = None,
+        info: Optional[Dict[str, Any]] = None,
+        cancel_check: Optional[Callable[[], None]] = None,
     ) -> str:
         """
         Downloads a specific format using yt-dlp. For quality-based ids (e.g. "720",
         "best") uses merged bestvideo+bestaudio so output has both video and audio.
+
+        With `info` (a stored extract_info result) the download starts from it via
+        process_ie_result, like yt-dlp's --load-info-json. If its signed URLs are no
+        longer valid, falls back to a fresh extraction of `url`.
+
+        cancel_check runs when each post-processor (ffmpeg merge/convert) starts and
+        finishes and before the fallback extraction; a single ffmpeg run is not interrupted.
         """
         out_dir = os.path.dirname(os.path.abspath(output_path))
         if out_dir:
@@ -127,33 +227,51 @@ class YtDlpDownloader(BaseDownloader):
         def _hook(d: Dict[str, Any]) -> None:
             try:
                 progress_cb(d)
+            except DownloadCanceledError:
+                # yt-dlp lets hook exceptions through: this stops the transfer right here
+                raise
             except Exception:
                 self.logger.exception("Progress callback failed (job may still continue).")
 
-        format_selector = _format_selector(format_id)
-        use_merge = _is_quality_selector(format_id)
+        def _pp_hook(d: Dict[str, Any]) -> None:
+            # Raises DownloadCanceledError before/after each post-processing step
+            if cancel_check is not None:
+                cancel_check()
 
-        ydl_opts: Dict[str, Any] = {
-            "quiet": True,
-            "no_warnings": True,
-            "noplaylist": True,
-            "format": format_selector,
-            "outtmpl": output_path,
-            "progress_hooks": [_hook],
-            "continuedl": True,
-            "retries": 3,
-        }
-
-        if use_merge:
-            # Ensure merged output is mp4 (fixes corruption/container issues)
-            ydl_opts["postprocessors"] = [
-                {"key": "FFmpegVideoConvertor", "preferedformat": "mp4"},
-            ]
+        use_merge = _is_quality_selector(format_id)
+        profile, opts = ("download_merge", _DOWNLOAD_MERGE_OPTS) if use_merge else ("download", _DOWNLOAD_OPTS)
+        opts = {**opts, "format": _format_selector(format_id), "outtmpl": {"default": output_path}}
 
         try:
-            with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                ydl.download([url])
+            # Not pooled: per-call format/outtmpl and per-run state (_download_retcode,
+            # archive, postprocessors) must not carry over between jobs
+            with self.pool.fresh(profile, opts) as pooled:
+                ydl = pooled.ydl
+                pooled.progress_cb = _hook
+                pooled.postprocess_cb = _pp_hook
+                if info is not None and self._download_from_info(ydl, info, url):
+                    return output_path
+                if cancel_check is not None:
+                    cancel_check()
+                # Same as ydl.download([url]) but with the extractor pinned
+                ydl.extract_info(url, download=True, ie_key=pinned_ie_key(url, platform))
             return output_path
+        except DownloadCanceledError:
+            raise
         except Exception as e:
             self.logger.exception("yt-dlp download failed for url=%s format_id=%s", url, format_id)
-            raise RuntimeError(f"Failed to download video: {e}") from e
\ No newline at end of file
+            raise RuntimeError(f"Failed to download video: {e}") from e
+
+    def _download_from_info(self, ydl: Any, info: Dict[str, Any], url: str) -> bool:
+        """
+        Download from a stored info dict. Returns False if it turned out stale
+        (expired/forbidden format URLs) so the caller re-extracts.
+        """
+        from yt_dlp.utils import DownloadError, ReExtractInfo
+
+        try:
+            ydl.process_ie_result(ydl.sanitize_info(dict(info), remove_private_keys=True), download=True)
+            return True
+        except (DownloadError, ReExtractInfo) as e:
+            self.logger.warning("Stored info failed for url=%s (%s); extracting again.", url, e)
+            return False
@@ -1,2 +1,2 @@
-from .job_status import JobStatus
+from .job_status import TERMINAL_STATUSES, JobStatus
 from .platform import Platform
@@ -7,3 +7,7 @@ class JobStatus(str, Enum):
     FINISHED = "finished"
     FAILED = "failed"
     CANCELED = "canceled"
+
+
+# Statuses a job never leaves
+TERMINAL_STATUSES = frozenset({JobStatus.FINISHED.value, JobStatus.FAILED.value, JobStatus.CANCELED.value})
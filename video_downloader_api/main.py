@@ -16,10 +16,34 @@ from sqlalchemy import text
 
 from video_downloader_api.db.models import Base
 from video_downloader_api.db.session import engine
+from video_downloader_api.services.events_service import get_events_service
 
 
 logger = get_logger("main")
 
+# (column name, SQLite DDL) added to download_jobs after tables may already exist
+_SQLITE_ADDED_COLUMNS = (
+    ("title", "VARCHAR(512)"),
+    ("batch_id", "VARCHAR(36)"),
+    ("batch_index", "INTEGER"),
+    ("info_ref", "VARCHAR(64)"),
+    ("content_key", "VARCHAR(128)"),
+    ("canceled_at", "DATETIME"),
+    ("duration_sec", "INTEGER"),
+    ("est_bytes", "BIGINT"),
+    ("size_bucket", "VARCHAR(16)"),
+    ("priority", "INTEGER"),
+    ("started_at", "DATETIME"),
+    ("tenant", "VARCHAR(64)"),
+)
+
+# (index name, column) for indexed columns in _SQLITE_ADDED_COLUMNS
+_SQLITE_ADDED_INDEXES = (
+    ("ix_download_jobs_batch_id", "batch_id"),
+    ("ix_download_jobs_content_key", "content_key"),
+    ("ix_download_jobs_started_at", "started_at"),
+)
+
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
@@ -43,22 +67,27 @@ async def lifespan(app: FastAPI):
     except Exception as e:
         logger.exception("❌ Failed to create DB tables: %s", e)
 
-    # ✅ Migration: add 'title' column to download_jobs if missing (existing DBs)
+    # ✅ Migration: add columns introduced after the first release to download_jobs (existing DBs)
     try:
         with engine.connect() as conn:
             if "sqlite" in (settings.DATABASE_URL or "").lower():
                 r = conn.execute(text("PRAGMA table_info(download_jobs)"))
                 columns = [row[1] for row in r]
-                if "title" not in columns:
-                    conn.execute(text("ALTER TABLE download_jobs ADD COLUMN title VARCHAR(512)"))
-                    conn.commit()
-                    logger.info("✅ Added 'title' column to download_jobs.")
+                for name, ddl in _SQLITE_ADDED_COLUMNS:
+                    if name not in columns:
+                        conn.execute(text(f"ALTER TABLE download_jobs ADD COLUMN {name} {ddl}"))
+                        conn.commit()
+                        logger.info("✅ Added '%s' column to download_jobs.", name)
+                for index_name, column in _SQLITE_ADDED_INDEXES:
+                    conn.execute(text(f"CREATE INDEX IF NOT EXISTS {index_name} ON download_jobs ({column})"))
+                conn.commit()
     except Exception as e:
-        logger.exception("⚠️ Migration (title column) skipped or failed: %s", e)
+        logger.exception("⚠️ Migration (added columns) skipped or failed: %s", e)
 
     yield
 
     logger.info("👋 Shutting down...")
+    get_events_service().close()
 
 
 def create_app() -> FastAPI:
@@ -6,26 +6,44 @@ from typing import Optional
 
 from fastapi import Header, HTTPException, status
 
-from video_downloader_api.core.config import get_settings
+from video_downloader_api.core.config import DEFAULT_TENANT, get_settings
+
+
+def is_valid_api_key(key: Optional[str]) -> bool:
+    """True if key is API_KEY or one of API_KEYS (or no key is configured at all)."""
+    settings = get_settings()
+    if not settings.API_KEY and not settings.API_KEYS:
+        return True
+    if not key:
+        return False
+    return key == settings.API_KEY or key in settings.API_KEYS
+
+
+def tenant_for_api_key(key: Optional[str]) -> str:
+    """Tenant (fair-share unit) of a request's API key."""
+    if key:
+        tenant = get_settings().API_KEYS.get(key)
+        if tenant:
+            return tenant
+    return DEFAULT_TENANT
 
 
 def verify_api_key(x_api_key: Optional[str] = Header(default=None, alias="X-API-KEY")) -> None:
     """
     Simple API key protection.
 
-    If settings.API_KEY is set:
-      - requires X-API-KEY header to match
-    If settings.API_KEY is None:
+    If settings.API_KEY or settings.API_KEYS is set:
+      - requires X-API-KEY header to match one of them
+    If neither is set:
       - allows all requests (dev mode)
     """
-    settings = get_settings()
-
-    # If no API key configured, skip auth
-    if not settings.API_KEY:
-        return
-
-    if not x_api_key or x_api_key != settings.API_KEY:
+    if not is_valid_api_key(x_api_key):
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail="Invalid or missing API key.",
         )
+
+
+def get_tenant(x_api_key: Optional[str] = Header(default=None, alias="X-API-KEY")) -> str:
+    """Dependency: tenant of the request (see tenant_for_api_key)."""
+    return tenant_for_api_key(x_api_key)
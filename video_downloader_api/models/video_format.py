@@ -2,27 +2,69 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import Optional
+from typing import Any, Dict, NamedTuple, Optional
 
+from video_downloader_api.utils.helpers import safe_int
 
-@dataclass(frozen=True)
-class VideoFormat:
+
+def _codec(value: Any) -> Optional[str]:
+    return str(value) if value else None
+
+
+class VideoFormat(NamedTuple):
     """
     Internal domain model for a single downloadable format.
 
     This is NOT a Pydantic schema and NOT a DB model.
-    It's used inside services/downloader logic (optional).
+    Tuple-backed (no per-instance __dict__) and holds only the fields services use,
+    so a projected format costs a fraction of yt-dlp's raw format dict
+    (which carries URLs, fragments, http_headers, ...).
     """
 
     format_id: str
-    quality: str  # "360p", "720p", etc.
     ext: str  # "mp4", "webm", etc.
+    height: Optional[int] = None
 
     filesize_bytes: Optional[int] = None
     fps: Optional[int] = None
-    vcodec: Optional[str] = None
-    acodec: Optional[str] = None
+    vcodec: Optional[str] = None  # yt-dlp value as-is ("none" = no video stream)
+    acodec: Optional[str] = None  # yt-dlp value as-is ("none" = no audio stream)
+
+    @classmethod
+    def from_raw(cls, fmt: Dict[str, Any]) -> Optional["VideoFormat"]:
+        """Project a raw yt-dlp format dict. Returns None for storyboards and malformed entries."""
+        if not isinstance(fmt, dict) or fmt.get("format_note") == "storyboard":
+            return None
+        filesize = fmt.get("filesize") or fmt.get("filesize_approx")
+        return cls(
+            format_id=str(fmt.get("format_id") or ""),
+            ext=str(fmt.get("ext") or "mp4"),
+            height=safe_int(fmt.get("height"), default=None),
+            filesize_bytes=safe_int(filesize, default=None),
+            fps=safe_int(fmt.get("fps"), default=None),
+            vcodec=_codec(fmt.get("vcodec")),
+            acodec=_codec(fmt.get("acodec")),
+        )
+
+    @property
+    def quality(self) -> str:
+        """"360p", "720p", etc. ("unknown" without a height)."""
+        if self.height is not None and self.height > 0:
+            return f"{self.height}p"
+        return "unknown"
+
+    @property
+    def has_video(self) -> bool:
+        return self.vcodec is not None and self.vcodec.lower() != "none"
+
+    @property
+    def has_audio(self) -> bool:
+        return self.acodec is not None and self.acodec.lower() != "none"
+
+    @property
+    def is_merged(self) -> bool:
+        """True if this format has both video and audio (single file)."""
+        return self.has_video and self.has_audio
 
     @property
     def is_size_known(self) -> bool:
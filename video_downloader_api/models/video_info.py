@@ -2,18 +2,20 @@
 
 from __future__ import annotations
 
-from dataclasses import dataclass
-from typing import List, Optional
+import json
+from typing import Any, Dict, Iterable, NamedTuple, Optional, Tuple, Union
 
 from video_downloader_api.models.video_format import VideoFormat
+from video_downloader_api.utils.helpers import safe_int
 
 
-@dataclass(frozen=True)
-class VideoInfo:
+class VideoInfo(NamedTuple):
     """
     Internal domain model for complete video metadata.
 
     This is separate from schemas.VideoInfoOut (API response).
+    Extraction results are projected into this right away (see from_raw) and the
+    raw yt-dlp dict is dropped.
     """
 
     source_url: str
@@ -21,9 +23,35 @@ class VideoInfo:
     title: Optional[str] = None
     duration_sec: Optional[int] = None
     thumbnail: Optional[str] = None
-    formats: List[VideoFormat] = None
-
-    def __post_init__(self):
-        # dataclass with default None list is unsafe; normalize it.
-        if self.formats is None:
-            object.__setattr__(self, "formats", [])
+    formats: Tuple[VideoFormat, ...] = ()
+
+    @classmethod
+    def from_raw(
+        cls,
+        platform: str,
+        source_url: str,
+        info: Dict[str, Any],
+        raw_formats: Iterable[Dict[str, Any]],
+    ) -> "VideoInfo":
+        """Project a raw extraction result (info dict + its downloader-listed formats)."""
+        title = info.get("title")
+        thumbnail = info.get("thumbnail")
+        formats = tuple(f for f in map(VideoFormat.from_raw, raw_formats) if f is not None)
+        return cls(
+            source_url=source_url,
+            platform=platform,
+            title=str(title) if title else None,
+            duration_sec=safe_int(info.get("duration"), default=None),
+            thumbnail=str(thumbnail) if thumbnail else None,
+            formats=formats,
+        )
+
+    def to_json(self) -> str:
+        """Positional JSON (nested arrays), e.g. for sharing a result through Redis."""
+        return json.dumps(self, separators=(",", ":"))
+
+    @classmethod
+    def from_json(cls, raw: Union[str, bytes]) -> "VideoInfo":
+        data = json.loads(raw)
+        *head, formats = data
+        return cls(*head, formats=tuple(VideoFormat(*f) for f in formats))
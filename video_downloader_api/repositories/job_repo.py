@@ -2,10 +2,11 @@
 
 from __future__ import annotations
 
+import uuid
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Any, Dict, List, Optional, Sequence, Tuple
 
-from sqlalchemy import select
+from sqlalchemy import func, select, update
 from sqlalchemy.orm import Session
 
 from video_downloader_api.db.models import DownloadJob
@@ -31,6 +32,13 @@ class JobRepository:
         format_id: Optional[str],
         quality: Optional[str],
         title: Optional[str] = None,
+        content_key: Optional[str] = None,
+        info_ref: Optional[str] = None,
+        duration_sec: Optional[int] = None,
+        est_bytes: Optional[int] = None,
+        size_bucket: Optional[str] = None,
+        priority: Optional[int] = None,
+        tenant: Optional[str] = None,
     ) -> DownloadJob:
         job = DownloadJob(
             source_url=source_url,
@@ -39,6 +47,13 @@ class JobRepository:
             format_id=format_id,
             quality=quality,
             title=title,
+            content_key=content_key,
+            info_ref=info_ref,
+            duration_sec=duration_sec,
+            est_bytes=est_bytes,
+            size_bucket=size_bucket,
+            priority=priority,
+            tenant=tenant,
             downloaded_bytes=0,
             total_bytes=None,
             speed_bps=None,
@@ -54,19 +69,165 @@ class JobRepository:
         self.db.refresh(job)
         return job
 
+    def create_jobs(self, items: List[Dict[str, Any]], batch_id: Optional[str] = None) -> List[DownloadJob]:
+        """
+        Bulk-create queued jobs in a single transaction (one commit, batched INSERT).
+
+        Each item: source_url, platform, format_id, quality, title, content_key; optional:
+        info_ref, duration_sec, est_bytes, size_bucket, priority, tenant.
+        Ids are generated here so no refresh round trip is needed after commit.
+        With batch_id, each job also stores its position in `items` (batch_index).
+        """
+        now = utc_now()
+        jobs = [
+            DownloadJob(
+                id=str(uuid.uuid4()),
+                source_url=item["source_url"],
+                platform=item["platform"],
+                status="queued",
+                format_id=item.get("format_id"),
+                quality=item.get("quality"),
+                title=item.get("title"),
+                content_key=item.get("content_key"),
+                info_ref=item.get("info_ref"),
+                duration_sec=item.get("duration_sec"),
+                est_bytes=item.get("est_bytes"),
+                size_bucket=item.get("size_bucket"),
+                priority=item.get("priority"),
+                tenant=item.get("tenant"),
+                batch_id=batch_id,
+                batch_index=index if batch_id is not None else None,
+                downloaded_bytes=0,
+                created_at=now,
+                updated_at=now,
+            )
+            for index, item in enumerate(items)
+        ]
+        self.db.add_all(jobs)
+        self.db.commit()
+        return jobs
+
+    def list_jobs_by_batch(self, batch_id: str) -> List[DownloadJob]:
+        """Jobs of a batch in request order (all share one created_at)."""
+        stmt = (
+            select(DownloadJob)
+            .where(DownloadJob.batch_id == batch_id)
+            .order_by(DownloadJob.batch_index, DownloadJob.created_at)
+        )
+        return list(self.db.execute(stmt).scalars().all())
+
+    def list_jobs(self, job_ids: List[str]) -> List[DownloadJob]:
+        """Jobs with the given ids in one query (unknown ids are skipped)."""
+        if not job_ids:
+            return []
+        stmt = select(DownloadJob).where(DownloadJob.id.in_(job_ids))
+        return list(self.db.execute(stmt).scalars().all())
+
+    def count_by_platform(self, statuses: Sequence[str]) -> Dict[Tuple[str, str], int]:
+        """{(platform, status): count} for jobs in the given statuses (one GROUP BY)."""
+        stmt = (
+            select(DownloadJob.platform, DownloadJob.status, func.count())
+            .where(DownloadJob.status.in_(statuses))
+            .group_by(DownloadJob.platform, DownloadJob.status)
+        )
+        return {(platform, status): int(n) for platform, status, n in self.db.execute(stmt).all()}
+
     def get_job(self, job_id: str) -> Optional[DownloadJob]:
         stmt = select(DownloadJob).where(DownloadJob.id == job_id)
         return self.db.execute(stmt).scalars().first()
 
-    def update_status(self, job_id: str, status: str, error: Optional[str] = None) -> None:
-        job = self.get_job(job_id)
-        if not job:
-            return
-        job.status = status
-        job.error = error
-        job.updated_at = utc_now()
-        self.db.add(job)
+    def get_cancel_state(self, job_id: str) -> Optional[Tuple[str, Optional[datetime]]]:
+        """(status, canceled_at) only: cheap check polled by running workers."""
+        stmt = select(DownloadJob.status, DownloadJob.canceled_at).where(DownloadJob.id == job_id)
+        row = self.db.execute(stmt).first()
+        return (row[0], row[1]) if row is not None else None
+
+    def claim_job(self, job_id: str) -> bool:
+        """
+        queued -> downloading (+ started_at) for the worker that runs the job.
+        False if the job is no longer queued: canceled, or a duplicate message
+        (jobs re-enqueued at a higher priority by PriorityAger) already ran it.
+        """
+        claimed = self._update(
+            job_id,
+            DownloadJob.status == "queued",
+            status="downloading",
+            error=None,
+            started_at=utc_now(),
+        )
+        return claimed > 0
+
+    def list_agable(self, queued_before: datetime, limit: int = 200) -> List[DownloadJob]:
+        """Oldest queued jobs created before queued_before that can still move up (priority > 0)."""
+        stmt = (
+            select(DownloadJob)
+            .where(
+                DownloadJob.status == "queued",
+                DownloadJob.priority > 0,
+                DownloadJob.created_at < queued_before,
+            )
+            .order_by(DownloadJob.created_at)
+            .limit(limit)
+        )
+        return list(self.db.execute(stmt).scalars().all())
+
+    def promote(self, job_id: str, from_priority: int, to_priority: int) -> bool:
+        """Conditional priority change: only one process wins (and re-enqueues) per step."""
+        return (
+            self._update(
+                job_id,
+                DownloadJob.status == "queued",
+                DownloadJob.priority == from_priority,
+                priority=to_priority,
+            )
+            > 0
+        )
+
+    def list_started(self, started_after: datetime) -> List[Tuple[Optional[str], datetime, datetime]]:
+        """(size_bucket, created_at, started_at) of jobs picked up since started_after."""
+        stmt = select(DownloadJob.size_bucket, DownloadJob.created_at, DownloadJob.started_at).where(
+            DownloadJob.started_at >= started_after
+        )
+        return [(bucket, created, started) for bucket, created, started in self.db.execute(stmt).all()]
+
+    def update_status(
+        self,
+        job_id: str,
+        status: str,
+        error: Optional[str] = None,
+        unless_status: Sequence[str] = (),
+    ) -> bool:
+        """
+        Set status/error. With unless_status, rows currently in one of those statuses
+        are left alone (e.g. a worker must not overwrite "canceled").
+        Returns True if the row was updated.
+        """
+        return self._update(job_id, *_status_not_in(unless_status), status=status, error=error) > 0
+
+    def cancel_jobs(self, job_ids: Sequence[str], active_statuses: Sequence[str]) -> List[str]:
+        """
+        Mark jobs canceled if they are still in one of active_statuses (queued/downloading).
+        Returns the ids that were canceled by this call.
+        """
+        if not job_ids:
+            return []
+        stmt = select(DownloadJob.id).where(DownloadJob.id.in_(job_ids), DownloadJob.status.in_(active_statuses))
+        candidates = list(self.db.execute(stmt).scalars().all())
+        if not candidates:
+            return []
+
+        now = utc_now()
+        result = self.db.execute(
+            update(DownloadJob)
+            .where(DownloadJob.id.in_(candidates), DownloadJob.status.in_(active_statuses))
+            .values(status="canceled", error="Canceled by user.", canceled_at=now, updated_at=now)
+        )
         self.db.commit()
+        if result.rowcount == len(candidates):
+            return candidates
+        # Some finished between the SELECT and the UPDATE
+        stmt = select(DownloadJob.id).where(DownloadJob.id.in_(candidates), DownloadJob.status == "canceled")
+        return list(self.db.execute(stmt).scalars().all())
 
     def update_progress(
         self,
@@ -76,27 +237,53 @@ class JobRepository:
         speed_bps: Optional[float],
         eta_sec: Optional[int],
     ) -> None:
-        job = self.get_job(job_id)
-        if not job:
-            return
+        self._update(job_id, **_progress_values(downloaded_bytes, total_bytes, speed_bps, eta_sec))
 
-        job.downloaded_bytes = max(0, int(downloaded_bytes))
-        job.total_bytes = int(total_bytes) if total_bytes is not None else None
-        job.speed_bps = float(speed_bps) if speed_bps is not None else None
-        job.eta_sec = int(eta_sec) if eta_sec is not None else None
-        job.updated_at = utc_now()
+    def set_file(self, job_id: str, file_path: str, public_url: Optional[str]) -> None:
+        self._update(job_id, file_path=file_path, public_url=public_url)
 
-        self.db.add(job)
+    def finish_job(self, job_id: str, file_path: str, public_url: Optional[str]) -> bool:
+        """
+        Mark finished with its file in one UPDATE, unless the job was canceled meanwhile
+        (a canceled row never gets a file_path/public_url of files the worker removes).
+        Returns True if the row was updated.
+        """
+        return (
+            self._update(
+                job_id,
+                *_status_not_in(("canceled",)),
+                status="finished",
+                error=None,
+                file_path=file_path,
+                public_url=public_url,
+            )
+            > 0
+        )
+
+    def _update(self, job_id: str, *conditions: Any, **values: Any) -> int:
+        """
+        Single UPDATE ... WHERE id = :job_id [AND conditions] (no SELECT first).
+        Returns the number of rows updated (0 for unknown ids).
+        """
+        values["updated_at"] = utc_now()
+        result = self.db.execute(update(DownloadJob).where(DownloadJob.id == job_id, *conditions).values(**values))
         self.db.commit()
+        return result.rowcount
 
-    def set_file(self, job_id: str, file_path: str, public_url: Optional[str]) -> None:
-        job = self.get_job(job_id)
-        if not job:
-            return
 
-        job.file_path = file_path
-        job.public_url = public_url
-        job.updated_at = utc_now()
+def _status_not_in(statuses: Sequence[str]) -> Tuple[Any, ...]:
+    return (DownloadJob.status.not_in(list(statuses)),) if statuses else ()
 
-        self.db.add(job)
-        self.db.commit()
+
+def _progress_values(
+    downloaded_bytes: int,
+    total_bytes: Optional[int],
+    speed_bps: Optional[float],
+    eta_sec: Optional[int],
+) -> Dict[str, Any]:
+    return {
+        "downloaded_bytes": max(0, int(downloaded_bytes)),
+        "total_bytes": int(total_bytes) if total_bytes is not None else None,
+        "speed_bps": float(speed_bps) if speed_bps is not None else None,
+        "eta_sec": int(eta_sec) if eta_sec is not None else None,
+    }
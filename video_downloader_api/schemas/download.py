@@ -2,7 +2,7 @@
 
 from __future__ import annotations
 
-from typing import Optional, Union
+from typing import List, Optional, Union
 
 from pydantic import BaseModel, Field, HttpUrl
 
@@ -19,6 +19,33 @@ class LinkCheckRequest(BaseModel):
         description="Video URL pasted by the user (YouTube, Instagram, Facebook, TikTok).",
         examples=["https://www.youtube.com/watch?v=dQw4w9WgXcQ"],
     )
+    bypass_cache: bool = Field(
+        default=False,
+        description="If true, /download/info skips the metadata cache and extracts fresh info.",
+    )
+
+
+class PlaylistInfoRequest(LinkCheckRequest):
+    """
+    Request payload used for:
+    - POST /download/playlist-info
+    - POST /download/playlist-info/stream
+
+    offset/limit page through large playlists/channels; pass the previous
+    response's next_offset as offset to fetch the next page.
+    """
+
+    offset: int = Field(default=0, ge=0, description="Number of playlist entries to skip.")
+    limit: Optional[int] = Field(
+        default=None,
+        ge=1,
+        le=500,
+        description="Max number of entries to return (default: all remaining).",
+    )
+    flat: bool = Field(
+        default=False,
+        description="If true, return only the flat entry list (no per-entry format resolution).",
+    )
 
 
 class LinkCheckResponse(BaseModel):
@@ -85,3 +112,33 @@ class DownloadStartResponse(BaseModel):
         default=None,
         description="File download URL (available after job finishes).",
     )
+
+
+class DownloadBatchStartRequest(BaseModel):
+    """
+    Request payload used to start many download jobs at once (e.g. a playlist).
+    """
+
+    items: List[DownloadStartRequest] = Field(
+        ...,
+        min_length=1,
+        max_length=500,
+        description="Downloads to start (same shape as /download/start).",
+    )
+
+
+class DownloadBatchStartResponse(BaseModel):
+    """
+    Response returned immediately after creating a batch of download jobs.
+    """
+
+    batch_id: str = Field(..., description="Unique identifier for the batch.")
+    status_url: str = Field(
+        ...,
+        description="Endpoint to poll aggregated batch status.",
+        examples=["/api/v1/download/batch/abc123"],
+    )
+    jobs: List[DownloadStartResponse] = Field(
+        default_factory=list,
+        description="Created jobs, in request order.",
+    )
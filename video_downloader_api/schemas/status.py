@@ -3,7 +3,7 @@
 from __future__ import annotations
 
 from datetime import datetime
-from typing import Optional
+from typing import Dict, List, Optional
 
 from pydantic import BaseModel, Field
 
@@ -40,3 +40,29 @@ class JobStatusOut(BaseModel):
 
     created_at: datetime = Field(..., description="Job creation timestamp (UTC).")
     updated_at: datetime = Field(..., description="Last update timestamp (UTC).")
+
+
+class BatchStatusOut(BaseModel):
+    """
+    Aggregated status of a batch created via /download/start-batch.
+    """
+
+    batch_id: str = Field(..., description="Unique identifier for the batch.")
+    total_jobs: int = Field(..., description="Number of jobs in the batch.")
+    counts: Dict[str, int] = Field(
+        default_factory=dict,
+        description='Number of jobs per status, e.g. {"queued": 3, "downloading": 2, "finished": 5}.',
+    )
+    done: bool = Field(..., description="True when every job reached a terminal status (finished/failed/canceled).")
+
+    downloaded_bytes: int = Field(default=0, description="Sum of downloaded bytes over all jobs.")
+    total_bytes: Optional[int] = Field(
+        default=None,
+        description="Sum of total bytes (only when known for every job).",
+    )
+    percent: Optional[float] = Field(
+        default=None,
+        description="Batch progress percentage (0-100): byte-based if sizes are known, else share of finished jobs.",
+    )
+
+    jobs: List[JobStatusOut] = Field(default_factory=list, description="Per-job status, in creation order.")
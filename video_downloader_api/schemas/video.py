@@ -53,6 +53,19 @@ class VideoInfoOut(BaseModel):
     )
 
 
+class PlaylistEntryOut(BaseModel):
+    """
+    Lightweight playlist entry (no formats). Returned when flat=true so clients can
+    render the list instantly and call /download/info only for selected items.
+    """
+
+    id: Optional[str] = Field(default=None, description="Platform video id if available.")
+    url: str = Field(..., description="Video URL (pass to /download/info).")
+    title: Optional[str] = Field(default=None, description="Video title if available.")
+    duration_sec: Optional[int] = Field(default=None, description="Duration in seconds if available.")
+    thumbnail: Optional[str] = Field(default=None, description="Thumbnail URL if available.")
+
+
 class PlaylistInfoOut(BaseModel):
     """
     Metadata for a playlist URL, containing multiple videos.
@@ -62,5 +75,16 @@ class PlaylistInfoOut(BaseModel):
     playlist_url: str = Field(..., description="Normalized playlist URL.")
     videos: List[VideoInfoOut] = Field(
         default_factory=list,
-        description="Videos contained in the playlist (each with its own formats).",
+        description="Videos contained in the playlist (each with its own formats). Empty when flat=true.",
+    )
+    entries: List[PlaylistEntryOut] = Field(
+        default_factory=list,
+        description="Flat entry list (only filled when flat=true).",
+    )
+
+    offset: int = Field(default=0, description="Offset of the first entry in this page.")
+    next_offset: Optional[int] = Field(
+        default=None,
+        description="Cursor for the next page (pass as offset), or null if this is the last page.",
     )
+    total_count: Optional[int] = Field(default=None, description="Total playlist size if the platform reports it.")
@@ -0,0 +1,70 @@
+# video_downloader_api/services/cancellation.py
+
+from __future__ import annotations
+
+import time
+from datetime import datetime, timezone
+from typing import Callable, Optional
+
+from video_downloader_api.core.config import get_settings
+from video_downloader_api.downloader.base import DownloadCanceledError
+from video_downloader_api.repositories.job_repo import JobRepository
+
+
+class CancellationToken:
+    """
+    Worker-side view of "has this job been canceled?" (DELETE /download/{job_id}
+    sets status "canceled" + canceled_at in the DB).
+
+    check() is called from the download's progress hook and raises
+    DownloadCanceledError, which aborts yt-dlp mid-transfer. The DB is read
+    (status, canceled_at only) at most every check_interval_ms, so a running job
+    stops within check_interval_ms + the gap between two hooks.
+    """
+
+    def __init__(
+        self,
+        job_id: str,
+        repo_factory: Callable[[], JobRepository],
+        check_interval_ms: Optional[int] = None,
+    ) -> None:
+        if check_interval_ms is None:
+            check_interval_ms = get_settings().CANCEL_CHECK_INTERVAL_MS
+        self.job_id = job_id
+        self.repo_factory = repo_factory
+        self.check_interval_sec = max(0, int(check_interval_ms)) / 1000.0
+
+        self.canceled = False
+        self.canceled_at: Optional[datetime] = None
+        self.checks = 0
+        self._last_check = 0.0
+
+    def is_canceled(self, force: bool = False) -> bool:
+        if self.canceled:
+            return True
+        now = time.monotonic()
+        if not force and now - self._last_check < self.check_interval_sec:
+            return False
+        self._last_check = now
+        self.checks += 1
+
+        state = self.repo_factory().get_cancel_state(self.job_id)
+        if state is not None and state[0] == "canceled":
+            self.canceled = True
+            self.canceled_at = state[1]
+        return self.canceled
+
+    def check(self, force: bool = False) -> None:
+        """Raise DownloadCanceledError if the job was canceled (throttled DB read)."""
+        if self.is_canceled(force=force):
+            raise DownloadCanceledError(f"Job {self.job_id} was canceled.")
+
+    def latency_ms(self) -> Optional[float]:
+        """Milliseconds from the cancel request to now (None if unknown)."""
+        if self.canceled_at is None:
+            return None
+        canceled_at = self.canceled_at
+        if canceled_at.tzinfo is None:
+            # SQLite returns naive datetimes (stored as UTC)
+            canceled_at = canceled_at.replace(tzinfo=timezone.utc)
+        return (datetime.now(timezone.utc) - canceled_at).total_seconds() * 1000.0
@@ -0,0 +1,101 @@
+# video_downloader_api/services/download_queues.py
+
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Any, Dict, Iterable, List, NamedTuple, Optional
+
+from video_downloader_api.core.config import _parse_list, get_settings
+from video_downloader_api.enums import Platform
+from video_downloader_api.services.redis_client import LazyRedis
+
+# Fallback queue: unknown platforms, per-platform routing disabled, tasks enqueued by older API versions
+DEFAULT_QUEUE = "downloads"
+DEFAULT_LANE = "default"
+
+PLATFORM_LANES = tuple(p.value for p in Platform if p is not Platform.UNKNOWN)
+
+# Redis broker priority lists: "<queue>" (priority 0, served first) and "<queue>:<n>"
+PRIORITY_STEPS = tuple(range(10))
+PRIORITY_SEP = ":"
+
+
+class QueueLane(NamedTuple):
+    """One Celery download queue and the worker settings it is consumed with."""
+
+    name: str
+    queue: str
+    concurrency: int
+    prefetch_multiplier: int
+
+
+def queue_for_platform(platform: Optional[str]) -> str:
+    """Celery queue for a job of this platform (DownloadJob.platform)."""
+    if not get_settings().DOWNLOAD_QUEUE_PER_PLATFORM:
+        return DEFAULT_QUEUE
+    name = (platform or "").strip().lower()
+    return f"{DEFAULT_QUEUE}.{name}" if name in PLATFORM_LANES else DEFAULT_QUEUE
+
+
+def all_lanes() -> List[QueueLane]:
+    return [_lane(name) for name in (DEFAULT_LANE, *PLATFORM_LANES)]
+
+
+def select_lanes(names: Any) -> List[QueueLane]:
+    """
+    Lanes for a worker queue subset: platform names and/or "default"
+    (CSV string or list, as in WORKER_QUEUES). Empty -> all lanes.
+    """
+    selected = [n.lower() for n in _parse_list(names)]
+    if not selected:
+        return all_lanes()
+    known = (DEFAULT_LANE, *PLATFORM_LANES)
+    unknown = [n for n in selected if n not in known]
+    if unknown:
+        raise ValueError(f"Unknown download queue(s): {', '.join(unknown)} (expected any of {', '.join(known)})")
+    return [_lane(name) for name in known if name in selected]
+
+
+def _lane(name: str) -> QueueLane:
+    settings = get_settings()
+    return QueueLane(
+        name=name,
+        queue=DEFAULT_QUEUE if name == DEFAULT_LANE else f"{DEFAULT_QUEUE}.{name}",
+        concurrency=max(1, int(settings.DOWNLOAD_QUEUE_CONCURRENCY.get(name, settings.MAX_CONCURRENT_DOWNLOADS))),
+        prefetch_multiplier=max(1, int(settings.DOWNLOAD_QUEUE_PREFETCH.get(name, 1))),
+    )
+
+
+class QueueDepthProbe:
+    """
+    Messages waiting in each download queue on the Redis broker (LLEN summed over
+    the queue's priority lists; messages already prefetched by a worker are not counted).
+    Redis errors -> None depths (LazyRedis backoff).
+    """
+
+    def __init__(self, broker_url: Optional[str]) -> None:
+        self.broker_url = broker_url if broker_url and broker_url.startswith(("redis://", "rediss://")) else None
+        self._redis = LazyRedis(self.broker_url, self.__class__.__name__)
+
+    def depths(self, queues: Iterable[str]) -> Dict[str, Optional[int]]:
+        queues = list(queues)
+        client = self._redis.get()
+        if client is None:
+            return {q: None for q in queues}
+        try:
+            pipe = client.pipeline(transaction=False)
+            for q in queues:
+                for pri in PRIORITY_STEPS:
+                    pipe.llen(f"{q}{PRIORITY_SEP}{pri}" if pri else q)
+            lengths = pipe.execute()
+            steps = len(PRIORITY_STEPS)
+            return {q: sum(int(n) for n in lengths[i * steps:(i + 1) * steps]) for i, q in enumerate(queues)}
+        except Exception:
+            self._redis.failed("LLEN", "depths unknown")
+            return {q: None for q in queues}
+
+
+@lru_cache(maxsize=1)
+def get_queue_depth_probe() -> QueueDepthProbe:
+    # Same broker as worker/celery_app.py
+    return QueueDepthProbe(get_settings().REDIS_URL)
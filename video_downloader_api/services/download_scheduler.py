@@ -0,0 +1,212 @@
+# video_downloader_api/services/download_scheduler.py
+
+from __future__ import annotations
+
+import math
+import threading
+import time
+from datetime import datetime, timedelta, timezone
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from video_downloader_api.core.config import get_settings
+from video_downloader_api.core.logger import get_logger
+from video_downloader_api.repositories.job_repo import JobRepository
+from video_downloader_api.schemas.video import VideoInfoOut
+from video_downloader_api.services.download_queues import queue_for_platform
+from video_downloader_api.services.fair_queue import FairDispatcher, get_fair_dispatcher
+
+_MB = 1024 * 1024
+
+# Shortest-job-first buckets, smallest first: (name, max est. bytes, max duration sec, priority).
+# Celery priorities on Redis: 0 is served first (see broker_transport_options in celery_app);
+# 0-1 are only reached through aging, so a starved large job overtakes new small ones.
+SIZE_BUCKETS: Tuple[Tuple[str, Optional[int], Optional[int], int], ...] = (
+    ("xs", 25 * _MB, 60, 2),
+    ("s", 150 * _MB, 600, 4),
+    ("m", 750 * _MB, 1800, 6),
+    ("l", None, None, 8),
+)
+UNKNOWN_BUCKET = "unknown"
+UNKNOWN_PRIORITY = 5
+BUCKET_NAMES = tuple(b[0] for b in SIZE_BUCKETS) + (UNKNOWN_BUCKET,)
+
+_PRIORITY_BY_BUCKET = {name: priority for name, _, _, priority in SIZE_BUCKETS}
+
+
+class JobSize(NamedTuple):
+    duration_sec: Optional[int]
+    est_bytes: Optional[int]
+    bucket: str
+    priority: int
+
+
+def _format_filesize(info: VideoInfoOut, format_id: Optional[str]) -> Optional[int]:
+    """Estimated bytes of the requested format ("best" -> largest known format)."""
+    fid = (format_id or "best").strip().lower()
+    sizes = [f.filesize_bytes for f in info.formats if f.filesize_bytes]
+    if fid == "best":
+        return max(sizes) if sizes else None
+    if fid.endswith("p") and fid[:-1].isdigit():
+        fid = fid[:-1]
+    for fmt in info.formats:
+        if fmt.format_id == fid and fmt.filesize_bytes:
+            return fmt.filesize_bytes
+    return None
+
+
+def size_bucket(duration_sec: Optional[int], est_bytes: Optional[int]) -> str:
+    """Bucket by estimated bytes (download time), else duration, else "unknown"."""
+    for name, max_bytes, max_duration, _ in SIZE_BUCKETS:
+        if est_bytes is not None:
+            if max_bytes is None or est_bytes <= max_bytes:
+                return name
+        elif duration_sec is not None:
+            if max_duration is None or duration_sec <= max_duration:
+                return name
+        else:
+            return UNKNOWN_BUCKET
+    return UNKNOWN_BUCKET
+
+
+def base_priority(bucket: Optional[str]) -> int:
+    return _PRIORITY_BY_BUCKET.get(bucket or UNKNOWN_BUCKET, UNKNOWN_PRIORITY)
+
+
+def aged_priority(bucket: Optional[str], waited_sec: float, aging_sec: float) -> int:
+    """Bucket priority moved up one step per aging_sec spent queued (never below 0)."""
+    steps = int(waited_sec // aging_sec) if aging_sec > 0 else 0
+    return max(0, base_priority(bucket) - max(0, steps))
+
+
+def estimate_job_size(info: Optional[VideoInfoOut], format_id: Optional[str]) -> JobSize:
+    """
+    Size class of a download from its /info metadata (MetadataCache entry).
+    No metadata (URL never passed through /info, cache expired) -> "unknown".
+    """
+    duration = info.duration_sec if info is not None else None
+    est_bytes = _format_filesize(info, format_id) if info is not None else None
+    bucket = size_bucket(duration, est_bytes)
+    return JobSize(duration_sec=duration, est_bytes=est_bytes, bucket=bucket, priority=base_priority(bucket))
+
+
+def _p95(values: List[float]) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(math.ceil(0.95 * len(ordered))) - 1)]
+
+
+def wait_stats(waits: Iterable[Tuple[Optional[str], float]]) -> Dict[str, Dict[str, float]]:
+    """{bucket: {jobs, mean_wait_sec, p95_wait_sec}} from (bucket, queue wait seconds) pairs."""
+    by_bucket: Dict[str, List[float]] = {}
+    for bucket, waited in waits:
+        by_bucket.setdefault(bucket or UNKNOWN_BUCKET, []).append(max(0.0, waited))
+    return {
+        bucket: {
+            "jobs": len(values),
+            "mean_wait_sec": round(sum(values) / len(values), 3),
+            "p95_wait_sec": round(_p95(values), 3),
+        }
+        for bucket in BUCKET_NAMES
+        if (values := by_bucket.get(bucket))
+    }
+
+
+def _aware(dt: datetime) -> datetime:
+    # SQLite returns naive datetimes (stored as UTC)
+    return dt if dt.tzinfo is not None else dt.replace(tzinfo=timezone.utc)
+
+
+def queue_wait_stats(repo: JobRepository, window_sec: float) -> Dict[str, Dict[str, float]]:
+    """Mean/p95 queue wait (created -> picked up by a worker) per bucket over the last window_sec."""
+    since = datetime.now(timezone.utc) - timedelta(seconds=window_sec)
+    rows = repo.list_started(since)
+    return wait_stats(
+        (bucket, (_aware(started) - _aware(created)).total_seconds()) for bucket, created, started in rows
+    )
+
+
+class PriorityAger:
+    """
+    Aging for shortest-job-first: a broker message's priority is fixed once published, so
+    jobs that waited another aging_sec are re-enqueued one priority step higher.
+
+    The DB row is the lock: promote() only succeeds for one process per step, and
+    the copy that runs first claims the job (JobRepository.claim_job); the other copy
+    finds it no longer queued and is skipped. Runs in every worker's main process.
+    Jobs still waiting in a tenant's fair-queue backlog are re-scored there instead
+    (they have no broker message yet).
+    """
+
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        aging_sec: float,
+        interval_sec: Optional[float] = None,
+        dispatcher: Optional[FairDispatcher] = None,
+    ) -> None:
+        self.session_factory = session_factory
+        self.dispatcher = dispatcher
+        self.aging_sec = max(1.0, float(aging_sec))
+        self.interval_sec = interval_sec if interval_sec is not None else max(5.0, self.aging_sec / 4)
+        self.logger = get_logger(self.__class__.__name__)
+        self.promoted = 0
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+
+    def run_once(self, now: Optional[datetime] = None) -> int:
+        """Promote every due queued job by its aged priority; returns how many were re-enqueued."""
+        now = now or datetime.now(timezone.utc)
+        promoted = 0
+        db = self.session_factory()
+        try:
+            repo = JobRepository(db)
+            for job in repo.list_agable(now - timedelta(seconds=self.aging_sec)):
+                waited = (now - _aware(job.created_at)).total_seconds()
+                target = aged_priority(job.size_bucket, waited, self.aging_sec)
+                if job.priority is None or target >= job.priority:
+                    continue
+                if not repo.promote(job.id, job.priority, target):
+                    continue
+                queue = queue_for_platform(job.platform)
+                if self.dispatcher is None or not self.dispatcher.reprioritize(queue, job.tenant, job.id, target):
+                    self._enqueue(job.id, queue, target)
+                promoted += 1
+        finally:
+            db.close()
+        self.promoted += promoted
+        return promoted
+
+    def _enqueue(self, job_id: str, queue: str, priority: int) -> None:
+        from video_downloader_api.worker.tasks import run_download  # local import avoids import cycles
+
+        run_download.apply_async(args=[job_id], task_id=job_id, queue=queue, priority=priority)
+
+    def _loop(self) -> None:
+        while not self._stop.wait(self.interval_sec):
+            try:
+                promoted = self.run_once()
+                if promoted:
+                    self.logger.info("Re-enqueued %d aged job(s) at a higher priority.", promoted)
+            except Exception:
+                self.logger.exception("Priority aging pass failed.")
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._loop, name="priority-ager", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+
+@lru_cache(maxsize=1)
+def get_priority_ager() -> PriorityAger:
+    from video_downloader_api.db.session import SessionLocal
+
+    return PriorityAger(
+        SessionLocal,
+        aging_sec=get_settings().DOWNLOAD_SJF_AGING_SEC,
+        dispatcher=get_fair_dispatcher(),
+    )
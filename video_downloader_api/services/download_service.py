@@ -2,17 +2,84 @@
 
 from __future__ import annotations
 
-from typing import Callable, Optional
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Optional, Tuple
 
-from video_downloader_api.core.config import get_settings
+from video_downloader_api.core.config import DEFAULT_TENANT, get_settings
 from video_downloader_api.core.logger import get_logger
+from video_downloader_api.db.models import DownloadJob
+from video_downloader_api.enums import TERMINAL_STATUSES
 from video_downloader_api.repositories.job_repo import JobRepository
-from video_downloader_api.schemas.download import DownloadStartResponse
-from video_downloader_api.schemas.status import JobStatusOut, ProgressOut
-from video_downloader_api.services.metadata_service import MetadataService
+from video_downloader_api.schemas.download import (
+    DownloadBatchStartResponse,
+    DownloadStartRequest,
+    DownloadStartResponse,
+)
+from video_downloader_api.schemas.status import BatchStatusOut, JobStatusOut, ProgressOut
+from video_downloader_api.schemas.video import VideoInfoOut
+from video_downloader_api.services.download_queues import queue_for_platform
+from video_downloader_api.services.download_scheduler import JobSize, estimate_job_size
+from video_downloader_api.services.events_service import get_events_service
+from video_downloader_api.services.fair_queue import FairDispatcher
+from video_downloader_api.services.info_handoff import InfoHandoffStore
 from video_downloader_api.services.platform_detector import PlatformDetector
+from video_downloader_api.services.progress_board import BoardEntry, ProgressBoard
 from video_downloader_api.services.storage_service import StorageService
 
+if TYPE_CHECKING:
+    # Type-only: status routes build DownloadService without the metadata/downloader stack
+    from video_downloader_api.services.metadata_service import MetadataService
+
+# Board-backed status reads: last DB status per running job (platform, url, format,
+# created_at... do not change) so polling only reads the board; bounded, per process.
+# Each template carries when its DB status was last confirmed (time.monotonic()).
+_STATUS_TEMPLATES_MAX = 4096
+_status_templates: "OrderedDict[str, Tuple[JobStatusOut, float]]" = OrderedDict()
+_status_templates_lock = threading.Lock()
+
+
+def _template_get(job_id: str) -> Optional[Tuple[JobStatusOut, float]]:
+    with _status_templates_lock:
+        out = _status_templates.get(job_id)
+        if out is not None:
+            _status_templates.move_to_end(job_id)
+        return out
+
+
+def _template_drop(job_id: str) -> None:
+    with _status_templates_lock:
+        _status_templates.pop(job_id, None)
+
+
+def _template_put(job_id: str, out: JobStatusOut) -> None:
+    with _status_templates_lock:
+        _status_templates[job_id] = (out, time.monotonic())
+        _status_templates.move_to_end(job_id)
+        while len(_status_templates) > _STATUS_TEMPLATES_MAX:
+            _status_templates.popitem(last=False)
+
+
+def _quality_from_format_id(format_id: Optional[str]) -> Optional[str]:
+    """Quality label stored on the job: "best", "720" -> "720p", "720p" -> "720p", else None."""
+    s = (format_id or "").strip()
+    if s.lower() == "best":
+        return "best"
+    if s.isdigit():
+        return f"{s}p"
+    if s and s[-1].lower() == "p" and s[:-1].isdigit():
+        return s  # e.g. "720p"
+    return None
+
+
+def _content_key(detector: PlatformDetector, normalized_url: str) -> Optional[str]:
+    """"platform:content_id" stored on the job, None if the URL carries no content id."""
+    key = detector.content_key(normalized_url)
+    return f"{key[0]}:{key[1]}" if key is not None else None
+
 
 class DownloadService:
     """
@@ -25,14 +92,20 @@ class DownloadService:
     def __init__(
         self,
         detector: PlatformDetector,
-        metadata: MetadataService,
+        metadata: Optional[MetadataService],
         storage: StorageService,
         repo_factory: Callable[[], JobRepository],
+        info_store: Optional[InfoHandoffStore] = None,
+        board: Optional[ProgressBoard] = None,
+        dispatcher: Optional[FairDispatcher] = None,
     ) -> None:
         self.detector = detector
         self.metadata = metadata
         self.storage = storage
         self.repo_factory = repo_factory
+        self.info_store = info_store
+        self.board = board
+        self.dispatcher = dispatcher
         self.settings = get_settings()
         self.logger = get_logger(self.__class__.__name__)
 
@@ -41,9 +114,14 @@ class DownloadService:
         url: str,
         format_id: str,
         filename_hint: Optional[str] = None,
+        tenant: str = DEFAULT_TENANT,
     ) -> DownloadStartResponse:
         """
-        Creates DB job (queued) and enqueues Celery task.
+        Creates DB job (queued) and enqueues Celery task (through the tenant's
+        fair-share backlog when a FairDispatcher is set).
+        The job records the canonical content key (see PlatformDetector.content_key).
+        If /info already extracted this content, the job references the stored result
+        (info_ref) so the worker does not extract again.
 
         Returns:
             DownloadStartResponse containing job_id and helpful URLs for Flutter.
@@ -53,34 +131,208 @@ class DownloadService:
         if not self.detector.is_allowed_domain(normalized, self.settings.ALLOWED_DOMAINS):
             raise ValueError("Domain is not allowed.")
         platform = self.detector.detect_platform(normalized)
+        key = self.detector.cache_key(normalized)
+        info_ref = self.info_store.ref_for(key) if self.info_store is not None else None
 
-        quality = None
-        s = (format_id or "").strip()
-        if s.lower() == "best":
-            quality = "best"
-        elif s.isdigit():
-            quality = f"{s}p"
-        elif s and s[-1].lower() == "p" and s[:-1].isdigit():
-            quality = s  # e.g. "720p"
+        size = estimate_job_size(self._cached_infos([key])[0], format_id)
 
         repo = self.repo_factory()
         job = repo.create_job(
             source_url=normalized,
             platform=platform,
             format_id=format_id,
-            quality=quality,
+            quality=_quality_from_format_id(format_id),
             title=filename_hint.strip() if filename_hint and filename_hint.strip() else None,
+            content_key=_content_key(self.detector, normalized),
+            info_ref=info_ref,
+            duration_sec=size.duration_sec,
+            est_bytes=size.est_bytes,
+            size_bucket=size.bucket,
+            priority=self._priority(size),
+            tenant=tenant,
         )
 
-        # Enqueue Celery task
+        # Enqueue Celery task (fair-share backlog, else directly)
         try:
+            if self._submit_fair(tenant, [job]):
+                return self._start_response(job)
+
             from video_downloader_api.worker.tasks import run_download  # local import avoids import cycles at startup
 
-            run_download.delay(job.id)
+            # task_id = job id so DELETE /download/{job_id} can revoke it while queued
+            run_download.apply_async(
+                args=[job.id],
+                task_id=job.id,
+                queue=queue_for_platform(job.platform),
+                priority=job.priority,
+            )
         except Exception:
             self.logger.exception("Failed to enqueue Celery task for job_id=%s", job.id)
             # We still return job_id; status will stay queued and user can retry later.
 
+        return self._start_response(job)
+
+    def create_batch(
+        self,
+        items: List[DownloadStartRequest],
+        tenant: str = DEFAULT_TENANT,
+    ) -> DownloadBatchStartResponse:
+        """
+        Creates all jobs of a batch in one DB transaction and enqueues them as one
+        Celery group (group id = batch_id), or into the tenant's fair-share backlog
+        (released to Celery in turn with other tenants' jobs).
+
+        The whole batch is rejected if any URL is not allowed.
+        """
+        rows: List[Dict[str, Any]] = []
+        for idx, item in enumerate(items):
+            normalized = self.detector.normalize_url(item.url)
+            if not self.detector.is_allowed_domain(normalized, self.settings.ALLOWED_DOMAINS):
+                raise ValueError(f"Domain is not allowed (items[{idx}]).")
+            hint = item.filename_hint
+            rows.append(
+                {
+                    "source_url": normalized,
+                    "platform": self.detector.detect_platform(normalized),
+                    "format_id": item.format_id,
+                    "quality": _quality_from_format_id(item.format_id),
+                    "title": hint.strip() if hint and hint.strip() else None,
+                    "content_key": _content_key(self.detector, normalized),
+                }
+            )
+
+        keys = [self.detector.cache_key(row["source_url"]) for row in rows]
+        for row, info in zip(rows, self._cached_infos(keys)):
+            size = estimate_job_size(info, row["format_id"])
+            row.update(
+                duration_sec=size.duration_sec,
+                est_bytes=size.est_bytes,
+                size_bucket=size.bucket,
+                priority=self._priority(size),
+                tenant=tenant,
+            )
+
+        if self.info_store is not None:
+            refs = self.info_store.refs_for(keys)
+            for row, ref in zip(rows, refs):
+                row["info_ref"] = ref
+
+        batch_id = str(uuid.uuid4())
+        repo = self.repo_factory()
+        jobs = repo.create_jobs(rows, batch_id=batch_id)
+
+        # Enqueue all jobs in one go (fair-share backlog, else one Celery group)
+        try:
+            if self._submit_fair(tenant, jobs):
+                return self._batch_response(batch_id, jobs)
+
+            from celery import group
+
+            from video_downloader_api.worker.tasks import run_download  # local import avoids import cycles at startup
+
+            group(
+                run_download.si(job.id).set(
+                    task_id=job.id,
+                    queue=queue_for_platform(job.platform),
+                    priority=job.priority,
+                )
+                for job in jobs
+            ).apply_async(task_id=batch_id)
+        except Exception:
+            self.logger.exception("Failed to enqueue Celery group for batch_id=%s", batch_id)
+            # Jobs stay queued; user can retry later (same as single /start).
+
+        return self._batch_response(batch_id, jobs)
+
+    def _batch_response(self, batch_id: str, jobs: List[DownloadJob]) -> DownloadBatchStartResponse:
+        return DownloadBatchStartResponse(
+            batch_id=batch_id,
+            status_url=f"{self.settings.API_V1_PREFIX}/download/batch/{batch_id}",
+            jobs=[self._start_response(job) for job in jobs],
+        )
+
+    def _submit_fair(self, tenant: str, jobs: List[DownloadJob]) -> bool:
+        """
+        Hand jobs to the fair-share dispatcher and release what the lanes can take now.
+        False without a dispatcher or when Redis is unavailable: enqueue directly.
+        """
+        if self.dispatcher is None or not self.dispatcher.submit(tenant, jobs):
+            return False
+        self.dispatcher.dispatch({queue_for_platform(job.platform) for job in jobs})
+        return True
+
+    def cancel_job(self, job_id: str) -> JobStatusOut:
+        """
+        Cancel a queued/downloading job (idempotent; finished/failed jobs are left as is).
+
+        - DB: status "canceled" + canceled_at (what running workers poll for)
+        - Celery: revoke the task (task_id = job id) so a queued one never starts
+        - event: final "canceled" event for SSE/WebSocket subscribers
+        The worker aborts a running download from its progress hook and removes the
+        partial files (see CancellationToken).
+        """
+        repo = self.repo_factory()
+        if repo.get_job(job_id) is None:
+            raise ValueError("Job not found.")
+        self._cancel(repo, [job_id])
+        return self._status_out(repo.get_job(job_id))
+
+    def cancel_batch(self, batch_id: str) -> BatchStatusOut:
+        """
+        Cancel every queued/downloading job of a batch (same as cancel_job for each).
+        """
+        repo = self.repo_factory()
+        jobs = repo.list_jobs_by_batch(batch_id)
+        if not jobs:
+            raise ValueError("Batch not found.")
+        self._cancel(repo, [job.id for job in jobs])
+        return self.get_batch_status(batch_id)
+
+    def _cancel(self, repo: JobRepository, job_ids: List[str]) -> List[str]:
+        canceled = repo.cancel_jobs(job_ids, active_statuses=("queued", "downloading"))
+        if not canceled:
+            return []
+
+        # Fair-share backlogs/slots of the canceled jobs (plain tuples: the session stays on this thread)
+        fair = (
+            [(job.id, job.platform, job.tenant) for job in repo.list_jobs(canceled)]
+            if self.dispatcher is not None
+            else []
+        )
+
+        # Revoke off the request path: it only spares queued tasks a DB read (workers
+        # skip canceled jobs anyway) and blocks while the broker is unreachable
+        threading.Thread(target=self._revoke, args=(canceled, fair), name="celery-revoke", daemon=True).start()
+
+        events = get_events_service()
+        for job_id in canceled:
+            # Board slot says "downloading" until the worker notices: read the DB here
+            # (other API processes re-check the DB status, see get_status)
+            _template_drop(job_id)
+            events.publish(job_id, {"job_id": job_id, "status": "canceled", "error": "Canceled by user."})
+        return canceled
+
+    def _revoke(self, job_ids: List[str], fair: List[Tuple[str, str, Optional[str]]]) -> None:
+        if fair and self.dispatcher is not None:
+            self.dispatcher.cancel(fair)
+        try:
+            from video_downloader_api.worker.celery_app import celery_app  # local import: keeps Celery out of API boot
+
+            # No terminate: running tasks stop cooperatively and clean up after themselves
+            celery_app.control.revoke(job_ids)
+        except Exception:
+            self.logger.exception("Failed to revoke Celery tasks for job_ids=%s", job_ids)
+
+    def _cached_infos(self, keys: List[str]) -> List[Optional[VideoInfoOut]]:
+        """/info metadata cache entries for sizing jobs (one bulk peek, no extraction, no hit/miss stats)."""
+        cache = self.metadata.cache if self.metadata is not None else None
+        return cache.peek_many(keys) if cache is not None else [None] * len(keys)
+
+    def _priority(self, size: JobSize) -> Optional[int]:
+        # None: FIFO (Celery default priority); bucket/estimate are still stored for wait stats
+        return size.priority if self.settings.DOWNLOAD_SJF_ENABLED else None
+
+    def _start_response(self, job: DownloadJob) -> DownloadStartResponse:
         status_url = f"{self.settings.API_V1_PREFIX}/download/status/{job.id}"
         stream_url = f"{self.settings.API_V1_PREFIX}/download/stream/{job.id}"
         file_url = f"{self.settings.API_V1_PREFIX}/files/{job.id}"
@@ -96,12 +348,103 @@ class DownloadService:
     def get_status(self, job_id: str) -> JobStatusOut:
         """
         Reads status from DB and returns schema for Flutter.
+
+        With a ProgressBoard, a running job's status/progress come from its board slot
+        (no DB query once the job's static fields are known); jobs without a slot,
+        and finished/failed ones (file URL, error), are read from the DB.
+        A job canceled through another API process keeps a "downloading" slot until
+        its worker notices, so the DB status is re-checked (status column only) at most
+        every CANCEL_CHECK_INTERVAL_MS.
         """
+        entry = self.board.read(job_id) if self.board is not None else None
+        if entry is not None and entry.status in TERMINAL_STATUSES:
+            entry = None
+        if entry is not None:
+            cached = _template_get(job_id)
+            if cached is not None:
+                template, confirmed_at = cached
+                if time.monotonic() - confirmed_at < self.settings.CANCEL_CHECK_INTERVAL_MS / 1000.0:
+                    return self._status_from_board(template, entry)
+                state = self.repo_factory().get_cancel_state(job_id)
+                if state is not None and state[0] not in TERMINAL_STATUSES:
+                    _template_put(job_id, template)
+                    return self._status_from_board(template, entry)
+                _template_drop(job_id)
+
         repo = self.repo_factory()
         job = repo.get_job(job_id)
         if not job:
             raise ValueError("Job not found.")
+        out = self._status_out(job)
+        if entry is not None and job.status not in TERMINAL_STATUSES:
+            _template_put(job_id, out)
+            return self._status_from_board(out, entry)
+        return out
+
+    def get_statuses(self, job_ids: List[str]) -> Dict[str, JobStatusOut]:
+        """
+        Status of many jobs in one DB query (job_id -> status; unknown ids are missing).
+        """
+        repo = self.repo_factory()
+        return {job.id: self._status_out(job) for job in repo.list_jobs(job_ids)}
+
+    def get_batch_status(self, batch_id: str) -> BatchStatusOut:
+        """
+        Aggregates status/progress over all jobs of a batch.
+        """
+        repo = self.repo_factory()
+        jobs = repo.list_jobs_by_batch(batch_id)
+        if not jobs:
+            raise ValueError("Batch not found.")
+
+        counts: Dict[str, int] = {}
+        downloaded = 0
+        sizes_known = True
+        total = 0
+        for job in jobs:
+            counts[job.status] = counts.get(job.status, 0) + 1
+            downloaded += job.downloaded_bytes or 0
+            if job.total_bytes and job.total_bytes > 0:
+                total += job.total_bytes
+            else:
+                sizes_known = False
+
+        terminal = sum(counts.get(s, 0) for s in TERMINAL_STATUSES)
+        if sizes_known and total > 0:
+            percent = round(min(downloaded, total) / total * 100.0, 2)
+        else:
+            percent = round(terminal / len(jobs) * 100.0, 2)
+
+        return BatchStatusOut(
+            batch_id=batch_id,
+            total_jobs=len(jobs),
+            counts=counts,
+            done=terminal == len(jobs),
+            downloaded_bytes=downloaded,
+            total_bytes=total if sizes_known else None,
+            percent=percent,
+            jobs=[self._status_out(job) for job in jobs],
+        )
+
+    def _status_from_board(self, template: JobStatusOut, entry: BoardEntry) -> JobStatusOut:
+        progress: Optional[ProgressOut] = None
+        if entry.downloaded_bytes or entry.total_bytes or entry.speed_bps or entry.eta_sec:
+            progress = ProgressOut(
+                downloaded_bytes=entry.downloaded_bytes,
+                total_bytes=entry.total_bytes,
+                speed_bps=entry.speed_bps,
+                eta_sec=entry.eta_sec,
+                percent=entry.percent,
+            )
+        return template.model_copy(
+            update={
+                "status": entry.status,
+                "progress": progress,
+                "updated_at": datetime.fromtimestamp(entry.updated_at, timezone.utc),
+            }
+        )
 
+    def _status_out(self, job: DownloadJob) -> JobStatusOut:
         progress: Optional[ProgressOut] = None
         percent: Optional[float] = None
         if job.total_bytes and job.total_bytes > 0:
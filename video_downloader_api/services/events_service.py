@@ -4,8 +4,29 @@ from __future__ import annotations
 
 import json
 import queue
+import select
 import threading
-from typing import Dict, Iterator, Optional
+import time
+from functools import lru_cache
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterator, List, Optional
+
+from video_downloader_api.core.config import get_settings
+from video_downloader_api.core.logger import get_logger
+from video_downloader_api.enums import TERMINAL_STATUSES
+from video_downloader_api.services.redis_client import REDIS_RETRY_AFTER_SEC, LazyRedis
+
+if TYPE_CHECKING:
+    from video_downloader_api.services.progress_board import ProgressBoard
+
+# Subscriber callback: called with each payload published for its job_id.
+# Must not block (it runs on the publisher's / listener's thread).
+EventCallback = Callable[[dict], None]
+
+# After a pg_notify error, skip notifying for this many seconds (as LazyRedis does for Redis)
+_PG_RETRY_AFTER_SEC = REDIS_RETRY_AFTER_SEC
+
+# PostgreSQL rejects NOTIFY payloads of 8000 bytes or more
+_PG_NOTIFY_MAX_BYTES = 7900
 
 
 class EventsService:
@@ -14,31 +35,58 @@ class EventsService:
 
     - publish(job_id, payload): sends payload to all subscribers of job_id
     - subscribe(job_id): yields payload dicts as events arrive
+    - add_subscriber/remove_subscriber(job_id, callback): low-level hook used by
+      subscribe() and by async consumers
 
     Note:
-    This in-memory approach works for a single API instance.
-    For multiple instances / production, replace with Redis pubsub and keep the same interface.
+    This in-memory approach works for a single process (API and worker together).
+    Use RedisEventsService (EVENTS_BACKEND=redis) or PostgresEventsService
+    (EVENTS_BACKEND=postgres) when the worker runs separately.
     """
 
     def __init__(self) -> None:
         self._lock = threading.Lock()
-        self._subscribers: Dict[str, list[queue.Queue]] = {}
+        self._subscribers: Dict[str, List[EventCallback]] = {}
+        self.logger = get_logger(self.__class__.__name__)
 
     def publish(self, job_id: str, payload: dict) -> None:
         """
         Publish an event to all subscribers of the given job_id.
         """
+        self._deliver(job_id, payload)
+
+    def _deliver(self, job_id: str, payload: dict) -> None:
+        """Fan a payload out to this process' subscribers of job_id."""
         with self._lock:
-            queues = list(self._subscribers.get(job_id, []))
+            callbacks = list(self._subscribers.get(job_id, ()))
 
-        # Push outside lock
-        for q in queues:
+        # Call outside lock
+        for cb in callbacks:
             try:
-                q.put_nowait(payload)
+                cb(payload)
             except Exception:
                 # Ignore slow/broken subscribers
                 pass
 
+    def add_subscriber(self, job_id: str, callback: EventCallback) -> None:
+        with self._lock:
+            self._subscribers.setdefault(job_id, []).append(callback)
+
+    def remove_subscriber(self, job_id: str, callback: EventCallback) -> None:
+        with self._lock:
+            callbacks = self._subscribers.get(job_id)
+            if callbacks and callback in callbacks:
+                callbacks.remove(callback)
+            if job_id in self._subscribers and not self._subscribers[job_id]:
+                del self._subscribers[job_id]
+
+    def close(self) -> None:
+        """Release background resources (nothing for the in-memory bus)."""
+
+    def subscriber_count(self) -> int:
+        with self._lock:
+            return sum(len(v) for v in self._subscribers.values())
+
     def subscribe(self, job_id: str) -> Iterator[dict]:
         """
         Subscribe to events for a job_id and yield them as they arrive.
@@ -49,17 +97,357 @@ class EventsService:
         """
         q: queue.Queue = queue.Queue(maxsize=200)
 
-        with self._lock:
-            self._subscribers.setdefault(job_id, []).append(q)
+        def _put(payload: dict) -> None:
+            try:
+                q.put_nowait(payload)
+            except queue.Full:
+                pass
 
+        self.add_subscriber(job_id, _put)
         try:
             while True:
                 payload = q.get()  # blocks until an event arrives
                 yield payload
         finally:
             # Cleanup subscriber on disconnect
+            self.remove_subscriber(job_id, _put)
+
+
+class _ListenerEventsService(EventsService):
+    """
+    Base for cross-process backends: subscribers stay local (same as EventsService);
+    the first one starts a single listener thread per process that receives every
+    job's events from the broker and fans them out with _deliver().
+    """
+
+    _listener_name = "events-listener"
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._listener: Optional[threading.Thread] = None
+        self._listener_lock = threading.Lock()
+        self._stop = threading.Event()
+
+    def add_subscriber(self, job_id: str, callback: EventCallback) -> None:
+        super().add_subscriber(job_id, callback)
+        self._ensure_listener()
+
+    def _ensure_listener(self) -> None:
+        with self._listener_lock:
+            if self._listener is not None and self._listener.is_alive():
+                return
+            self._stop.clear()
+            self._listener = threading.Thread(target=self._listen, name=self._listener_name, daemon=True)
+            self._listener.start()
+
+    def close(self) -> None:
+        """Stop the listener thread."""
+        self._stop.set()
+
+    def _listen(self) -> None:
+        raise NotImplementedError
+
+
+class RedisEventsService(_ListenerEventsService):
+    """
+    Cross-process EventsService over Redis Pub/Sub (same publish/subscribe interface).
+
+    - publish(): PUBLISH on "<channel_prefix><job_id>" (Celery worker -> API processes)
+    - subscribers are local (same as EventsService); the first one starts a single
+      listener thread per process holding ONE pattern subscription ("<prefix>*")
+      that fans incoming events out to local subscribers. No per-client Redis connection.
+    - the listener reconnects with backoff; publish errors are logged and skipped
+      (progress is still in the DB for /download/status)
+    """
+
+    _listener_name = "events-redis-listener"
+
+    def __init__(self, redis_url: str, channel_prefix: str = "vda:events:") -> None:
+        super().__init__()
+        self.redis_url = redis_url
+        self.channel_prefix = channel_prefix
+
+        self._redis = LazyRedis(redis_url, self.__class__.__name__)
+
+    def publish(self, job_id: str, payload: dict) -> None:
+        client = self._redis.get()
+        if client is None:
+            return
+        try:
+            client.publish(f"{self.channel_prefix}{job_id}", json.dumps(payload, ensure_ascii=False, default=str))
+        except Exception:
+            self._redis.failed("publish", "events disabled")
+
+    def _listen(self) -> None:
+        import redis  # local import: optional at runtime
+
+        pattern = f"{self.channel_prefix}*"
+        prefix_len = len(self.channel_prefix)
+        backoff = 0.5
+        while not self._stop.is_set():
+            pubsub = None
+            try:
+                client = redis.Redis.from_url(self.redis_url, socket_connect_timeout=2.0, health_check_interval=30)
+                pubsub = client.pubsub(ignore_subscribe_messages=True)
+                pubsub.psubscribe(pattern)
+                self.logger.info("RedisEventsService: listening on %s", pattern)
+                backoff = 0.5
+                while not self._stop.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if not message or message.get("type") != "pmessage":
+                        continue
+                    channel = message["channel"]
+                    if isinstance(channel, bytes):
+                        channel = channel.decode("utf-8", "replace")
+                    try:
+                        payload = json.loads(message["data"])
+                    except Exception:
+                        continue
+                    self._deliver(channel[prefix_len:], payload)
+            except Exception:
+                self.logger.warning("RedisEventsService: listener error; reconnecting in %.1fs.", backoff)
+                self._stop.wait(backoff)
+                backoff = min(backoff * 2, 10.0)
+            finally:
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+
+
+def _wait_notifies(dbapi: Any, timeout: float) -> List[str]:
+    """
+    Payloads of NOTIFYs received on a LISTEN connection, waiting up to timeout.
+    Works with psycopg (3) and psycopg2 DBAPI connections.
+    """
+    if callable(getattr(dbapi, "notifies", None)):
+        # psycopg 3: generator; stop at the first one so delivery is not delayed to timeout
+        return [n.payload for n in dbapi.notifies(timeout=timeout, stop_after=1)]
+
+    # psycopg2: wait for the socket, then collect the parsed notifications
+    if select.select([dbapi], [], [], timeout) == ([], [], []):
+        return []
+    dbapi.poll()
+    payloads = [n.payload for n in dbapi.notifies]
+    del dbapi.notifies[:]
+    return payloads
+
+
+def _payload_from_db(job_id: str) -> Optional[dict]:
+    """Event rebuilt from the job row (same shapes as the ones the worker publishes)."""
+    from video_downloader_api.db.session import SessionLocal
+    from video_downloader_api.repositories.job_repo import JobRepository
+
+    db = SessionLocal()
+    try:
+        job = JobRepository(db).get_job(job_id)
+    finally:
+        db.close()
+    if job is None:
+        return None
+
+    payload: Dict[str, Any] = {"job_id": job.id, "status": job.status}
+    if job.status in TERMINAL_STATUSES:
+        payload["public_url"] = job.public_url
+        payload["error"] = job.error
+        return payload
+
+    percent = None
+    if job.total_bytes and job.total_bytes > 0:
+        percent = round((job.downloaded_bytes / job.total_bytes) * 100.0, 2)
+    payload["progress"] = {
+        "downloaded_bytes": job.downloaded_bytes or 0,
+        "total_bytes": job.total_bytes,
+        "speed_bps": job.speed_bps,
+        "eta_sec": job.eta_sec,
+        "percent": percent,
+    }
+    return payload
+
+
+class PostgresEventsService(_ListenerEventsService):
+    """
+    Cross-process EventsService over PostgreSQL LISTEN/NOTIFY, for deployments
+    that run PostgreSQL but no Redis (same publish/subscribe interface).
+
+    - publish(): SELECT pg_notify(channel, ...) on the app's engine (Celery worker -> API)
+    - ONE dedicated LISTEN connection per process (outside the pool, autocommit),
+      fanning events out to local subscribers; reconnects with backoff
+    - NOTIFY payloads must stay under 8000 bytes: an event that does not fit (e.g. a
+      long error message) is sent as the job id only and listeners rebuild it from the
+      job row, which the worker commits before every publish
+    - needs DATABASE_URL on PostgreSQL with psycopg (3.2+) or psycopg2
+    """
+
+    _listener_name = "events-pg-listener"
+
+    def __init__(self, database_url: str, channel: str = "vda_events") -> None:
+        super().__init__()
+        self.database_url = database_url
+        self.channel = channel
+        self._publish_disabled_until = 0.0
+
+    @staticmethod
+    def _encode(job_id: str, payload: dict) -> str:
+        message = json.dumps({"j": job_id, "p": payload}, ensure_ascii=False, default=str, separators=(",", ":"))
+        if len(message.encode("utf-8")) < _PG_NOTIFY_MAX_BYTES:
+            return message
+        # Too large for NOTIFY: send the id, listeners read the job row
+        return json.dumps({"j": job_id}, separators=(",", ":"))
+
+    def publish(self, job_id: str, payload: dict) -> None:
+        if time.monotonic() < self._publish_disabled_until:
+            return
+        try:
+            from sqlalchemy import func, select as sql_select
+
+            from video_downloader_api.db.session import engine
+
+            with engine.begin() as conn:
+                conn.execute(sql_select(func.pg_notify(self.channel, self._encode(job_id, payload))))
+        except Exception:
+            self._publish_disabled_until = time.monotonic() + _PG_RETRY_AFTER_SEC
+            self.logger.warning(
+                "PostgresEventsService: pg_notify failed; events disabled for %ss.", int(_PG_RETRY_AFTER_SEC)
+            )
+
+    def _on_notify(self, raw: str) -> None:
+        try:
+            message = json.loads(raw)
+            job_id = str(message["j"])
+        except Exception:
+            return
+
+        payload = message.get("p")
+        if payload is None:
             with self._lock:
-                if job_id in self._subscribers and q in self._subscribers[job_id]:
-                    self._subscribers[job_id].remove(q)
-                if job_id in self._subscribers and not self._subscribers[job_id]:
-                    del self._subscribers[job_id]
+                watched = job_id in self._subscribers
+            if not watched:
+                return
+            try:
+                payload = _payload_from_db(job_id)
+            except Exception:
+                self.logger.exception("PostgresEventsService: reload failed for job_id=%s", job_id)
+                return
+            if payload is None:
+                return
+        self._deliver(job_id, payload)
+
+    def _listen(self) -> None:
+        from sqlalchemy import create_engine
+        from sqlalchemy.pool import NullPool
+
+        listen_engine = create_engine(self.database_url, poolclass=NullPool, isolation_level="AUTOCOMMIT")
+        channel_sql = '"' + self.channel.replace('"', '""') + '"'
+        backoff = 0.5
+        try:
+            while not self._stop.is_set():
+                conn = None
+                try:
+                    conn = listen_engine.connect()
+                    conn.exec_driver_sql(f"LISTEN {channel_sql}")
+                    dbapi = conn.connection.dbapi_connection
+                    self.logger.info("PostgresEventsService: listening on %s", self.channel)
+                    backoff = 0.5
+                    while not self._stop.is_set():
+                        for raw in _wait_notifies(dbapi, 1.0):
+                            self._on_notify(raw)
+                except Exception:
+                    self.logger.warning("PostgresEventsService: listener error; reconnecting in %.1fs.", backoff)
+                    self._stop.wait(backoff)
+                    backoff = min(backoff * 2, 10.0)
+                finally:
+                    if conn is not None:
+                        try:
+                            conn.close()
+                        except Exception:
+                            pass
+        finally:
+            listen_engine.dispose()
+
+
+class BoardEventsService(_ListenerEventsService):
+    """
+    Single-host EventsService over the shared-memory ProgressBoard (no Redis/DB hop).
+
+    - publish(): local subscribers only; workers write every progress hook to the
+      board (ProgressService), which is the cross-process path
+    - one poller thread per process reads the slots of jobs that have subscribers
+      every poll_ms and delivers a progress event when a slot's seq changed
+    - a slot turning finished/failed is delivered from the job row (file URL / error;
+      the worker commits it before updating the board)
+    """
+
+    _listener_name = "events-board-poller"
+
+    def __init__(self, board: ProgressBoard, poll_ms: int = 250) -> None:
+        super().__init__()
+        self.board = board
+        self.poll_sec = max(10, int(poll_ms)) / 1000.0
+
+    def publish(self, job_id: str, payload: dict) -> None:
+        self._deliver(job_id, payload)
+
+    def _listen(self) -> None:
+        last_seq: Dict[str, int] = {}
+        while not self._stop.wait(self.poll_sec):
+            with self._lock:
+                job_ids = list(self._subscribers)
+            for job_id in job_ids:
+                entry = self.board.read(job_id)
+                if entry is None or last_seq.get(job_id) == entry.seq:
+                    continue
+                last_seq[job_id] = entry.seq
+
+                if entry.status in TERMINAL_STATUSES:
+                    try:
+                        payload = _payload_from_db(job_id)
+                    except Exception:
+                        self.logger.exception("BoardEventsService: reload failed for job_id=%s", job_id)
+                        continue
+                    if payload is None:
+                        continue
+                else:
+                    payload = {
+                        "job_id": job_id,
+                        "status": entry.status,
+                        "progress": {
+                            "downloaded_bytes": entry.downloaded_bytes,
+                            "total_bytes": entry.total_bytes,
+                            "speed_bps": entry.speed_bps,
+                            "eta_sec": entry.eta_sec,
+                            "percent": entry.percent,
+                        },
+                    }
+                self._deliver(job_id, payload)
+
+            for job_id in set(last_seq).difference(job_ids):
+                del last_seq[job_id]
+
+
+@lru_cache(maxsize=1)
+def get_events_service() -> EventsService:
+    """
+    Process-wide EventsService (shared by stream routes and the worker in one process).
+
+    EVENTS_BACKEND:
+    - "memory": in-process only (API and worker in the same process)
+    - "redis": Redis Pub/Sub on REDIS_URL (worker and API in separate processes/nodes)
+    - "postgres": LISTEN/NOTIFY on DATABASE_URL (same, without Redis)
+    - "board": polls the shared-memory ProgressBoard (API and workers on one host;
+      falls back to "memory" when the board is disabled/unavailable)
+    """
+    settings = get_settings()
+    backend = (settings.EVENTS_BACKEND or "").strip().lower()
+    if backend == "redis":
+        return RedisEventsService(redis_url=settings.REDIS_URL, channel_prefix=settings.EVENTS_REDIS_CHANNEL_PREFIX)
+    if backend in ("postgres", "postgresql"):
+        return PostgresEventsService(database_url=settings.DATABASE_URL, channel=settings.EVENTS_PG_CHANNEL)
+    if backend == "board":
+        from video_downloader_api.services.progress_board import get_progress_board
+
+        board = get_progress_board()
+        if board is not None:
+            return BoardEventsService(board=board, poll_ms=settings.PROGRESS_BOARD_POLL_MS)
+    return EventsService()
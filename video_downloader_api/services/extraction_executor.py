@@ -0,0 +1,109 @@
+# video_downloader_api/services/extraction_executor.py
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional, TypeVar
+
+from video_downloader_api.core.config import get_settings
+from video_downloader_api.core.logger import get_logger
+
+T = TypeVar("T")
+
+
+class ExtractionBusyError(RuntimeError):
+    """The extraction executor is at capacity (running + queued); retry later."""
+
+
+class ExtractionTimeoutError(TimeoutError):
+    """An extraction did not finish within its deadline."""
+
+
+class ExtractionExecutor:
+    """
+    Dedicated bounded thread pool for yt-dlp metadata extraction (/download/info,
+    /download/playlist-info), separate from Starlette's threadpool, so a burst of
+    slow extractions cannot delay cheap sync endpoints such as /download/status.
+
+    - run(fn, timeout_sec) is awaited from async routes; fn gets a threading.Event
+      that is set when the caller stops waiting (deadline hit or request cancelled)
+    - a job still queued at that point never starts; a running one is asked to stop
+      through the event (yt-dlp calls themselves cannot be interrupted, their result
+      still lands in the metadata cache)
+    - at most max_workers + max_pending jobs are admitted, beyond that ExtractionBusyError
+    """
+
+    def __init__(self, max_workers: int = 8, max_pending: int = 64) -> None:
+        self.max_workers = max(1, int(max_workers))
+        self.max_pending = max(0, int(max_pending))
+        self.logger = get_logger(self.__class__.__name__)
+
+        self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="metadata")
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self._stats: Dict[str, int] = {"submitted": 0, "rejected": 0, "timed_out": 0, "cancelled": 0}
+
+    def _done(self, _: Future) -> None:
+        with self._lock:
+            self._in_flight -= 1
+
+    async def run(self, fn: Callable[[threading.Event], T], timeout_sec: Optional[float] = None) -> T:
+        """
+        Run fn(cancel_event) on the pool and wait at most timeout_sec for it.
+
+        Raises:
+            ExtractionBusyError: pool and queue are full
+            ExtractionTimeoutError: deadline exceeded (fn is cancelled / asked to stop)
+        """
+        with self._lock:
+            if self._in_flight >= self.max_workers + self.max_pending:
+                self._stats["rejected"] += 1
+                raise ExtractionBusyError("Too many metadata extractions in progress, retry later.")
+            self._in_flight += 1
+            self._stats["submitted"] += 1
+
+        cancel = threading.Event()
+        try:
+            fut = self._executor.submit(fn, cancel)
+        except BaseException:
+            with self._lock:
+                self._in_flight -= 1
+            raise
+        fut.add_done_callback(self._done)
+
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(fut), timeout=timeout_sec)
+        except asyncio.TimeoutError:
+            cancel.set()
+            fut.cancel()
+            with self._lock:
+                self._stats["timed_out"] += 1
+            raise ExtractionTimeoutError(f"Extraction did not finish within {timeout_sec:g}s.")
+        except asyncio.CancelledError:
+            cancel.set()
+            fut.cancel()
+            with self._lock:
+                self._stats["cancelled"] += 1
+            raise
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "max_workers": self.max_workers,
+                "max_pending": self.max_pending,
+                "in_flight": self._in_flight,
+                **self._stats,
+            }
+
+
+@lru_cache(maxsize=1)
+def get_extraction_executor() -> ExtractionExecutor:
+    """Process-wide extraction executor (one per uvicorn worker)."""
+    settings = get_settings()
+    return ExtractionExecutor(
+        max_workers=settings.METADATA_EXECUTOR_WORKERS,
+        max_pending=settings.METADATA_EXECUTOR_MAX_PENDING,
+    )
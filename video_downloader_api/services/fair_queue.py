@@ -0,0 +1,553 @@
+# video_downloader_api/services/fair_queue.py
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+import uuid
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from sqlalchemy.orm import Session
+
+from video_downloader_api.core.config import get_settings
+from video_downloader_api.core.logger import get_logger
+from video_downloader_api.db.models import DownloadJob
+from video_downloader_api.enums import TERMINAL_STATUSES
+from video_downloader_api.repositories.job_repo import JobRepository
+from video_downloader_api.services.download_queues import all_lanes, queue_for_platform
+from video_downloader_api.services.redis_client import LazyRedis
+
+# Backlog score = priority * _SCORE_SCALE + created_at (unix seconds): SJF, then FIFO per tenant
+_SCORE_SCALE = 10_000_000_000
+
+# KEYS: tenants zset, backlog zset, weights hash, vclock; ARGV: tenant, weight, (job_id, score)...
+# A tenant (re)joining starts at the current virtual time: idle time earns no credit.
+_SUBMIT_LUA = """
+for i = 3, #ARGV, 2 do
+  redis.call('ZADD', KEYS[2], ARGV[i + 1], ARGV[i])
+end
+redis.call('HSET', KEYS[3], ARGV[1], ARGV[2])
+if not redis.call('ZSCORE', KEYS[1], ARGV[1]) then
+  redis.call('ZADD', KEYS[1], redis.call('GET', KEYS[4]) or 0, ARGV[1])
+end
+return 1
+"""
+
+# KEYS: tenants zset, inflight zset, weights hash, vclock
+# ARGV: now, capacity, lease_sec, backlog key prefix, max jobs
+# Weighted fair queuing (start-time virtual clock): the tenant with the lowest virtual
+# time releases its best job and advances by 1 / weight. Returns (tenant, job_id, score)...
+_RELEASE_LUA = """
+local now = tonumber(ARGV[1])
+redis.call('ZREMRANGEBYSCORE', KEYS[2], '-inf', now)
+local free = tonumber(ARGV[2]) - redis.call('ZCARD', KEYS[2])
+local budget = tonumber(ARGV[5])
+local out = {}
+while free > 0 and budget > 0 do
+  local top = redis.call('ZRANGE', KEYS[1], 0, 0, 'WITHSCORES')
+  if #top == 0 then break end
+  local tenant, vt = top[1], tonumber(top[2])
+  local backlog = ARGV[4] .. tenant
+  local item = redis.call('ZPOPMIN', backlog)
+  if #item == 0 then
+    redis.call('ZREM', KEYS[1], tenant)
+  else
+    local weight = tonumber(redis.call('HGET', KEYS[3], tenant)) or 1
+    redis.call('SET', KEYS[4], vt)
+    if redis.call('ZCARD', backlog) == 0 then
+      redis.call('ZREM', KEYS[1], tenant)
+    else
+      redis.call('ZADD', KEYS[1], vt + 1 / weight, tenant)
+    end
+    redis.call('ZADD', KEYS[2], now + tonumber(ARGV[3]), item[1])
+    table.insert(out, tenant)
+    table.insert(out, item[1])
+    table.insert(out, item[2])
+    free = free - 1
+    budget = budget - 1
+  end
+end
+return out
+"""
+
+# KEYS: backlog zset; ARGV: job_id, new priority, scale. 1 if the job is still in the backlog.
+_REPRIORITIZE_LUA = """
+local score = redis.call('ZSCORE', KEYS[1], ARGV[1])
+if not score then return 0 end
+local scale = tonumber(ARGV[3])
+redis.call('ZADD', KEYS[1], tonumber(ARGV[2]) * scale + math.fmod(tonumber(score), scale), ARGV[1])
+return 1
+"""
+
+# KEYS: holders zset ("tenant|token" -> expiry), counts hash, waiting zset, weights hash
+# ARGV: tenant, weight, token, now, hold ttl, slots, waiting ttl
+# Grant if a slot is free and the tenant holds less than its weighted share of the slots
+# among tenants that hold or wait for one; otherwise register as waiting.
+_ACQUIRE_LUA = """
+local now = tonumber(ARGV[4])
+for _, member in ipairs(redis.call('ZRANGEBYSCORE', KEYS[1], '-inf', now)) do
+  redis.call('HINCRBY', KEYS[2], string.match(member, '^(.*)|'), -1)
+  redis.call('ZREM', KEYS[1], member)
+end
+redis.call('ZREMRANGEBYSCORE', KEYS[3], '-inf', now)
+local tenant, weight, slots = ARGV[1], tonumber(ARGV[2]), tonumber(ARGV[6])
+redis.call('HSET', KEYS[4], tenant, weight)
+local active = {[tenant] = true}
+local total_weight, held = weight, 0
+local counts = redis.call('HGETALL', KEYS[2])
+for i = 1, #counts, 2 do
+  local t, c = counts[i], tonumber(counts[i + 1])
+  if c <= 0 then
+    redis.call('HDEL', KEYS[2], t)
+  elseif t == tenant then
+    held = c
+  elseif not active[t] then
+    active[t] = true
+    total_weight = total_weight + (tonumber(redis.call('HGET', KEYS[4], t)) or 1)
+  end
+end
+for _, t in ipairs(redis.call('ZRANGE', KEYS[3], 0, -1)) do
+  if not active[t] then
+    active[t] = true
+    total_weight = total_weight + (tonumber(redis.call('HGET', KEYS[4], t)) or 1)
+  end
+end
+local share = math.max(1, math.ceil(slots * weight / total_weight))
+if redis.call('ZCARD', KEYS[1]) < slots and held < share then
+  redis.call('ZADD', KEYS[1], now + tonumber(ARGV[5]), tenant .. '|' .. ARGV[3])
+  redis.call('HINCRBY', KEYS[2], tenant, 1)
+  return 1
+end
+redis.call('ZADD', KEYS[3], now + tonumber(ARGV[7]), tenant)
+return 0
+"""
+
+# KEYS: holders zset, counts hash; ARGV: tenant, token
+_RELEASE_SLOT_LUA = """
+if redis.call('ZREM', KEYS[1], ARGV[1] .. '|' .. ARGV[2]) == 1 then
+  redis.call('HINCRBY', KEYS[2], ARGV[1], -1)
+end
+return 1
+"""
+
+
+class FairShareBusyError(RuntimeError):
+    """No fair-share slot became free for this tenant in time; retry later."""
+
+
+def plan_weight(tenant: str) -> int:
+    """Weight of a tenant's plan (TENANT_PLANS -> PLAN_WEIGHTS, unknown -> DEFAULT_PLAN)."""
+    settings = get_settings()
+    plan = settings.TENANT_PLANS.get(tenant, settings.DEFAULT_PLAN)
+    return max(1, int(settings.PLAN_WEIGHTS.get(plan, settings.PLAN_WEIGHTS.get(settings.DEFAULT_PLAN, 1))))
+
+
+def _backlog_score(job: DownloadJob) -> int:
+    created = job.created_at.timestamp() if isinstance(job.created_at, datetime) else time.time()
+    return int(job.priority or 0) * _SCORE_SCALE + int(created)
+
+
+class _RedisScripts:
+    """LazyRedis client + the subclass's Lua scripts, registered on connect (callers fail open)."""
+
+    _scripts_src: Dict[str, str] = {}
+
+    def __init__(self, redis_url: Optional[str], key_prefix: str) -> None:
+        self.key_prefix = key_prefix
+        self.logger = get_logger(self.__class__.__name__)
+        self._scripts: Dict[str, Any] = {}
+        self._redis = LazyRedis(redis_url, self.__class__.__name__, on_connect=self._register_scripts)
+
+    def _register_scripts(self, client: Any) -> None:
+        self._scripts = {name: client.register_script(src) for name, src in self._scripts_src.items()}
+
+    def _client(self) -> Any:
+        return self._redis.get()
+
+    def _redis_failed(self, op: str) -> None:
+        self._redis.failed(op, "bypassed")
+
+
+class FairDispatcher(_RedisScripts):
+    """
+    Weighted fair queuing of download jobs across tenants, between DownloadService and Celery.
+
+    - submit(): jobs go to their tenant's backlog for their lane (sorted by SJF priority, then age)
+    - dispatch(): per lane, while fewer than capacity jobs are in flight, the tenant with the
+      lowest virtual time releases its next job to the lane's Celery queue (WFQ: a tenant of
+      weight w gets w releases per round), so a 500-video playlist cannot take every slot
+    - complete()/cancel(): the worker (or DELETE) frees the slot and dispatches the next job
+
+    State lives in Redis (all API instances and workers share it; one Lua call per step).
+    In-flight entries are leased (lease_sec) and reconciled with the DB by the worker pump.
+    Redis unavailable -> submit() returns False and callers enqueue directly (FIFO).
+    """
+
+    _scripts_src = {"submit": _SUBMIT_LUA, "release": _RELEASE_LUA, "reprioritize": _REPRIORITIZE_LUA}
+
+    def __init__(
+        self,
+        redis_url: Optional[str],
+        key_prefix: str = "vda:fair:",
+        capacity: Optional[Dict[str, int]] = None,
+        lease_sec: int = 21600,
+        pump_sec: float = 5.0,
+    ) -> None:
+        super().__init__(redis_url, key_prefix)
+        self.lease_sec = int(lease_sec)
+        self.pump_sec = max(0.5, float(pump_sec))
+        # lane queue -> max jobs released to Celery and not finished yet
+        self.capacity = {
+            lane.queue: max(1, int((capacity or {}).get(lane.name, 2 * lane.concurrency))) for lane in all_lanes()
+        }
+        self._pump: Optional[threading.Thread] = None
+        self._pump_stop = threading.Event()
+
+    # ---- keys ----
+
+    def _key(self, queue: str, name: str) -> str:
+        return f"{self.key_prefix}dl:{queue}:{name}"
+
+    def _lane_keys(self, queue: str) -> List[str]:
+        return [
+            self._key(queue, "tenants"),
+            self._key(queue, "inflight"),
+            self._key(queue, "weights"),
+            self._key(queue, "vclock"),
+        ]
+
+    def _backlog(self, queue: str, tenant: str) -> str:
+        return self._key(queue, f"backlog:{tenant}")
+
+    # ---- producer side ----
+
+    def submit(self, tenant: str, jobs: Sequence[DownloadJob]) -> bool:
+        """Queue jobs in the tenant's backlogs. False if Redis is unavailable (enqueue directly)."""
+        client = self._client()
+        if client is None:
+            return False
+        by_queue: Dict[str, List[Any]] = {}
+        for job in jobs:
+            by_queue.setdefault(queue_for_platform(job.platform), []).extend([job.id, _backlog_score(job)])
+        weight = plan_weight(tenant)
+        try:
+            pipe = client.pipeline(transaction=False)
+            for queue, items in by_queue.items():
+                keys = self._lane_keys(queue)
+                self._scripts["submit"](
+                    keys=[keys[0], self._backlog(queue, tenant), keys[2], keys[3]],
+                    args=[tenant, weight, *items],
+                    client=pipe,
+                )
+            pipe.execute()
+            return True
+        except Exception:
+            self._redis_failed("submit")
+            return False
+
+    def dispatch(self, queues: Iterable[str], max_jobs: int = 1000) -> int:
+        """Release up to each lane's free capacity and publish to Celery; returns jobs published."""
+        published = 0
+        for queue in queues:
+            for tenant, job_id, score in self._release(queue, max_jobs):
+                if self._publish(queue, job_id, int(score // _SCORE_SCALE)):
+                    published += 1
+                else:
+                    self._requeue(queue, tenant, job_id, score)
+        return published
+
+    def _release(self, queue: str, max_jobs: int) -> List[Tuple[str, str, float]]:
+        client = self._client()
+        if client is None:
+            return []
+        try:
+            flat = self._scripts["release"](
+                keys=self._lane_keys(queue),
+                args=[time.time(), self.capacity.get(queue, 1), self.lease_sec, self._backlog(queue, ""), max_jobs],
+            )
+        except Exception:
+            self._redis_failed("release")
+            return []
+        out = []
+        for i in range(0, len(flat), 3):
+            out.append((_text(flat[i]), _text(flat[i + 1]), float(flat[i + 2])))
+        return out
+
+    def _publish(self, queue: str, job_id: str, priority: int) -> bool:
+        try:
+            from video_downloader_api.worker.tasks import run_download  # local import avoids import cycles
+
+            run_download.apply_async(
+                args=[job_id],
+                task_id=job_id,
+                queue=queue,
+                priority=priority if get_settings().DOWNLOAD_SJF_ENABLED else None,
+            )
+            return True
+        except Exception:
+            self.logger.exception("FairDispatcher: failed to enqueue job_id=%s on %s", job_id, queue)
+            return False
+
+    def _requeue(self, queue: str, tenant: str, job_id: str, score: float) -> None:
+        """Publish failed: put the job back at the head of its tenant's backlog."""
+        client = self._client()
+        if client is None:
+            return
+        try:
+            keys = self._lane_keys(queue)
+            client.zrem(keys[1], job_id)
+            self._scripts["submit"](
+                keys=[keys[0], self._backlog(queue, tenant), keys[2], keys[3]],
+                args=[tenant, plan_weight(tenant), job_id, score],
+            )
+        except Exception:
+            self._redis_failed("requeue")
+
+    def reprioritize(self, queue: str, tenant: Optional[str], job_id: str, priority: int) -> bool:
+        """Move a job still waiting in its backlog to a new priority (True), False if already released."""
+        client = self._client()
+        if client is None or not tenant:
+            return False
+        try:
+            return bool(
+                self._scripts["reprioritize"](
+                    keys=[self._backlog(queue, tenant)],
+                    args=[job_id, priority, _SCORE_SCALE],
+                )
+            )
+        except Exception:
+            self._redis_failed("reprioritize")
+            return False
+
+    # ---- completion ----
+
+    def complete(self, queue: str, job_id: str) -> None:
+        """A released job ended (any status): free its slot and release the next job."""
+        client = self._client()
+        if client is None:
+            return
+        try:
+            client.zrem(self._key(queue, "inflight"), job_id)
+        except Exception:
+            self._redis_failed("complete")
+            return
+        self.dispatch([queue])
+
+    def cancel(self, jobs: Sequence[Tuple[str, str, Optional[str]]]) -> None:
+        """Canceled jobs (job_id, platform, tenant): drop them from backlogs and free their slots."""
+        client = self._client()
+        if client is None or not jobs:
+            return
+        queues = set()
+        try:
+            pipe = client.pipeline(transaction=False)
+            for job_id, platform, tenant in jobs:
+                queue = queue_for_platform(platform)
+                queues.add(queue)
+                if tenant:
+                    pipe.zrem(self._backlog(queue, tenant), job_id)
+                pipe.zrem(self._key(queue, "inflight"), job_id)
+            pipe.execute()
+        except Exception:
+            self._redis_failed("cancel")
+            return
+        self.dispatch(queues)
+
+    def reconcile(self, queue: str, repo: JobRepository) -> int:
+        """Drop in-flight entries whose job is terminal or gone (crashed worker, revoked task)."""
+        client = self._client()
+        if client is None:
+            return 0
+        try:
+            job_ids = [_text(x) for x in client.zrange(self._key(queue, "inflight"), 0, -1)]
+            if not job_ids:
+                return 0
+            statuses = {job.id: job.status for job in repo.list_jobs(job_ids)}
+            stale = [j for j in job_ids if statuses.get(j) is None or statuses[j] in TERMINAL_STATUSES]
+            if stale:
+                client.zrem(self._key(queue, "inflight"), *stale)
+            return len(stale)
+        except Exception:
+            self._redis_failed("reconcile")
+            return 0
+
+    # ---- worker pump ----
+
+    def pump_once(self, session_factory: Callable[[], Session]) -> int:
+        db = session_factory()
+        try:
+            repo = JobRepository(db)
+            for queue in self.capacity:
+                self.reconcile(queue, repo)
+        finally:
+            db.close()
+        return self.dispatch(self.capacity)
+
+    def start_pump(self, session_factory: Callable[[], Session]) -> None:
+        """Worker main process: reconcile leases and release backlog every pump_sec."""
+        if self._pump is not None:
+            return
+
+        def _loop() -> None:
+            while not self._pump_stop.wait(self.pump_sec):
+                try:
+                    self.pump_once(session_factory)
+                except Exception:
+                    self.logger.exception("FairDispatcher: pump failed.")
+
+        self._pump_stop.clear()
+        self._pump = threading.Thread(target=_loop, name="fair-dispatch-pump", daemon=True)
+        self._pump.start()
+
+    def stop_pump(self) -> None:
+        """Stop the pump thread (worker shutdown); a pass in progress finishes first."""
+        self._pump_stop.set()
+        pump, self._pump = self._pump, None
+        if pump is not None:
+            pump.join(timeout=self.pump_sec)
+
+    def stats(self) -> Dict[str, Any]:
+        client = self._client()
+        if client is None:
+            return {"available": False}
+        try:
+            lanes: Dict[str, Any] = {}
+            for queue, capacity in self.capacity.items():
+                tenants = [_text(t) for t in client.zrange(self._key(queue, "tenants"), 0, -1)]
+                pipe = client.pipeline(transaction=False)
+                pipe.zcard(self._key(queue, "inflight"))
+                for tenant in tenants:
+                    pipe.zcard(self._backlog(queue, tenant))
+                counts = pipe.execute()
+                lanes[queue] = {
+                    "capacity": capacity,
+                    "in_flight": int(counts[0]),
+                    "backlog": {tenant: int(n) for tenant, n in zip(tenants, counts[1:])},
+                }
+            return {"available": True, "lanes": lanes}
+        except Exception:
+            self._redis_failed("stats")
+            return {"available": False}
+
+
+class FairShareLimiter(_RedisScripts):
+    """
+    Cluster-wide weighted fair share of metadata extraction slots (/info, /playlist-info).
+
+    A tenant is admitted while a slot is free and it holds fewer than its share:
+    ceil(slots * weight / total weight of tenants holding or waiting). A lone tenant can
+    use every slot; once others queue up, its freed slots go to them. Slots are leased
+    (hold_ttl_sec) so a crashed API instance does not leak them.
+    Redis unavailable -> admitted without accounting (fail open).
+    """
+
+    _scripts_src = {"acquire": _ACQUIRE_LUA, "release": _RELEASE_SLOT_LUA}
+
+    # Token of a request admitted while Redis was unavailable (nothing to release)
+    UNTRACKED = ""
+
+    def __init__(
+        self,
+        redis_url: Optional[str],
+        key_prefix: str = "vda:fair:",
+        slots: int = 16,
+        hold_ttl_sec: float = 300.0,
+    ) -> None:
+        super().__init__(redis_url, key_prefix)
+        self.slots = max(1, int(slots))
+        self.hold_ttl_sec = float(hold_ttl_sec)
+        self._keys = [f"{key_prefix}meta:{name}" for name in ("holders", "counts", "waiting", "weights")]
+
+    def try_acquire(self, tenant: str) -> Optional[str]:
+        """Slot token, UNTRACKED if Redis is down, None if the tenant must wait."""
+        client = self._client()
+        if client is None:
+            return self.UNTRACKED
+        token = uuid.uuid4().hex
+        try:
+            granted = self._scripts["acquire"](
+                keys=self._keys,
+                args=[tenant, plan_weight(tenant), token, time.time(), self.hold_ttl_sec, self.slots, 1.0],
+            )
+        except Exception:
+            self._redis_failed("acquire")
+            return self.UNTRACKED
+        return token if granted else None
+
+    async def acquire(self, tenant: str, wait_sec: float) -> str:
+        """Wait (polling) for a slot; FairShareBusyError after wait_sec."""
+        deadline = time.monotonic() + max(0.0, wait_sec)
+        delay = 0.02
+        while True:
+            token = await asyncio.to_thread(self.try_acquire, tenant)
+            if token is not None:
+                return token
+            if time.monotonic() >= deadline:
+                raise FairShareBusyError("Too many metadata extractions for this API key, retry later.")
+            await asyncio.sleep(delay)
+            delay = min(0.25, delay * 2)
+
+    def release(self, tenant: str, token: str) -> None:
+        if token == self.UNTRACKED:
+            return
+        client = self._client()
+        if client is None:
+            return
+        try:
+            self._scripts["release"](keys=self._keys[:2], args=[tenant, token])
+        except Exception:
+            self._redis_failed("release")
+
+    def stats(self) -> Dict[str, Any]:
+        client = self._client()
+        if client is None:
+            return {"available": False, "slots": self.slots}
+        try:
+            counts = client.hgetall(self._keys[1])
+            waiting = client.zrange(self._keys[2], 0, -1)
+        except Exception:
+            self._redis_failed("stats")
+            return {"available": False, "slots": self.slots}
+        return {
+            "available": True,
+            "slots": self.slots,
+            "held": {_text(t): int(c) for t, c in counts.items() if int(c) > 0},
+            "waiting": [_text(t) for t in waiting],
+        }
+
+
+def _text(value: Any) -> str:
+    return value.decode("utf-8") if isinstance(value, bytes) else str(value)
+
+
+@lru_cache(maxsize=1)
+def get_fair_dispatcher() -> Optional[FairDispatcher]:
+    """Process-wide dispatcher (None when FAIR_QUEUE_ENABLED is false). API and worker share REDIS_URL."""
+    settings = get_settings()
+    if not settings.FAIR_QUEUE_ENABLED:
+        return None
+    return FairDispatcher(
+        redis_url=settings.REDIS_URL,
+        key_prefix=settings.FAIR_QUEUE_KEY_PREFIX,
+        capacity=settings.FAIR_QUEUE_CAPACITY,
+        lease_sec=settings.FAIR_QUEUE_LEASE_SEC,
+        pump_sec=settings.FAIR_QUEUE_PUMP_SEC,
+    )
+
+
+@lru_cache(maxsize=1)
+def get_fair_share_limiter() -> Optional[FairShareLimiter]:
+    """Process-wide metadata limiter (None when METADATA_FAIR_ENABLED is false)."""
+    settings = get_settings()
+    if not settings.METADATA_FAIR_ENABLED:
+        return None
+    return FairShareLimiter(
+        redis_url=settings.REDIS_URL,
+        key_prefix=settings.FAIR_QUEUE_KEY_PREFIX,
+        slots=settings.METADATA_FAIR_SLOTS,
+        # Longest extraction deadline + margin: a crashed instance's slots come back
+        hold_ttl_sec=settings.METADATA_PLAYLIST_TIMEOUT_SEC + 60.0,
+    )
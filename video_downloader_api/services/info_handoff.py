@@ -0,0 +1,238 @@
+# video_downloader_api/services/info_handoff.py
+
+from __future__ import annotations
+
+import hashlib
+import json
+import time
+import zlib
+from functools import lru_cache
+from typing import Any, Dict, List, Optional
+from urllib.parse import parse_qs, urlsplit
+
+from video_downloader_api.core.config import get_settings
+from video_downloader_api.core.logger import get_logger
+from video_downloader_api.services.redis_client import LazyRedis
+
+# Top-level info keys the worker never needs to download (large, and re-derived if missing)
+_DROP_INFO_KEYS = frozenset(
+    {
+        "automatic_captions",
+        "subtitles",
+        "requested_subtitles",
+        "thumbnails",
+        "heatmap",
+        "chapters",
+        "description",
+        "tags",
+        "categories",
+        "comments",
+        "entries",
+        "requested_downloads",
+        "requested_formats",
+    }
+)
+
+
+def compact_info(info: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    Strip an extraction result down to what a download needs: formats (with their
+    signed URLs/headers) and the fields used for format selection and naming.
+    Dropped as well: "__" private keys, storyboard (image) formats and formats whose
+    fragments are generated lazily (not serializable; yt-dlp re-extracts for those).
+    """
+    out: Dict[str, Any] = {}
+    for k, v in info.items():
+        if v is None or k.startswith("__") or k in _DROP_INFO_KEYS:
+            continue
+        out[k] = v
+
+    formats = info.get("formats")
+    if isinstance(formats, list):
+        out["formats"] = [
+            {k: v for k, v in f.items() if not k.startswith("__")}
+            for f in formats
+            if isinstance(f, dict)
+            and f.get("format_note") != "storyboard"
+            and isinstance(f.get("fragments") or [], list)
+        ]
+    return out
+
+
+def _url_expiry(url: str) -> Optional[int]:
+    """
+    Unix expiry encoded in a signed media URL, if any:
+    - YouTube / TikTok: expire=<unix seconds>
+    - Instagram / Facebook CDN: oe=<hex unix seconds>
+    """
+    try:
+        query = parse_qs(urlsplit(url).query)
+    except Exception:
+        return None
+    for value in query.get("expire", []):
+        if value.isdigit():
+            return int(value)
+    for value in query.get("oe", []):
+        try:
+            return int(value, 16)
+        except ValueError:
+            continue
+    return None
+
+
+def signed_url_expiry(info: Dict[str, Any]) -> Optional[int]:
+    """Earliest expiry (unix seconds) over the format URLs of an info dict, None if unknown."""
+    expiries: List[int] = []
+    for fmt in info.get("formats") or []:
+        if not isinstance(fmt, dict):
+            continue
+        url = fmt.get("url")
+        if isinstance(url, str):
+            exp = _url_expiry(url)
+            if exp is not None:
+                expiries.append(exp)
+    return min(expiries) if expiries else None
+
+
+class InfoHandoffStore:
+    """
+    Hands a MetadataService extraction result to the Celery worker through Redis,
+    so the download can start from the stored info instead of extracting again.
+
+    - save(key, info): store compact, zlib-compressed JSON keyed by content key
+      (PlatformDetector.cache_key).
+      TTL = time left until the earliest signed format URL expires minus a safety
+      margin, capped at max_ttl_sec (nothing is stored if that leaves no time).
+    - ref_for(key) / refs_for(keys): reference to put on the job (None if nothing stored)
+    - load(ref): the stored info dict, or None (expired/evicted/Redis down)
+
+    Failures never fail the request or the job; the worker just extracts again.
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        key_prefix: str = "vda:info:",
+        max_ttl_sec: int = 3600,
+        expiry_margin_sec: int = 300,
+    ) -> None:
+        self.redis_url = redis_url
+        self.key_prefix = key_prefix
+        self.max_ttl_sec = int(max_ttl_sec)
+        self.expiry_margin_sec = int(expiry_margin_sec)
+        self.logger = get_logger(self.__class__.__name__)
+
+        self._redis = LazyRedis(redis_url, self.__class__.__name__)
+
+    # -------------------------
+    # Internals
+    # -------------------------
+    def _client(self) -> Any:
+        """Redis client, None while in backoff."""
+        return self._redis.get()
+
+    def _redis_failed(self, op: str) -> None:
+        self._redis.failed(op)
+
+    @staticmethod
+    def ref(key: str) -> str:
+        """Stable reference for a content key (fits DownloadJob.info_ref)."""
+        return hashlib.sha1(key.encode("utf-8")).hexdigest()
+
+    def _key(self, ref: str) -> str:
+        return f"{self.key_prefix}{ref}"
+
+    def ttl_for(self, info: Dict[str, Any], now: Optional[float] = None) -> int:
+        """Seconds the stored info stays usable (0 = do not store)."""
+        now = time.time() if now is None else now
+        ttl = self.max_ttl_sec
+        expiry = signed_url_expiry(info)
+        if expiry is not None:
+            ttl = min(ttl, int(expiry - now) - self.expiry_margin_sec)
+        return max(0, ttl)
+
+    # -------------------------
+    # Public API
+    # -------------------------
+    def save(self, key: str, info: Dict[str, Any]) -> Optional[str]:
+        """Store the extraction result for `key`. Returns the ref, or None if not stored."""
+        if not info or info.get("_type", "video") != "video":
+            return None
+        ttl = self.ttl_for(info)
+        if ttl <= 0:
+            return None
+        client = self._client()
+        if client is None:
+            return None
+
+        try:
+            payload = zlib.compress(json.dumps(compact_info(info), default=str).encode("utf-8"), 1)
+        except Exception:
+            self.logger.warning("InfoHandoffStore: info for key=%s is not serializable; skipped.", key)
+            return None
+
+        ref = self.ref(key)
+        try:
+            client.set(self._key(ref), payload, ex=ttl)
+        except Exception:
+            self._redis_failed("set")
+            return None
+        return ref
+
+    def refs_for(self, keys: List[str]) -> List[Optional[str]]:
+        """Refs for keys that currently have stored info (one pipelined round trip)."""
+        if not keys:
+            return []
+        client = self._client()
+        if client is None:
+            return [None] * len(keys)
+
+        refs = [self.ref(k) for k in keys]
+        try:
+            pipe = client.pipeline()
+            for ref in refs:
+                pipe.exists(self._key(ref))
+            found = pipe.execute()
+        except Exception:
+            self._redis_failed("exists")
+            return [None] * len(keys)
+        return [ref if hit else None for ref, hit in zip(refs, found)]
+
+    def ref_for(self, key: str) -> Optional[str]:
+        return self.refs_for([key])[0]
+
+    def load(self, ref: str) -> Optional[Dict[str, Any]]:
+        """Stored info dict for `ref`, or None if it expired or cannot be read."""
+        client = self._client()
+        if client is None:
+            return None
+        try:
+            raw = client.get(self._key(ref))
+        except Exception:
+            self._redis_failed("get")
+            return None
+        if not raw:
+            return None
+        try:
+            data = json.loads(zlib.decompress(raw))
+        except Exception:
+            self.logger.warning("InfoHandoffStore: dropping undecodable entry ref=%s", ref)
+            return None
+        return data if isinstance(data, dict) else None
+
+
+@lru_cache(maxsize=1)
+def get_info_handoff_store() -> Optional[InfoHandoffStore]:
+    """
+    Process-wide InfoHandoffStore (None when INFO_HANDOFF_ENABLED is false).
+    API and worker must point at the same REDIS_URL.
+    """
+    settings = get_settings()
+    if not settings.INFO_HANDOFF_ENABLED:
+        return None
+    return InfoHandoffStore(
+        redis_url=settings.REDIS_URL,
+        key_prefix=settings.INFO_HANDOFF_KEY_PREFIX,
+        max_ttl_sec=settings.INFO_HANDOFF_MAX_TTL_SEC,
+        expiry_margin_sec=settings.INFO_HANDOFF_EXPIRY_MARGIN_SEC,
+    )
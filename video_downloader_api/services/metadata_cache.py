@@ -0,0 +1,358 @@
+# video_downloader_api/services/metadata_cache.py
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+from video_downloader_api.core.config import get_settings
+from video_downloader_api.core.logger import get_logger
+from video_downloader_api.schemas.video import VideoInfoOut
+from video_downloader_api.services.redis_client import LazyRedis
+
+# Ordered (error_class, message fragments) used to classify yt-dlp failures.
+# First match wins, so more specific classes come first.
+_ERROR_CLASS_PATTERNS: Tuple[Tuple[str, Tuple[str, ...]], ...] = (
+    ("rate_limited", ("http error 429", "too many requests", "not a bot")),
+    ("private", ("private video", "this video is private", "this account is private")),
+    (
+        "geo_blocked",
+        ("not available in your country", "geo restrict", "geo-restrict", "blocked it in your country"),
+    ),
+    ("login_required", ("sign in to confirm your age", "login required", "requires authentication", "log in")),
+    ("unsupported", ("unsupported url",)),
+    (
+        "unavailable",
+        (
+            "video unavailable",
+            "has been removed",
+            "no longer available",
+            "does not exist",
+            "account has been terminated",
+            "http error 404",
+            "http error 410",
+        ),
+    ),
+    (
+        "network",
+        (
+            "timed out",
+            "timeout",
+            "connection reset",
+            "connection refused",
+            "temporary failure in name resolution",
+            "unable to download webpage",
+            "http error 5",
+        ),
+    ),
+)
+
+
+# Rate limiting/bot checks, outages upstream (timeouts, 5xx) and unrecognized errors: retried
+# on the next request, never negatively cached (a short outage must not block the URL)
+TRANSIENT_ERROR_CLASSES = frozenset({"rate_limited", "network", "other"})
+
+
+def classify_extraction_error(message: str) -> str:
+    """
+    Map a downloader error message to a coarse error class (used for negative-cache TTLs).
+    Returns "other" if nothing matches.
+    """
+    text = (message or "").lower()
+    for error_class, fragments in _ERROR_CLASS_PATTERNS:
+        if any(f in text for f in fragments):
+            return error_class
+    return "other"
+
+
+class LRUTTLCache:
+    """
+    Thread-safe in-process LRU cache with per-entry TTL.
+
+    - get(key): returns value or None (expired entries are dropped on read)
+    - set(key, value, ttl_sec): inserts/refreshes entry, evicts least recently used when full
+    """
+
+    def __init__(self, max_items: int = 1024) -> None:
+        self.max_items = max(1, int(max_items))
+        self._lock = threading.Lock()
+        # key -> (expires_at_monotonic, value)
+        self._data: "OrderedDict[str, Tuple[float, Any]]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        now = time.monotonic()
+        with self._lock:
+            item = self._data.get(key)
+            if item is None:
+                return None
+            expires_at, value = item
+            if expires_at <= now:
+                del self._data[key]
+                return None
+            self._data.move_to_end(key)
+            return value
+
+    def set(self, key: str, value: Any, ttl_sec: float) -> None:
+        if ttl_sec <= 0:
+            return
+        expires_at = time.monotonic() + ttl_sec
+        with self._lock:
+            self._data[key] = (expires_at, value)
+            self._data.move_to_end(key)
+            while len(self._data) > self.max_items:
+                self._data.popitem(last=False)
+
+    def delete(self, key: str) -> None:
+        with self._lock:
+            self._data.pop(key, None)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._data)
+
+
+class MetadataCache:
+    """
+    Two-tier cache in front of MetadataService (keyed by PlatformDetector.cache_key).
+
+    - L1: in-process LRU with TTL (hits cost no network at all)
+    - L2: Redis (shared across uvicorn workers and nodes)
+
+    Redis is optional: if it is disabled or unreachable, the cache silently
+    works as L1-only. Cache failures never fail the request.
+    """
+
+    def __init__(
+        self,
+        max_items: int,
+        default_ttl_sec: int,
+        platform_ttl_sec: Optional[Dict[str, int]] = None,
+        negative_ttl_sec: Optional[Dict[str, int]] = None,
+        redis_url: Optional[str] = None,
+        key_prefix: str = "vda:meta:",
+    ) -> None:
+        self.default_ttl_sec = int(default_ttl_sec)
+        self.platform_ttl_sec = {k.lower(): int(v) for k, v in (platform_ttl_sec or {}).items()}
+        self.negative_ttl_sec = {k.lower(): int(v) for k, v in (negative_ttl_sec or {}).items()}
+        self.redis_url = redis_url
+        self.key_prefix = key_prefix
+        self.logger = get_logger(self.__class__.__name__)
+
+        self._l1 = LRUTTLCache(max_items=max_items)
+        self._redis = LazyRedis(redis_url, self.__class__.__name__)
+
+        self._stats_lock = threading.Lock()
+        self._stats: Dict[str, int] = {
+            "l1_hits": 0,
+            "l2_hits": 0,
+            "misses": 0,
+            "sets": 0,
+            "negative_hits": 0,
+            "negative_sets": 0,
+            "l2_errors": 0,
+        }
+
+    # -------------------------
+    # Internals
+    # -------------------------
+    def _incr(self, name: str) -> None:
+        with self._stats_lock:
+            self._stats[name] = self._stats.get(name, 0) + 1
+
+    def _redis_client(self) -> Any:
+        """Redis client, None if L2 is disabled or in backoff."""
+        return self._redis.get()
+
+    def _redis_failed(self, op: str) -> None:
+        self._incr("l2_errors")
+        self._redis.failed(op, "L2 disabled")
+
+    def _key(self, key: str) -> str:
+        return f"{self.key_prefix}info:{key}"
+
+    def _failure_key(self, key: str) -> str:
+        return f"{self.key_prefix}fail:{key}"
+
+    # -------------------------
+    # Public API
+    # -------------------------
+    def ttl_for(self, platform: Optional[str]) -> int:
+        """TTL (seconds) for a platform, falling back to the default TTL."""
+        return self.platform_ttl_sec.get((platform or "").lower(), self.default_ttl_sec)
+
+    def get_video_info(self, key: str) -> Optional[VideoInfoOut]:
+        """
+        Look up cached VideoInfoOut (L1 first, then L2).
+        L2 hits are promoted into L1 using the remaining Redis TTL.
+        """
+        value = self._l1.get(key)
+        if value is not None:
+            self._incr("l1_hits")
+            return value
+
+        client = self._redis_client()
+        if client is not None:
+            rkey = self._key(key)
+            try:
+                pipe = client.pipeline()
+                pipe.get(rkey)
+                pipe.ttl(rkey)
+                raw, ttl = pipe.execute()
+            except Exception:
+                self._redis_failed("get")
+                raw, ttl = None, None
+
+            if raw:
+                try:
+                    value = VideoInfoOut.model_validate_json(raw)
+                except Exception:
+                    self.logger.warning("MetadataCache: dropping undecodable L2 entry for key=%s", key)
+                    value = None
+                if value is not None:
+                    self._incr("l2_hits")
+                    if isinstance(ttl, int) and ttl > 0:
+                        self._l1.set(key, value, ttl)
+                    return value
+
+        self._incr("misses")
+        return None
+
+    def peek_many(self, keys: Sequence[str]) -> List[Optional[VideoInfoOut]]:
+        """
+        Cached VideoInfoOut per key (None where absent) for bookkeeping reads such as
+        sizing download jobs: L1 first, then one MGET for the rest. Hit/miss counters
+        are not touched and L2 hits are not promoted into L1.
+        """
+        found: Dict[str, Optional[VideoInfoOut]] = {key: self._l1.get(key) for key in keys}
+        missing = [key for key, value in found.items() if value is None]
+        client = self._redis_client() if missing else None
+        if client is not None:
+            try:
+                raws = client.mget([self._key(key) for key in missing])
+            except Exception:
+                self._redis_failed("mget")
+                raws = []
+            for key, raw in zip(missing, raws):
+                if not raw:
+                    continue
+                try:
+                    found[key] = VideoInfoOut.model_validate_json(raw)
+                except Exception:
+                    self.logger.warning("MetadataCache: dropping undecodable L2 entry for key=%s", key)
+        return [found[key] for key in keys]
+
+    def set_video_info(self, key: str, platform: Optional[str], value: VideoInfoOut) -> None:
+        """Store VideoInfoOut in both tiers using the platform TTL."""
+        ttl = self.ttl_for(platform)
+        if ttl <= 0:
+            return
+
+        self._l1.set(key, value, ttl)
+        self._incr("sets")
+
+        client = self._redis_client()
+        if client is not None:
+            try:
+                client.set(self._key(key), value.model_dump_json(), ex=ttl)
+            except Exception:
+                self._redis_failed("set")
+
+    def get_failure(self, key: str) -> Optional[Tuple[str, str]]:
+        """
+        Look up a cached extraction failure.
+
+        Returns:
+            (error_class, message) or None
+        """
+        fkey = self._failure_key(key)
+        value = self._l1.get(fkey)
+        if value is not None:
+            self._incr("negative_hits")
+            return value
+
+        client = self._redis_client()
+        if client is not None:
+            try:
+                pipe = client.pipeline()
+                pipe.get(fkey)
+                pipe.ttl(fkey)
+                raw, ttl = pipe.execute()
+            except Exception:
+                self._redis_failed("get")
+                raw, ttl = None, None
+
+            if raw:
+                try:
+                    data = json.loads(raw)
+                    value = (str(data["error_class"]), str(data["message"]))
+                except Exception:
+                    value = None
+                if value is not None:
+                    self._incr("negative_hits")
+                    if isinstance(ttl, int) and ttl > 0:
+                        self._l1.set(fkey, value, ttl)
+                    return value
+        return None
+
+    def set_failure(self, key: str, error_class: str, message: str) -> None:
+        """Remember an extraction failure for the TTL configured for its error class (transient ones: never)."""
+        if error_class in TRANSIENT_ERROR_CLASSES:
+            return
+        ttl = self.negative_ttl_sec.get(error_class, 0)
+        if ttl <= 0:
+            return
+
+        fkey = self._failure_key(key)
+        self._l1.set(fkey, (error_class, message), ttl)
+        self._incr("negative_sets")
+
+        client = self._redis_client()
+        if client is not None:
+            try:
+                client.set(fkey, json.dumps({"error_class": error_class, "message": message}), ex=ttl)
+            except Exception:
+                self._redis_failed("set")
+
+    def invalidate(self, key: str) -> None:
+        self._l1.delete(key)
+        self._l1.delete(self._failure_key(key))
+        client = self._redis_client()
+        if client is not None:
+            try:
+                client.delete(self._key(key), self._failure_key(key))
+            except Exception:
+                self._redis_failed("delete")
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters for this process (L2 hits are shared, counters are not)."""
+        with self._stats_lock:
+            out: Dict[str, Any] = dict(self._stats)
+        lookups = out["l1_hits"] + out["l2_hits"] + out["misses"]
+        out["lookups"] = lookups
+        out["hit_ratio"] = round((out["l1_hits"] + out["l2_hits"]) / lookups, 4) if lookups else None
+        out["l1_size"] = len(self._l1)
+        out["l2_enabled"] = bool(self.redis_url)
+        return out
+
+
+@lru_cache(maxsize=1)
+def get_metadata_cache() -> Optional[MetadataCache]:
+    """
+    Process-wide MetadataCache singleton (None when METADATA_CACHE_ENABLED is false).
+    Routes build services per request, so the cache must live outside them.
+    """
+    settings = get_settings()
+    if not settings.METADATA_CACHE_ENABLED:
+        return None
+    return MetadataCache(
+        max_items=settings.METADATA_CACHE_MAX_ITEMS,
+        default_ttl_sec=settings.METADATA_CACHE_TTL_SEC,
+        platform_ttl_sec=settings.METADATA_CACHE_PLATFORM_TTL_SEC,
+        negative_ttl_sec=settings.METADATA_NEGATIVE_CACHE_TTL_SEC,
+        redis_url=settings.REDIS_URL if settings.METADATA_CACHE_REDIS_ENABLED else None,
+        key_prefix=settings.METADATA_CACHE_KEY_PREFIX,
+    )
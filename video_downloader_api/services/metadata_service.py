@@ -2,12 +2,26 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List, Optional, Tuple
+import threading
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from itertools import islice
+from typing import Any, Deque, Dict, Iterable, Iterator, List, Optional, Set, Tuple
 
+from video_downloader_api.core.config import get_settings
 from video_downloader_api.core.logger import get_logger
 from video_downloader_api.downloader.base import BaseDownloader
-from video_downloader_api.schemas.video import PlaylistInfoOut, VideoFormatOut, VideoInfoOut
+from video_downloader_api.models.video_format import VideoFormat
+from video_downloader_api.models.video_info import VideoInfo
+from video_downloader_api.schemas.video import PlaylistEntryOut, PlaylistInfoOut, VideoFormatOut, VideoInfoOut
+from video_downloader_api.services.info_handoff import InfoHandoffStore
+from video_downloader_api.services.metadata_cache import (
+    TRANSIENT_ERROR_CLASSES,
+    MetadataCache,
+    classify_extraction_error,
+)
 from video_downloader_api.services.platform_detector import PlatformDetector
+from video_downloader_api.services.single_flight import SingleFlight
 from video_downloader_api.utils.helpers import bytes_to_human, safe_int
 
 
@@ -18,25 +32,34 @@ def quality_label_from_height(height: Optional[int]) -> str:
     return "unknown"
 
 
-def _height(fmt: Dict[str, Any]) -> Optional[int]:
-    """Extract height from format dict."""
-    h = fmt.get("height")
-    return safe_int(h, default=None) if h is not None else None
+def _with_source_url(cached: VideoInfoOut, normalized_url: str) -> VideoInfoOut:
+    """A cache hit keyed by content: report this request's URL, not the first requester's."""
+    if cached.source_url == normalized_url:
+        return cached
+    return cached.model_copy(update={"source_url": normalized_url})
 
 
-def _has_video(fmt: Dict[str, Any]) -> bool:
-    vcodec = fmt.get("vcodec")
-    return vcodec is not None and str(vcodec).lower() != "none"
+class ExtractionFailedError(ValueError):
+    """
+    Extraction failed for this URL (private/deleted/geo-blocked/...), possibly served
+    from the negative cache. Subclasses ValueError so routes answer with a 4xx.
+    """
 
+    def __init__(self, message: str, error_class: str, cached: bool = False) -> None:
+        super().__init__(message)
+        self.error_class = error_class
+        self.cached = cached
 
-def _has_audio(fmt: Dict[str, Any]) -> bool:
-    acodec = fmt.get("acodec")
-    return acodec is not None and str(acodec).lower() != "none"
 
+class ExtractionUnavailableError(RuntimeError):
+    """
+    Extraction failed for a transient reason (rate limited, network, upstream 5xx, unclassified error).
+    Not negatively cached; routes answer 503 with Retry-After.
+    """
 
-def _is_merged(fmt: Dict[str, Any]) -> bool:
-    """True if this format has both video and audio (single file)."""
-    return _has_video(fmt) and _has_audio(fmt)
+    def __init__(self, message: str, error_class: str) -> None:
+        super().__init__(message)
+        self.error_class = error_class
 
 
 class MetadataService:
@@ -44,21 +67,42 @@ class MetadataService:
     Given a URL, validate it and return a VideoInfoOut with available formats.
     """
 
-    def __init__(self, downloader: BaseDownloader, detector: PlatformDetector) -> None:
+    def __init__(
+        self,
+        downloader: BaseDownloader,
+        detector: PlatformDetector,
+        cache: Optional[MetadataCache] = None,
+        single_flight: Optional[SingleFlight] = None,
+        playlist_workers: Optional[int] = None,
+        info_store: Optional[InfoHandoffStore] = None,
+    ) -> None:
         self.downloader = downloader
         self.detector = detector
+        self.cache = cache
+        self.single_flight = single_flight
+        self.info_store = info_store
+        if playlist_workers is None:
+            playlist_workers = get_settings().METADATA_PLAYLIST_WORKERS
+        self.playlist_workers = max(1, int(playlist_workers))
         self.logger = get_logger(self.__class__.__name__)
 
-    def validate_and_extract(self, url: str, allowed_domains: List[str]) -> Tuple[str, str, Dict[str, Any]]:
+    def validate_and_extract(
+        self,
+        url: str,
+        allowed_domains: List[str],
+        use_cache: bool = True,
+    ) -> Tuple[str, str, VideoInfo]:
         """
         Pipeline:
         - normalize url
         - check allowlist
-        - detect platform
-        - call downloader.extract_info(normalized_url)
+        - detect platform + canonical content key (see PlatformDetector.cache_key)
+        - call downloader.extract_info(normalized_url) and project it into VideoInfo
+          (coalesced: concurrent callers for the same content share one extraction)
+        - use_cache=False skips the negative cache too (retry a link that recovered)
 
         Returns:
-            (platform, normalized_url, info_dict)
+            (platform, normalized_url, VideoInfo)
         """
         normalized = self.detector.normalize_url(url)
 
@@ -66,15 +110,61 @@ class MetadataService:
             raise ValueError("Domain is not allowed.")
 
         platform = self.detector.detect_platform(normalized)
-        info = self.downloader.extract_info(normalized)
+        key = self.detector.cache_key(normalized)
+
+        # Known-dead link: fail fast without touching yt-dlp
+        if use_cache:
+            self._raise_cached_failure(key)
+
+        if self.single_flight is None:
+            info = self._extract_info(normalized, platform, key)
+        else:
+            info = self.single_flight.do(key, lambda: self._extract_info(normalized, platform, key))
+            # Followers share the leader's result, which may come from another link to the same content
+            if info.source_url != normalized:
+                info = info._replace(source_url=normalized)
         return platform, normalized, info
 
+    def _raise_cached_failure(self, key: str) -> None:
+        if self.cache is None:
+            return
+        failure = self.cache.get_failure(key)
+        if failure is not None:
+            error_class, message = failure
+            raise ExtractionFailedError(message, error_class=error_class, cached=True)
+
+    def _extract_info(self, normalized_url: str, platform: str, key: str) -> VideoInfo:
+        """
+        downloader.extract_info + record failures in the negative cache.
+        Successful results are handed to the worker (see InfoHandoffStore), then
+        projected into a compact VideoInfo; the raw dict is not kept.
+        """
+        try:
+            info = self.downloader.extract_info(normalized_url, platform=platform)
+        except RuntimeError as e:
+            message = str(e)
+            error_class = classify_extraction_error(message)
+            if error_class in TRANSIENT_ERROR_CLASSES:
+                raise ExtractionUnavailableError(message, error_class=error_class) from e
+            if self.cache is not None:
+                self.cache.set_failure(key, error_class, message)
+            raise ExtractionFailedError(message, error_class=error_class) from e
+
+        if self.info_store is not None:
+            self.info_store.save(key, info)
+        return VideoInfo.from_raw(platform, normalized_url, info, self.downloader.list_formats(info))
+
     def validate_and_extract_playlist(
-        self, url: str, allowed_domains: List[str]
+        self,
+        url: str,
+        allowed_domains: List[str],
+        offset: int = 0,
+        limit: Optional[int] = None,
     ) -> Tuple[str, str, Dict[str, Any]]:
         """
         Same as [validate_and_extract] but keeps playlist structure (no noplaylist)
         so that we can list all entries for a playlist URL.
+        offset/limit restrict extraction to a window of entries.
         """
         normalized = self.detector.normalize_url(url)
 
@@ -82,76 +172,92 @@ class MetadataService:
             raise ValueError("Domain is not allowed.")
 
         platform = self.detector.detect_platform(normalized)
-        info = self.downloader.extract_playlist(normalized)
+        info = self.downloader.extract_playlist(normalized, offset=offset, limit=limit, platform=platform)
         return platform, normalized, info
 
-    def get_video_info(self, url: str, allowed_domains: List[str]) -> VideoInfoOut:
+    def get_video_info(self, url: str, allowed_domains: List[str], use_cache: bool = True) -> VideoInfoOut:
         """
         Returns clean API response containing video metadata + one format per quality.
         Deduplicates YouTube/Instagram formats (no more 3 sizes per 720p). Prefers
         merged (video+audio) formats; for separate streams we use format_id = height
         so the downloader merges bestvideo+bestaudio at download time.
+
+        Results are cached by content key (see MetadataCache, PlatformDetector.cache_key),
+        so the same video shared through different link formats hits. use_cache=False skips
+        the lookups (result and negative cache) but still refreshes the cache with the new result.
         """
-        platform, normalized_url, info = self.validate_and_extract(url, allowed_domains)
+        if self.cache is None:
+            _, _, info = self.validate_and_extract(url, allowed_domains, use_cache=use_cache)
+            return self._build_video_info(info)
 
-        title = info.get("title")
-        duration = info.get("duration")
-        thumbnail = info.get("thumbnail")
+        normalized = self.detector.normalize_url(url)
+        if not self.detector.is_allowed_domain(normalized, allowed_domains):
+            raise ValueError("Domain is not allowed.")
 
-        raw_formats = self.downloader.list_formats(info)
+        key = self.detector.cache_key(normalized)
+        if use_cache:
+            cached = self.cache.get_video_info(key)
+            if cached is not None:
+                return _with_source_url(cached, normalized)
 
+        platform, _, info = self.validate_and_extract(normalized, allowed_domains, use_cache=use_cache)
+        result = self._build_video_info(info)
+        self.cache.set_video_info(key, platform, result)
+        return result
+
+    def lookup_video_info(self, url: str, allowed_domains: List[str]) -> Optional[VideoInfoOut]:
+        """
+        Cache-only part of [get_video_info]: the cached result, None on a miss (or without
+        a cache), ExtractionFailedError for a negatively cached URL. Never extracts, so
+        callers can admit only real extractions (get_video_info(use_cache=False) after a miss).
+        """
+        normalized = self.detector.normalize_url(url)
+        if not self.detector.is_allowed_domain(normalized, allowed_domains):
+            raise ValueError("Domain is not allowed.")
+        if self.cache is None:
+            return None
+        key = self.detector.cache_key(normalized)
+        self._raise_cached_failure(key)
+        cached = self.cache.get_video_info(key)
+        return _with_source_url(cached, normalized) if cached is not None else None
+
+    def _build_video_info(self, info: VideoInfo) -> VideoInfoOut:
+        """Map a projected extraction result into VideoInfoOut (format dedupe + "best" option)."""
         # Group by height (resolution). For each height keep at most one format:
         # prefer merged (video+audio), then video-only (we'll merge at download time).
-        # Key: height (int), Value: (format_dict, is_merged)
-        by_height: Dict[int, Tuple[Dict[str, Any], bool]] = {}
+        by_height: Dict[int, VideoFormat] = {}
 
-        for fmt in raw_formats:
-            if not isinstance(fmt, dict):
-                continue
-            if not _has_video(fmt):
-                continue
-            if fmt.get("format_note") == "storyboard":
+        for fmt in info.formats:
+            if not fmt.has_video:
                 continue
 
-            height = _height(fmt)
+            height = fmt.height
             if height is None or height <= 0:
                 continue
 
-            merged = _is_merged(fmt)
             existing = by_height.get(height)
             # Prefer merged (video+audio) over video-only
             if existing is not None:
-                existing_merged = existing[1]
-                if existing_merged and not merged:
-                    continue  # keep existing merged
-                if not existing_merged and merged:
-                    by_height[height] = (fmt, merged)  # replace with merged
-                # else keep existing (both merged or both video-only)
+                if not existing.is_merged and fmt.is_merged:
+                    by_height[height] = fmt  # replace with merged
+                # else keep existing (merged, or both video-only)
                 continue
-            by_height[height] = (fmt, merged)
+            by_height[height] = fmt
 
         formats_out: List[VideoFormatOut] = []
         for height in sorted(by_height.keys()):
-            fmt, _ = by_height[height]
-            quality = quality_label_from_height(height)
-            # Use height as format_id so downloader can use bestvideo[height<=H]+bestaudio
-            format_id = str(height)
-            ext = fmt.get("ext") or "mp4"
-            vcodec = fmt.get("vcodec")
-            acodec = fmt.get("acodec")
-            filesize = fmt.get("filesize") or fmt.get("filesize_approx")
-            filesize_bytes = safe_int(filesize, default=None)
-
+            fmt = by_height[height]
             formats_out.append(
                 VideoFormatOut(
-                    format_id=format_id,
-                    quality=quality,
-                    ext=str(ext),
-                    filesize_bytes=filesize_bytes,
-                    filesize_human=bytes_to_human(filesize_bytes),
-                    fps=safe_int(fmt.get("fps"), default=None),
-                    vcodec=str(vcodec) if vcodec else None,
-                    acodec=str(acodec) if acodec else None,
+                    # Use height as format_id so downloader can use bestvideo[height<=H]+bestaudio
+                    format_id=str(height),
+                    quality=quality_label_from_height(height),
+                    ext=fmt.ext,
+                    filesize_bytes=fmt.filesize_bytes,
+                    filesize_human=bytes_to_human(fmt.filesize_bytes),
+                    fps=fmt.fps,
+                    vcodec=fmt.vcodec,
+                    acodec=fmt.acodec,
                 )
             )
 
@@ -171,44 +277,170 @@ class MetadataService:
         )
 
         return VideoInfoOut(
-            title=str(title) if title else None,
-            duration_sec=safe_int(duration, default=None),
-            thumbnail=str(thumbnail) if thumbnail else None,
-            platform=platform,
-            source_url=normalized_url,
+            title=info.title,
+            duration_sec=info.duration_sec,
+            thumbnail=info.thumbnail,
+            platform=info.platform,
+            source_url=info.source_url,
             formats=formats_out,
         )
 
-    def get_playlist_info(self, url: str, allowed_domains: List[str]) -> PlaylistInfoOut:
+    def get_playlist_info(
+        self,
+        url: str,
+        allowed_domains: List[str],
+        offset: int = 0,
+        limit: Optional[int] = None,
+        flat: bool = False,
+        cancel: Optional[threading.Event] = None,
+    ) -> PlaylistInfoOut:
         """
-        Returns metadata for all videos in a playlist URL.
+        Returns metadata for the videos of a playlist URL (optionally one page of it).
         Internally reuses [get_video_info] for each entry so the response shape
-        matches the single-video API (VideoInfoOut per item).
+        matches the single-video API (VideoInfoOut per item). Entries are resolved
+        in parallel (see iter_playlist_videos); output keeps playlist order.
+
+        flat=True skips per-entry format resolution and only returns entries
+        (id, title, duration, thumbnail). next_offset is set when more entries exist.
+        Setting `cancel` stops resolving further entries (the call then returns early).
         """
-        platform, normalized_url, info = self.validate_and_extract_playlist(url, allowed_domains)
+        # Ask for one extra entry so we know whether another page exists
+        fetch_limit = limit + 1 if limit is not None else None
+        platform, normalized_url, info = self.validate_and_extract_playlist(
+            url, allowed_domains, offset=offset, limit=fetch_limit
+        )
 
         title = info.get("title")
-        entries = info.get("entries") or []
-        videos: List[VideoInfoOut] = []
 
-        if isinstance(entries, list):
-            for entry in entries:
-                if not isinstance(entry, dict):
-                    continue
-                entry_url = entry.get("url") or entry.get("webpage_url")
-                if not entry_url:
-                    continue
-                try:
-                    vinfo = self.get_video_info(str(entry_url), allowed_domains)
-                    videos.append(vinfo)
-                except Exception:
-                    self.logger.exception(
-                        "Failed to build VideoInfoOut for playlist entry url=%s", entry_url
-                    )
-                    continue
+        # Decided on the raw entries: a skipped (malformed/url-less) entry still takes its position
+        next_offset: Optional[int] = None
+        raw_entries = info.get("entries")
+        if limit is not None and isinstance(raw_entries, list) and len(raw_entries) > limit:
+            info = {**info, "entries": raw_entries[:limit]}
+            next_offset = offset + limit
+        entries = self.playlist_entries(info)
+
+        total_count = safe_int(info.get("playlist_count"), default=None)
+
+        videos: List[VideoInfoOut] = []
+        if not flat:
+            videos = list(self.iter_playlist_videos([e.url for e in entries], allowed_domains, cancel=cancel))
 
         return PlaylistInfoOut(
             title=str(title) if title else None,
             playlist_url=normalized_url,
             videos=videos,
+            entries=entries if flat else [],
+            offset=offset,
+            next_offset=next_offset,
+            total_count=total_count,
         )
+
+    def playlist_entries(self, info: Dict[str, Any]) -> List[PlaylistEntryOut]:
+        """Flat entries of a playlist extraction (skips malformed entries, no format resolution)."""
+        raw_entries = info.get("entries") or []
+        entries: List[PlaylistEntryOut] = []
+        if not isinstance(raw_entries, list):
+            return entries
+
+        for entry in raw_entries:
+            if not isinstance(entry, dict):
+                continue
+            entry_url = entry.get("url") or entry.get("webpage_url")
+            if not entry_url:
+                continue
+
+            thumbnail = entry.get("thumbnail")
+            thumbnails = entry.get("thumbnails")
+            if not thumbnail and isinstance(thumbnails, list) and thumbnails:
+                last = thumbnails[-1]
+                thumbnail = last.get("url") if isinstance(last, dict) else None
+
+            title = entry.get("title")
+            entry_id = entry.get("id")
+            entries.append(
+                PlaylistEntryOut(
+                    id=str(entry_id) if entry_id else None,
+                    url=str(entry_url),
+                    title=str(title) if title else None,
+                    duration_sec=safe_int(entry.get("duration"), default=None),
+                    thumbnail=str(thumbnail) if thumbnail else None,
+                )
+            )
+        return entries
+
+    def playlist_entry_urls(self, info: Dict[str, Any]) -> List[str]:
+        """Entry URLs of a flat playlist extraction (skips malformed entries)."""
+        return [e.url for e in self.playlist_entries(info)]
+
+    def iter_playlist_videos(
+        self,
+        entry_urls: Iterable[str],
+        allowed_domains: List[str],
+        ordered: bool = True,
+        cancel: Optional[threading.Event] = None,
+    ) -> Iterator[VideoInfoOut]:
+        """
+        Resolve playlist entries through a bounded thread pool and yield each
+        VideoInfoOut as soon as it is ready.
+
+        - ordered=True: playlist order (an item waits only for the ones before it)
+        - ordered=False: completion order (fastest time-to-first-item)
+
+        At most playlist_workers extractions run at once and only a small window of
+        entries is submitted ahead, so closing the generator (client disconnect)
+        stops further work, as does setting `cancel`. Entries that fail are logged and skipped.
+        """
+        urls = iter(entry_urls)
+
+        def _resolve(entry_url: str) -> Optional[VideoInfoOut]:
+            try:
+                return self.get_video_info(entry_url, allowed_domains)
+            except Exception:
+                self.logger.exception("Failed to build VideoInfoOut for playlist entry url=%s", entry_url)
+                return None
+
+        workers = self.playlist_workers
+        executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="playlist-info")
+        window = workers * 2
+        pending_ordered: Deque[Future] = deque()
+        pending_any: Set[Future] = set()
+
+        def _submit_next() -> Optional[Future]:
+            if cancel is not None and cancel.is_set():
+                return None
+            entry_url = next(urls, None)
+            if entry_url is None:
+                return None
+            return executor.submit(_resolve, entry_url)
+
+        try:
+            initial = [executor.submit(_resolve, u) for u in islice(urls, window)]
+            if ordered:
+                pending_ordered.extend(initial)
+                while pending_ordered:
+                    if cancel is not None and cancel.is_set():
+                        break
+                    result = pending_ordered.popleft().result()
+                    fut = _submit_next()
+                    if fut is not None:
+                        pending_ordered.append(fut)
+                    if result is not None:
+                        yield result
+            else:
+                pending_any.update(initial)
+                while pending_any:
+                    if cancel is not None and cancel.is_set():
+                        break
+                    done, pending_any = wait(pending_any, return_when=FIRST_COMPLETED)
+                    for finished in done:
+                        fut = _submit_next()
+                        if fut is not None:
+                            pending_any.add(fut)
+                        result = finished.result()
+                        if result is not None:
+                            yield result
+        finally:
+            for fut in list(pending_ordered) + list(pending_any):
+                fut.cancel()
+            executor.shutdown(wait=False, cancel_futures=True)
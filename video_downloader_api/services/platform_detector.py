@@ -2,11 +2,65 @@
 
 from __future__ import annotations
 
-from typing import List
-from urllib.parse import urlparse, urlunparse, parse_qsl, urlencode
+import re
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import urlparse, urlunparse, parse_qs, parse_qsl, urlencode
 
 from video_downloader_api.enums import Platform
 
+_YOUTUBE_ID = re.compile(r"^[0-9A-Za-z_-]{11}$")
+# /shorts/ID, /embed/ID, /live/ID, /v/ID, /e/ID (youtube.com, m.youtube.com, music.youtube.com)
+_YOUTUBE_PATH_ID = re.compile(r"^/(?:shorts|embed|live|v|e)/([0-9A-Za-z_-]{11})(?:[/?]|$)")
+# /p/CODE, /reel/CODE, /reels/CODE, /tv/CODE, optionally under /<username>/
+_INSTAGRAM_POST = re.compile(r"^/(?:[\w.]+/)?(?:p|reels?|tv)/([\w-]+)")
+# /<page>/videos/<id>, /<page>/videos/<slug>/<id>, /reel/<id> (/watch?v=<id> is read from the query)
+_FACEBOOK_PATH_ID = re.compile(r"^/(?:[^/]+/videos/(?:[^/]+/)?|reel/)(\d+)(?:[/?]|$)")
+# /@user/video/<id>, /@user/photo/<id>, /v/<id>.html, /embed/<id>, /embed/v2/<id>
+_TIKTOK_PATH_ID = re.compile(r"^/(?:@[^/]+/(?:video|photo)/|v/|embed/(?:v2/)?)(\d+)")
+
+
+def _youtube_content_id(host: str, path: str, query: Dict[str, List[str]]) -> Optional[str]:
+    if host == "youtu.be":
+        candidate = path.strip("/").split("/")[0]
+        return candidate if _YOUTUBE_ID.match(candidate) else None
+    if path.rstrip("/") == "/watch":
+        candidate = (query.get("v") or [""])[0]
+        return candidate if _YOUTUBE_ID.match(candidate) else None
+    m = _YOUTUBE_PATH_ID.match(path)
+    return m.group(1) if m else None
+
+
+def _instagram_content_id(host: str, path: str, query: Dict[str, List[str]]) -> Optional[str]:
+    m = _INSTAGRAM_POST.match(path)
+    return m.group(1) if m else None
+
+
+def _facebook_content_id(host: str, path: str, query: Dict[str, List[str]]) -> Optional[str]:
+    # fb.watch/<token> and /share/v/<token> are opaque redirects: no content id without a request
+    if host == "fb.watch":
+        return None
+    if path.rstrip("/") in ("/watch", "/watch/live", "/video.php"):
+        candidate = (query.get("v") or [""])[0]
+        return candidate if candidate.isdigit() else None
+    m = _FACEBOOK_PATH_ID.match(path)
+    return m.group(1) if m else None
+
+
+def _tiktok_content_id(host: str, path: str, query: Dict[str, List[str]]) -> Optional[str]:
+    # vm./vt.tiktok.com short links are opaque redirects
+    if host.startswith(("vm.", "vt.")):
+        return None
+    m = _TIKTOK_PATH_ID.match(path)
+    return m.group(1) if m else None
+
+
+_CONTENT_ID_EXTRACTORS: Dict[str, Callable[[str, str, Dict[str, List[str]]], Optional[str]]] = {
+    Platform.YOUTUBE.value: _youtube_content_id,
+    Platform.INSTAGRAM.value: _instagram_content_id,
+    Platform.FACEBOOK.value: _facebook_content_id,
+    Platform.TIKTOK.value: _tiktok_content_id,
+}
+
 
 class PlatformDetector:
     """
@@ -84,6 +138,38 @@ class PlatformDetector:
 
         return Platform.UNKNOWN.value
 
+    def content_key(self, url: str) -> Optional[Tuple[str, str]]:
+        """
+        Stable (platform, content_id) for a URL, independent of the link format
+        it was shared in, e.g. all of these give ("youtube", "dQw4w9WgXcQ"):
+        youtu.be/dQw4w9WgXcQ, youtube.com/watch?v=dQw4w9WgXcQ&t=30,
+        m.youtube.com/watch?v=dQw4w9WgXcQ, youtube.com/shorts/dQw4w9WgXcQ
+
+        Returns None for unknown platforms and URL shapes without an id in them
+        (playlists, profiles, short-link redirects such as fb.watch / vm.tiktok.com).
+        """
+        platform = self.detect_platform(url)
+        extractor = _CONTENT_ID_EXTRACTORS.get(platform)
+        if extractor is None:
+            return None
+
+        parsed = urlparse(url if url.startswith(("http://", "https://")) else "https://" + url)
+        host = (parsed.netloc or "").lower().split(":")[0]
+        if host.startswith("www."):
+            host = host[4:]
+        content_id = extractor(host, parsed.path or "/", parse_qs(parsed.query))
+        return (platform, content_id) if content_id else None
+
+    def cache_key(self, url: str) -> str:
+        """
+        Key for caches/dedup: "platform:content_id" when the URL has a content id,
+        otherwise the normalized URL.
+        """
+        key = self.content_key(url)
+        if key is not None:
+            return f"{key[0]}:{key[1]}"
+        return self.normalize_url(url)
+
     def is_allowed_domain(self, url: str, allowed_domains: List[str]) -> bool:
         """
         Checks hostname matches allowed domains (exact or subdomain).
@@ -0,0 +1,289 @@
+# video_downloader_api/services/progress_board.py
+
+from __future__ import annotations
+
+import math
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+import zlib
+from functools import lru_cache
+from typing import Dict, NamedTuple, Optional
+
+from video_downloader_api.core.config import get_settings
+from video_downloader_api.core.logger import get_logger
+from video_downloader_api.enums import TERMINAL_STATUSES
+
+_MAGIC = b"VDAPB001"
+# magic, slot count, slot size (padded to 64 bytes)
+_HEADER = struct.Struct("<8sII")
+_HEADER_SIZE = 64
+
+# Slot: seq (seqlock: odd while a write is in progress) + body
+_SEQ = struct.Struct("<Q")
+# job_id, status, downloaded_bytes, total_bytes (-1 = unknown), speed_bps (NaN = unknown),
+# eta_sec (-1 = unknown), updated_at (unix time)
+_BODY = struct.Struct("<40s16sqqdqd")
+_SLOT_SIZE = 128
+
+# Linear probing bound for claims and lookups (keeps reads O(1) on a crowded board)
+_MAX_PROBES = 64
+# Seqlock read attempts before giving up (caller falls back to the DB)
+_READ_RETRIES = 16
+# Slots of finished/failed/canceled jobs can be reused after this many seconds
+_TERMINAL_REUSE_SEC = 60.0
+
+
+class BoardEntry(NamedTuple):
+    """Consistent snapshot of one job's slot."""
+
+    job_id: str
+    status: str
+    downloaded_bytes: int
+    total_bytes: Optional[int]
+    speed_bps: Optional[float]
+    eta_sec: Optional[int]
+    updated_at: float
+    seq: int
+
+    @property
+    def percent(self) -> Optional[float]:
+        if self.total_bytes and self.total_bytes > 0:
+            return round((self.downloaded_bytes / self.total_bytes) * 100.0, 2)
+        return None
+
+
+def _default_path() -> str:
+    base = "/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir()
+    return os.path.join(base, "vda-progress.board")
+
+
+class ProgressBoard:
+    """
+    Fixed-slot progress board in a shared mmap file (single host: API + Celery workers).
+
+    - workers write status/downloaded/total/speed/eta of their job into its slot on
+      every progress hook (a few microseconds, no DB or network)
+    - slot table keyed by job id: open addressing on crc32(job_id), a slot is claimed
+      under an flock on the board file; slots are never emptied, only reused once their
+      job is terminal (or stale), so lookup chains stay intact
+    - one writer per slot (the worker running the job); readers use the slot's seqlock
+      and retry on a torn read, giving up -> None (callers fall back to the DB)
+    """
+
+    def __init__(self, path: Optional[str] = None, slots: int = 4096, stale_sec: float = 3600.0) -> None:
+        self.path = path or _default_path()
+        self.stale_sec = float(stale_sec)
+        self.logger = get_logger(self.__class__.__name__)
+
+        self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o660)
+        self._slots = self._init_file(max(1, int(slots)))
+        self._mm = mmap.mmap(self._fd, _HEADER_SIZE + self._slots * _SLOT_SIZE)
+
+        # Slots claimed by this process (writer side), job_id -> index
+        self._owned: Dict[str, int] = {}
+        self._owned_lock = threading.Lock()
+
+    @property
+    def slots(self) -> int:
+        return self._slots
+
+    def _lock_file(self) -> None:
+        import fcntl  # local import: POSIX only, board is opt-in
+
+        fcntl.flock(self._fd, fcntl.LOCK_EX)
+
+    def _unlock_file(self) -> None:
+        import fcntl
+
+        fcntl.flock(self._fd, fcntl.LOCK_UN)
+
+    def _init_file(self, slots: int) -> int:
+        """Create/validate the header; the first process to create the board sets its size."""
+        self._lock_file()
+        try:
+            header = os.pread(self._fd, _HEADER.size, 0)
+            if len(header) == _HEADER.size:
+                magic, existing, slot_size = _HEADER.unpack(header)
+                if magic == _MAGIC and slot_size == _SLOT_SIZE and existing > 0:
+                    size = _HEADER_SIZE + existing * _SLOT_SIZE
+                    if os.fstat(self._fd).st_size >= size:
+                        return existing
+            # New or foreign file: zero it and write our header
+            os.ftruncate(self._fd, 0)
+            os.ftruncate(self._fd, _HEADER_SIZE + slots * _SLOT_SIZE)
+            os.pwrite(self._fd, _HEADER.pack(_MAGIC, slots, _SLOT_SIZE), 0)
+            return slots
+        finally:
+            self._unlock_file()
+
+    def _offset(self, index: int) -> int:
+        return _HEADER_SIZE + index * _SLOT_SIZE
+
+    def _home(self, key: bytes) -> int:
+        return zlib.crc32(key) % self._slots
+
+    # ---- writer side (worker) ----
+
+    def _claim(self, job_id: str, key: bytes) -> Optional[int]:
+        """Find this job's slot or take a free/reusable one (under the file lock)."""
+        now = time.time()
+        self._lock_file()
+        try:
+            home = self._home(key)
+            candidate: Optional[int] = None
+            for i in range(min(self._slots, _MAX_PROBES)):
+                index = (home + i) % self._slots
+                slot_key, status, _, _, _, _, updated_at = _BODY.unpack_from(self._mm, self._offset(index) + _SEQ.size)
+                if slot_key.rstrip(b"\0") == key:
+                    return index
+                if not slot_key.strip(b"\0"):
+                    # End of the chain: the job is not on the board
+                    return candidate if candidate is not None else self._take(index, key)
+                if candidate is None and self._reusable(status, updated_at, now):
+                    candidate = index
+            if candidate is not None:
+                return self._take(candidate, key)
+            return None
+        finally:
+            self._unlock_file()
+
+    def _reusable(self, status: bytes, updated_at: float, now: float) -> bool:
+        age = now - updated_at
+        if status.rstrip(b"\0").decode("ascii", "replace") in TERMINAL_STATUSES:
+            return age >= _TERMINAL_REUSE_SEC
+        return age >= self.stale_sec
+
+    def _take(self, index: int, key: bytes) -> int:
+        offset = self._offset(index)
+        seq = _SEQ.unpack_from(self._mm, offset)[0]
+        # Even seq: a worker that died mid-write must not block readers forever
+        seq += 2 - (seq & 1)
+        _SEQ.pack_into(self._mm, offset, seq + 1)
+        _BODY.pack_into(self._mm, offset + _SEQ.size, key, b"queued", 0, -1, math.nan, -1, time.time())
+        _SEQ.pack_into(self._mm, offset, seq + 2)
+        return index
+
+    def write(
+        self,
+        job_id: str,
+        status: str,
+        downloaded_bytes: int = 0,
+        total_bytes: Optional[int] = None,
+        speed_bps: Optional[float] = None,
+        eta_sec: Optional[int] = None,
+    ) -> bool:
+        """Publish a job's progress; False when the board has no room (readers use the DB)."""
+        key = job_id.encode("ascii", "replace")[:40]
+        with self._owned_lock:
+            index = self._owned.get(job_id)
+        if index is None:
+            index = self._claim(job_id, key)
+            if index is None:
+                return False
+            with self._owned_lock:
+                self._owned[job_id] = index
+
+        offset = self._offset(index)
+        seq = _SEQ.unpack_from(self._mm, offset)[0]
+        _SEQ.pack_into(self._mm, offset, seq + 1)
+        _BODY.pack_into(
+            self._mm,
+            offset + _SEQ.size,
+            key,
+            status.encode("ascii", "replace")[:16],
+            int(downloaded_bytes or 0),
+            -1 if total_bytes is None else int(total_bytes),
+            math.nan if speed_bps is None else float(speed_bps),
+            -1 if eta_sec is None else int(eta_sec),
+            time.time(),
+        )
+        _SEQ.pack_into(self._mm, offset, seq + 2)
+
+        if status in TERMINAL_STATUSES:
+            # Slot stays readable until reused; this process is done writing it
+            with self._owned_lock:
+                self._owned.pop(job_id, None)
+        return True
+
+    def set_status(self, job_id: str, status: str) -> bool:
+        """Change a job's status keeping its last progress numbers."""
+        entry = self.read(job_id)
+        if entry is None:
+            return self.write(job_id, status)
+        return self.write(job_id, status, entry.downloaded_bytes, entry.total_bytes, entry.speed_bps, entry.eta_sec)
+
+    # ---- reader side (API) ----
+
+    def _read_slot(self, index: int) -> Optional[BoardEntry]:
+        offset = self._offset(index)
+        for attempt in range(_READ_RETRIES):
+            if attempt:
+                # Writer is mid-update (~1us): let it finish
+                time.sleep(0)
+            seq = _SEQ.unpack_from(self._mm, offset)[0]
+            if seq & 1:
+                continue
+            body = _BODY.unpack_from(self._mm, offset + _SEQ.size)
+            if _SEQ.unpack_from(self._mm, offset)[0] != seq:
+                continue
+            key, status, downloaded, total, speed, eta, updated_at = body
+            return BoardEntry(
+                job_id=key.rstrip(b"\0").decode("ascii", "replace"),
+                status=status.rstrip(b"\0").decode("ascii", "replace"),
+                downloaded_bytes=downloaded,
+                total_bytes=None if total < 0 else total,
+                speed_bps=None if math.isnan(speed) else speed,
+                eta_sec=None if eta < 0 else eta,
+                updated_at=updated_at,
+                seq=seq,
+            )
+        return None
+
+    def read(self, job_id: str) -> Optional[BoardEntry]:
+        """Consistent snapshot of a job's slot, None if the job has no slot (or it is busy)."""
+        key = job_id.encode("ascii", "replace")[:40]
+        home = self._home(key)
+        for i in range(min(self._slots, _MAX_PROBES)):
+            entry = self._read_slot((home + i) % self._slots)
+            if entry is None:
+                return None
+            if entry.job_id == job_id:
+                return entry
+            if not entry.job_id:
+                return None
+        return None
+
+    def stats(self) -> Dict[str, int]:
+        used = active = 0
+        for index in range(self._slots):
+            entry = self._read_slot(index)
+            if entry is None or not entry.job_id:
+                continue
+            used += 1
+            if entry.status not in TERMINAL_STATUSES:
+                active += 1
+        return {"slots": self._slots, "used": used, "active": active, "owned_here": len(self._owned)}
+
+
+@lru_cache(maxsize=1)
+def get_progress_board() -> Optional[ProgressBoard]:
+    """
+    Process-wide board, None unless PROGRESS_BOARD_ENABLED (or the file cannot be
+    mapped, e.g. no fcntl on this platform): callers then use the DB only.
+    """
+    settings = get_settings()
+    if not settings.PROGRESS_BOARD_ENABLED:
+        return None
+    try:
+        return ProgressBoard(
+            path=settings.PROGRESS_BOARD_PATH,
+            slots=settings.PROGRESS_BOARD_SLOTS,
+            stale_sec=settings.PROGRESS_BOARD_STALE_SEC,
+        )
+    except Exception:
+        get_logger("ProgressBoard").exception("Progress board unavailable; using the DB only.")
+        return None
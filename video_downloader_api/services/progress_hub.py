@@ -0,0 +1,239 @@
+# video_downloader_api/services/progress_hub.py
+
+from __future__ import annotations
+
+import asyncio
+import threading
+import time
+from collections import deque
+from functools import lru_cache, partial
+from typing import Any, Deque, Dict, List, Optional, Set, Tuple
+
+from video_downloader_api.core.config import get_settings
+from video_downloader_api.core.logger import get_logger
+from video_downloader_api.enums import TERMINAL_STATUSES
+from video_downloader_api.services.events_service import EventsService, get_events_service
+
+# (event id, payload); ids increase per job within this process
+JobEvent = Tuple[int, dict]
+
+
+def is_terminal_event(payload: dict) -> bool:
+    """
+    True for the job's final event.
+
+    Progress hook events also report status "finished" (one per downloaded file,
+    e.g. video + audio before merge) but always carry "progress"; the job-level
+    events published by the task never do.
+    """
+    return payload.get("status") in TERMINAL_STATUSES and "progress" not in payload
+
+
+class ProgressWatcher:
+    """
+    One async consumer (an SSE client) of a job's events.
+
+    Latest-value conflating slot: a slow client skips intermediate progress
+    updates instead of queueing them, so memory per watcher is constant.
+    offer() runs on the watcher's event loop (scheduled via call_soon_threadsafe).
+    """
+
+    __slots__ = ("job_id", "loop", "_latest", "_wake")
+
+    def __init__(self, job_id: str, loop: asyncio.AbstractEventLoop) -> None:
+        self.job_id = job_id
+        self.loop = loop
+        self._latest: Optional[JobEvent] = None
+        self._wake = asyncio.Event()
+
+    def offer(self, job_id: str, event: JobEvent) -> None:
+        self._latest = event
+        self._wake.set()
+
+    async def next(self, timeout: Optional[float] = None) -> Optional[JobEvent]:
+        """Latest event since the last call, or None when timeout passes without one."""
+        if self._latest is None:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                return None
+        self._wake.clear()
+        event, self._latest = self._latest, None
+        return event
+
+
+class ProgressBatch:
+    """
+    Many-job consumer (one WebSocket connection): latest event per job_id,
+    drained as one batch per tick. Same conflating rule as ProgressWatcher,
+    memory is bounded by the number of subscribed jobs.
+    """
+
+    __slots__ = ("loop", "_pending", "_wake", "closed")
+
+    def __init__(self, loop: asyncio.AbstractEventLoop) -> None:
+        self.loop = loop
+        self._pending: Dict[str, JobEvent] = {}
+        self._wake = asyncio.Event()
+        self.closed = False
+
+    def offer(self, job_id: str, event: JobEvent) -> None:
+        current = self._pending.get(job_id)
+        # Snapshots are offered locally and may race live events: keep the newest id
+        if current is None or event[0] >= current[0]:
+            self._pending[job_id] = event
+        self._wake.set()
+
+    def discard(self, job_id: str) -> None:
+        self._pending.pop(job_id, None)
+
+    def close(self) -> None:
+        """Wake drain() for good (connection closed)."""
+        self.closed = True
+        self._wake.set()
+
+    async def drain(self, timeout: Optional[float] = None) -> Dict[str, JobEvent]:
+        """Pending events (job_id -> latest event); {} when timeout passes without any."""
+        if not self._pending and not self.closed:
+            try:
+                await asyncio.wait_for(self._wake.wait(), timeout=timeout)
+            except asyncio.TimeoutError:
+                return {}
+        self._wake.clear()
+        batch, self._pending = self._pending, {}
+        return batch
+
+
+class _JobChannel:
+    __slots__ = ("seq", "buffer", "watchers", "callback", "idle_since")
+
+    def __init__(self, buffer_size: int) -> None:
+        self.seq = 0
+        self.buffer: Deque[JobEvent] = deque(maxlen=buffer_size)
+        self.watchers: Set[Any] = set()
+        self.callback: Any = None
+        self.idle_since: Optional[float] = None
+
+
+class ProgressHub:
+    """
+    Fans EventsService events out to asyncio consumers without a thread per client.
+
+    - one EventsService subscription per watched job (not per client); the callback
+      numbers each event, keeps the last buffer_size in a ring buffer (Last-Event-ID
+      replay) and hands it to every watcher's loop with call_soon_threadsafe
+    - a job stays subscribed for linger_sec after its last watcher leaves, so a
+      client reconnecting with Last-Event-ID gets what it missed in between
+    - event ids are per process: a reconnect landing on another API process gets
+      an unknown/out-of-range id and falls back to the DB snapshot
+    """
+
+    def __init__(self, events: EventsService, buffer_size: int = 32, linger_sec: float = 60.0) -> None:
+        self.events = events
+        self.buffer_size = max(1, int(buffer_size))
+        self.linger_sec = max(0.0, float(linger_sec))
+        self.logger = get_logger(self.__class__.__name__)
+
+        self._lock = threading.Lock()
+        self._jobs: Dict[str, _JobChannel] = {}
+
+    def _on_event(self, job_id: str, payload: dict) -> None:
+        # Runs on the publisher's / Redis listener's thread: never block here
+        with self._lock:
+            channel = self._jobs.get(job_id)
+            if channel is None:
+                return
+            channel.seq += 1
+            event = (channel.seq, payload)
+            channel.buffer.append(event)
+            watchers = list(channel.watchers)
+
+        for w in watchers:
+            try:
+                w.loop.call_soon_threadsafe(w.offer, job_id, event)
+            except RuntimeError:
+                # Loop already closed (client gone during shutdown)
+                pass
+
+    def watch(self, job_id: str, last_event_id: Optional[int] = None) -> Tuple[ProgressWatcher, Optional[List[JobEvent]], int]:
+        """
+        Register a single-job watcher (call from the event loop); see subscribe().
+        """
+        watcher = ProgressWatcher(job_id, asyncio.get_running_loop())
+        replay, seq = self.subscribe(job_id, watcher, last_event_id)
+        return watcher, replay, seq
+
+    def unwatch(self, watcher: ProgressWatcher) -> None:
+        self.unsubscribe(watcher.job_id, watcher)
+
+    def subscribe(self, job_id: str, sink: Any, last_event_id: Optional[int] = None) -> Tuple[Optional[List[JobEvent]], int]:
+        """
+        Deliver job_id's events to sink (ProgressWatcher / ProgressBatch: has .loop
+        and .offer(job_id, event)).
+
+        Returns (replay, seq):
+        - replay: events after last_event_id when the ring buffer still covers them
+          ([] when the client is up to date), None when a DB snapshot is needed
+        - seq: id of the newest event seen so far (use it as the snapshot's id)
+        """
+        subscribe = None
+        with self._lock:
+            self._reap_locked()
+            channel = self._jobs.get(job_id)
+            if channel is None:
+                channel = _JobChannel(self.buffer_size)
+                channel.callback = subscribe = partial(self._on_event, job_id)
+                self._jobs[job_id] = channel
+            channel.watchers.add(sink)
+            channel.idle_since = None
+
+            replay: Optional[List[JobEvent]] = None
+            if last_event_id is not None and 0 <= last_event_id <= channel.seq:
+                oldest = channel.buffer[0][0] if channel.buffer else channel.seq + 1
+                if last_event_id + 1 >= oldest:
+                    replay = [e for e in channel.buffer if e[0] > last_event_id]
+            seq = channel.seq
+
+        if subscribe is not None:
+            self.events.add_subscriber(job_id, subscribe)
+        return replay, seq
+
+    def unsubscribe(self, job_id: str, sink: Any) -> None:
+        with self._lock:
+            channel = self._jobs.get(job_id)
+            if channel is not None:
+                channel.watchers.discard(sink)
+                if not channel.watchers:
+                    channel.idle_since = time.monotonic()
+            self._reap_locked()
+
+    def _reap_locked(self) -> None:
+        """Drop channels idle for longer than linger_sec (caller holds _lock)."""
+        now = time.monotonic()
+        expired = [
+            job_id
+            for job_id, ch in self._jobs.items()
+            if ch.idle_since is not None and now - ch.idle_since >= self.linger_sec
+        ]
+        for job_id in expired:
+            channel = self._jobs.pop(job_id)
+            # EventsService takes its own lock only: no lock-order issue
+            self.events.remove_subscriber(job_id, channel.callback)
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            return {
+                "jobs": len(self._jobs),
+                "watchers": sum(len(ch.watchers) for ch in self._jobs.values()),
+            }
+
+
+@lru_cache(maxsize=1)
+def get_progress_hub() -> ProgressHub:
+    """Process-wide hub (one per uvicorn worker) on top of get_events_service()."""
+    settings = get_settings()
+    return ProgressHub(
+        events=get_events_service(),
+        buffer_size=settings.SSE_REPLAY_BUFFER_SIZE,
+        linger_sec=settings.SSE_JOB_LINGER_SEC,
+    )
@@ -2,11 +2,29 @@
 
 from __future__ import annotations
 
-from typing import Any, Callable, Dict, Optional
+import time
+from typing import Any, Callable, Dict, Optional, Tuple
 
+from video_downloader_api.core.config import get_settings
 from video_downloader_api.core.logger import get_logger
 from video_downloader_api.repositories.job_repo import JobRepository
 from video_downloader_api.services.events_service import EventsService
+from video_downloader_api.services.progress_board import ProgressBoard
+
+# (status, downloaded_bytes, total_bytes, speed_bps, eta_sec, percent)
+_Progress = Tuple[str, int, Optional[int], Optional[float], Optional[int], Optional[float]]
+
+
+class _JobProgressState:
+    """Throttling state of one job: last write + latest not-yet-written progress."""
+
+    __slots__ = ("last_write_at", "last_percent", "last_status", "pending")
+
+    def __init__(self) -> None:
+        self.last_write_at = 0.0
+        self.last_percent: Optional[float] = None
+        self.last_status: Optional[str] = None
+        self.pending: Optional[_Progress] = None
 
 
 class ProgressService:
@@ -20,13 +38,42 @@ class ProgressService:
     - total_bytes_estimate
     - speed
     - eta
+
+    Hooks arrive many times per second, so writes are throttled and coalesced:
+    a hook is written (DB update + event) only if min_interval_ms passed since the
+    last write or percent moved by min_percent_delta. The first hook, status changes
+    (e.g. downloading -> finished) and "finished" hooks are always written. Skipped
+    hooks only keep the latest values; flush(job_id) writes them (call it before the
+    job's final status is set).
+
+    With a ProgressBoard (single host), every hook is also written to the job's
+    shared-memory slot (unthrottled, no I/O) so status reads there are always current.
     """
 
-    def __init__(self, repo_factory: Callable[[], JobRepository], events: EventsService) -> None:
+    def __init__(
+        self,
+        repo_factory: Callable[[], JobRepository],
+        events: EventsService,
+        min_interval_ms: Optional[int] = None,
+        min_percent_delta: Optional[float] = None,
+        board: Optional[ProgressBoard] = None,
+    ) -> None:
+        settings = get_settings()
         self.repo_factory = repo_factory
         self.events = events
+        self.board = board
+        if min_interval_ms is None:
+            min_interval_ms = settings.PROGRESS_MIN_INTERVAL_MS
+        if min_percent_delta is None:
+            min_percent_delta = settings.PROGRESS_MIN_PERCENT_DELTA
+        self.min_interval_sec = max(0, int(min_interval_ms)) / 1000.0
+        self.min_percent_delta = max(0.0, float(min_percent_delta))
         self.logger = get_logger(self.__class__.__name__)
 
+        self._states: Dict[str, _JobProgressState] = {}
+        self.hooks_received = 0
+        self.writes_issued = 0
+
     def _safe_int(self, v: Any) -> Optional[int]:
         try:
             if v is None:
@@ -47,9 +94,11 @@ class ProgressService:
         """
         Called repeatedly by yt-dlp progress_hooks.
         - Extract downloaded/total/speed/eta
+        - Throttle (see class docstring)
         - Update DB via JobRepository
         - Publish events for SSE/WebSocket
         """
+        self.hooks_received += 1
         try:
             status = str(hook_data.get("status") or "")
 
@@ -66,30 +115,75 @@ class ProgressService:
             if total_bytes and total_bytes > 0:
                 percent = round((downloaded_bytes / total_bytes) * 100.0, 2)
 
-            # Save progress to DB
-            repo = self.repo_factory()
-            repo.update_progress(
-                job_id=job_id,
-                downloaded_bytes=downloaded_bytes,
-                total_bytes=total_bytes,
-                speed_bps=speed_bps,
-                eta_sec=eta_sec,
-            )
-
-            # Publish event (client can render live progress)
-            payload = {
-                "job_id": job_id,
-                "status": status,
-                "progress": {
-                    "downloaded_bytes": downloaded_bytes,
-                    "total_bytes": total_bytes,
-                    "speed_bps": speed_bps,
-                    "eta_sec": eta_sec,
-                    "percent": percent,
-                },
-            }
-            self.events.publish(job_id, payload)
+            if self.board is not None:
+                # Job-level status: per-file "finished" hooks do not finish the job
+                self.board.write(job_id, "downloading", downloaded_bytes, total_bytes, speed_bps, eta_sec)
+
+            progress: _Progress = (status, downloaded_bytes, total_bytes, speed_bps, eta_sec, percent)
+            state = self._states.get(job_id)
+            if state is None:
+                state = self._states[job_id] = _JobProgressState()
+
+            now = time.monotonic()
+            if status != state.last_status or status == "finished" or self._due(state, now, percent):
+                self._write(job_id, state, progress, now)
+            else:
+                state.pending = progress
 
         except Exception:
             # Never crash the download because of progress parsing issues
             self.logger.exception("ProgressService.handle_hook failed for job_id=%s", job_id)
+
+    def _due(self, state: _JobProgressState, now: float, percent: Optional[float]) -> bool:
+        if now - state.last_write_at >= self.min_interval_sec:
+            return True
+        if percent is not None and state.last_percent is not None:
+            return abs(percent - state.last_percent) >= self.min_percent_delta
+        return False
+
+    def _write(self, job_id: str, state: _JobProgressState, progress: _Progress, now: float) -> None:
+        status, downloaded_bytes, total_bytes, speed_bps, eta_sec, percent = progress
+
+        # Save progress to DB
+        repo = self.repo_factory()
+        repo.update_progress(
+            job_id=job_id,
+            downloaded_bytes=downloaded_bytes,
+            total_bytes=total_bytes,
+            speed_bps=speed_bps,
+            eta_sec=eta_sec,
+        )
+
+        # Publish event (client can render live progress)
+        payload = {
+            "job_id": job_id,
+            "status": status,
+            "progress": {
+                "downloaded_bytes": downloaded_bytes,
+                "total_bytes": total_bytes,
+                "speed_bps": speed_bps,
+                "eta_sec": eta_sec,
+                "percent": percent,
+            },
+        }
+        self.events.publish(job_id, payload)
+
+        self.writes_issued += 1
+        state.last_write_at = now
+        state.last_percent = percent
+        state.last_status = status
+        state.pending = None
+
+    def flush(self, job_id: str) -> None:
+        """Write the latest throttled-away progress of a job (no-op if nothing is pending)."""
+        state = self._states.get(job_id)
+        if state is None or state.pending is None:
+            return
+        try:
+            self._write(job_id, state, state.pending, time.monotonic())
+        except Exception:
+            self.logger.exception("ProgressService.flush failed for job_id=%s", job_id)
+
+    def stats(self) -> Dict[str, int]:
+        """Hooks received vs writes issued (DB update + event) by this service."""
+        return {"hooks_received": self.hooks_received, "writes_issued": self.writes_issued}
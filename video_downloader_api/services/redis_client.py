@@ -0,0 +1,68 @@
+# video_downloader_api/services/redis_client.py
+
+from __future__ import annotations
+
+import time
+from typing import Any, Callable, Optional
+
+from video_downloader_api.core.logger import get_logger
+
+# After a Redis error, skip Redis for this many seconds (avoid paying socket timeouts on every call)
+REDIS_RETRY_AFTER_SEC = 30.0
+
+
+class LazyRedis:
+    """
+    Lazily created Redis client of one optional Redis feature (metadata cache L2,
+    single-flight, info hand-off, events, queue depth probe, fair queue).
+
+    Callers fail open: get() returns None without a URL, when the client cannot be
+    created, or for retry_after_sec after a command failed (failed()), so an outage
+    costs one socket timeout per window instead of one per request.
+    on_connect(client) runs once on the new client (e.g. registering Lua scripts).
+    """
+
+    def __init__(
+        self,
+        url: Optional[str],
+        owner: str,
+        socket_timeout: float = 0.5,
+        retry_after_sec: float = REDIS_RETRY_AFTER_SEC,
+        on_connect: Optional[Callable[[Any], None]] = None,
+    ) -> None:
+        self.url = url or None
+        self.owner = owner
+        self.socket_timeout = socket_timeout
+        self.retry_after_sec = retry_after_sec
+        self.on_connect = on_connect
+        self.logger = get_logger(owner)
+        self._client: Any = None
+        self._disabled_until = 0.0
+
+    def get(self) -> Any:
+        if not self.url:
+            return None
+        if time.monotonic() < self._disabled_until:
+            return None
+        if self._client is None:
+            try:
+                import redis  # local import: optional at runtime
+
+                client = redis.Redis.from_url(
+                    self.url,
+                    socket_timeout=self.socket_timeout,
+                    socket_connect_timeout=0.5,
+                )
+                if self.on_connect is not None:
+                    self.on_connect(client)
+                self._client = client
+            except Exception:
+                self.logger.exception("%s: Redis client init failed.", self.owner)
+                self._disabled_until = time.monotonic() + self.retry_after_sec
+                return None
+        return self._client
+
+    def failed(self, op: str, effect: str = "disabled") -> None:
+        """A command failed: get() returns None for retry_after_sec."""
+        self._disabled_until = time.monotonic() + self.retry_after_sec
+        self.logger.warning("%s: Redis %s failed; %s for %ss.", self.owner, op, effect, int(self.retry_after_sec))
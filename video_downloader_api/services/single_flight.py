@@ -0,0 +1,189 @@
+# video_downloader_api/services/single_flight.py
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+import uuid
+from functools import lru_cache
+from typing import Any, Callable, Dict, Optional
+
+from video_downloader_api.core.config import get_settings
+from video_downloader_api.core.logger import get_logger
+from video_downloader_api.models.video_info import VideoInfo
+from video_downloader_api.services.redis_client import LazyRedis
+
+# Delete the lock only if we still own it (token matches)
+_RELEASE_LOCK_LUA = """
+if redis.call("get", KEYS[1]) == ARGV[1] then
+    return redis.call("del", KEYS[1])
+end
+return 0
+"""
+
+
+class _Call:
+    """One in-flight call: followers wait on `done` and read result/error."""
+
+    __slots__ = ("done", "result", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.result: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """
+    In-process request coalescing.
+
+    Concurrent do(key, fn) calls with the same key run fn only once; every caller
+    gets the same result (or the same exception). Once the call finishes the key
+    is forgotten, so this is NOT a cache.
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[str, _Call] = {}
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = _Call()
+                self._calls[key] = call
+
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.result
+
+        try:
+            call.result = fn()
+            return call.result
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+
+
+class RedisSingleFlight(SingleFlight):
+    """
+    Multi-instance variant of SingleFlight backed by a Redis lock.
+
+    - Callers inside one process are first coalesced in-process (SingleFlight).
+    - The process-level leader takes a Redis lock (SET NX PX). The lock owner runs fn
+      and publishes the encoded result under a short-lived result key.
+    - Other instances poll for that result key while the lock is held.
+    - If the owner dies or fails (lock gone, no result) or the wait times out,
+      the follower runs fn itself. Redis errors degrade to plain in-process behavior.
+    """
+
+    def __init__(
+        self,
+        redis_url: str,
+        key_prefix: str = "vda:sf:",
+        lock_ttl_sec: float = 60.0,
+        wait_timeout_sec: float = 60.0,
+        result_ttl_sec: float = 30.0,
+        poll_interval_sec: float = 0.05,
+        encode: Callable[[Any], str] = lambda v: json.dumps(v, default=str),
+        decode: Callable[[bytes], Any] = json.loads,
+    ) -> None:
+        super().__init__()
+        self.redis_url = redis_url
+        self.key_prefix = key_prefix
+        self.lock_ttl_ms = int(lock_ttl_sec * 1000)
+        self.wait_timeout_sec = wait_timeout_sec
+        self.result_ttl_ms = int(result_ttl_sec * 1000)
+        self.poll_interval_sec = poll_interval_sec
+        self.encode = encode
+        self.decode = decode
+        self.logger = get_logger(self.__class__.__name__)
+        self._redis = LazyRedis(redis_url, self.__class__.__name__, socket_timeout=1.0)
+
+    def _client(self) -> Any:
+        return self._redis.get()
+
+    def do(self, key: str, fn: Callable[[], Any]) -> Any:
+        return super().do(key, lambda: self._do_distributed(key, fn))
+
+    def _do_distributed(self, key: str, fn: Callable[[], Any]) -> Any:
+        client = self._client()
+        if client is None:
+            return fn()
+
+        lock_key = f"{self.key_prefix}lock:{key}"
+        result_key = f"{self.key_prefix}result:{key}"
+        token = uuid.uuid4().hex
+
+        try:
+            acquired = client.set(lock_key, token, nx=True, px=self.lock_ttl_ms)
+        except Exception:
+            self._redis.failed("lock acquire", "coalescing across instances disabled")
+            return fn()
+
+        if acquired:
+            try:
+                result = fn()
+                try:
+                    client.set(result_key, self.encode(result), px=self.result_ttl_ms)
+                except Exception:
+                    self.logger.warning("RedisSingleFlight: failed to publish result for key=%s", key)
+                return result
+            finally:
+                try:
+                    client.eval(_RELEASE_LOCK_LUA, 1, lock_key, token)
+                except Exception:
+                    # Lock expires on its own (PX)
+                    pass
+
+        # Another instance is extracting: wait for its result
+        deadline = time.monotonic() + self.wait_timeout_sec
+        try:
+            while time.monotonic() < deadline:
+                raw = client.get(result_key)
+                if raw is not None:
+                    return self.decode(raw)
+                if not client.exists(lock_key):
+                    # Owner finished; it may have published just before releasing
+                    raw = client.get(result_key)
+                    if raw is not None:
+                        return self.decode(raw)
+                    break
+                time.sleep(self.poll_interval_sec)
+        except Exception:
+            self.logger.warning("RedisSingleFlight: wait failed for key=%s; running locally.", key)
+
+        return fn()
+
+
+@lru_cache(maxsize=1)
+def get_single_flight() -> Optional[SingleFlight]:
+    """
+    Process-wide single-flight group for metadata extraction.
+
+    METADATA_SINGLE_FLIGHT_BACKEND:
+    - "off": no coalescing (returns None)
+    - "local": in-process only
+    - "redis": in-process + Redis lock across instances (results shared as VideoInfo JSON)
+    """
+    settings = get_settings()
+    backend = (settings.METADATA_SINGLE_FLIGHT_BACKEND or "").strip().lower()
+    if backend == "off":
+        return None
+    if backend == "redis":
+        return RedisSingleFlight(
+            redis_url=settings.REDIS_URL,
+            lock_ttl_sec=settings.METADATA_SINGLE_FLIGHT_LOCK_TTL_SEC,
+            wait_timeout_sec=settings.METADATA_SINGLE_FLIGHT_WAIT_SEC,
+            encode=VideoInfo.to_json,
+            decode=VideoInfo.from_json,
+        )
+    return SingleFlight()
@@ -9,10 +9,17 @@ from sqlalchemy.orm import Session
 
 from video_downloader_api.core.config import get_settings
 from video_downloader_api.core.logger import get_logger
+from video_downloader_api.downloader.base import DownloadCanceledError
 from video_downloader_api.downloader.ytdlp_downloader import YtDlpDownloader
+from video_downloader_api.enums import TERMINAL_STATUSES
 from video_downloader_api.repositories.job_repo import JobRepository
-from video_downloader_api.services.events_service import EventsService
+from video_downloader_api.services.cancellation import CancellationToken
+from video_downloader_api.services.download_queues import queue_for_platform
+from video_downloader_api.services.events_service import get_events_service
+from video_downloader_api.services.fair_queue import get_fair_dispatcher
 from video_downloader_api.services.file_manager import FileManager
+from video_downloader_api.services.info_handoff import get_info_handoff_store
+from video_downloader_api.services.progress_board import get_progress_board
 from video_downloader_api.services.progress_service import ProgressService
 from video_downloader_api.services.storage_service import StorageService
 
@@ -24,11 +31,16 @@ def execute_download(job_id: str, db: Session) -> None:
     Worker-side execution for a download job.
 
     Steps:
-    - set status downloading
+    - set status downloading (claim: only a queued job runs, once)
     - compute output path
-    - call downloader.download(... progress_cb=ProgressService.handle_hook)
+    - load the stored /info extraction result if the job references one
+    - call downloader.download(... progress_cb=ProgressService.handle_hook, throttled)
+    - flush throttled progress before the final status
     - on success: set status finished + file path/url
     - on error: status failed + error
+    - canceled (DELETE /download/{job_id}): the progress hook aborts the download
+      (CancellationToken), partial files are removed; status was set by the API
+    - done (any outcome): free the job's fair-queue slot so its lane releases the next job
     """
     settings = get_settings()
     repo = JobRepository(db)
@@ -37,22 +49,40 @@ def execute_download(job_id: str, db: Session) -> None:
     if not job:
         logger.error("Job not found: %s", job_id)
         return
+    dispatcher = get_fair_dispatcher()
+    if job.status != "queued":
+        # canceled while queued, or a duplicate of a job re-enqueued by priority aging
+        logger.info("job_id=%s is %s, not queued; skipping.", job_id, job.status)
+        if dispatcher is not None and job.status in TERMINAL_STATUSES:
+            dispatcher.complete(queue_for_platform(job.platform), job_id)
+        return
 
     storage = StorageService(base_dir=settings.DOWNLOAD_DIR)
     file_manager = FileManager()
 
-    # NOTE: In-memory EventsService will not work across processes in real production.
-    # For now, we still publish events (useful when API+worker in same process or for future Redis pubsub).
-    events = EventsService()
+    # EVENTS_BACKEND=redis delivers these to the API's /download/stream subscribers
+    events = get_events_service()
 
     # Repo factory that reuses current session/repo
     repo_factory: Callable[[], JobRepository] = lambda: repo
-    progress_service = ProgressService(repo_factory=repo_factory, events=events)
+    # Single-host progress board (None unless PROGRESS_BOARD_ENABLED)
+    board = get_progress_board()
+    progress_service = ProgressService(repo_factory=repo_factory, events=events, board=board)
 
     downloader = YtDlpDownloader()
+    cancel_token = CancellationToken(job_id=job_id, repo_factory=repo_factory)
+
+    def _on_progress(hook: dict) -> None:
+        # Raises DownloadCanceledError (aborts yt-dlp) once the job is canceled
+        cancel_token.check()
+        progress_service.handle_hook(job_id, hook)
 
-    # Mark job downloading
-    repo.update_status(job_id, "downloading", error=None)
+    # Mark job downloading (only if still queued: canceled or claimed by another copy since it was read)
+    if not repo.claim_job(job_id):
+        logger.info("job_id=%s no longer queued; skipping.", job_id)
+        return
+    if board is not None:
+        board.write(job_id, "downloading")
 
     try:
         # Output path: use video title when available so saved file has original name
@@ -65,28 +95,72 @@ def execute_download(job_id: str, db: Session) -> None:
         # Cleanup old partials if any
         file_manager.cleanup_job_files(job_id=job_id, base_dir=settings.DOWNLOAD_DIR)
 
+        # Start from the API's extraction when it is still stored (None -> downloader extracts)
+        info = None
+        info_store = get_info_handoff_store()
+        if job.info_ref and info_store is not None:
+            info = info_store.load(job.info_ref)
+        logger.info("job_id=%s starting download (stored info: %s)", job_id, "yes" if info else "no")
+
         # Download and stream progress updates through hook
         final_path = downloader.download(
             url=job.source_url,
             format_id=job.format_id or "best",
             output_path=output_path,
-            progress_cb=lambda hook: progress_service.handle_hook(job_id, hook),
+            progress_cb=_on_progress,
+            platform=job.platform,
+            info=info,
+            # Post-processing (ffmpeg) and a fallback extraction fire no progress hooks
+            cancel_check=lambda: cancel_token.check(force=True),
         )
 
+        cancel_token.check(force=True)
+        progress_service.flush(job_id)
+
         # Store canonical absolute path so API and worker agree (fixes 404 when CWD differs)
         final_path_abs = os.path.normpath(os.path.abspath(final_path))
 
         # Set finished status + file info
         public_url = storage.public_url_for(job_id)
-        repo.set_file(job_id=job_id, file_path=final_path_abs, public_url=public_url)
-        repo.update_status(job_id, "finished", error=None)
+        if not repo.finish_job(job_id, file_path=final_path_abs, public_url=public_url):
+            raise DownloadCanceledError(f"Job {job_id} was canceled.")
+        # After the DB commit: board readers fetch file/url details from the row
+        if board is not None:
+            board.set_status(job_id, "finished")
 
         # Final event
         events.publish(job_id, {"job_id": job_id, "status": "finished", "public_url": public_url})
 
+    except DownloadCanceledError:
+        # Status/event were written by the API; free the slot and the disk
+        file_manager.cleanup_job_files(job_id=job_id, base_dir=settings.DOWNLOAD_DIR)
+        if board is not None:
+            board.set_status(job_id, "canceled")
+        latency_ms = cancel_token.latency_ms()
+        logger.info(
+            "job_id=%s canceled; download stopped and files removed %s after the request",
+            job_id,
+            f"{latency_ms:.0f} ms" if latency_ms is not None else "(unknown)",
+        )
+
     except Exception as e:
         logger.exception("Download failed for job_id=%s", job_id)
-        repo.update_status(job_id, "failed", error=str(e))
-        events.publish(job_id, {"job_id": job_id, "status": "failed", "error": str(e)})
+        progress_service.flush(job_id)
+        failed = repo.update_status(job_id, "failed", error=str(e), unless_status=("canceled",))
+        if board is not None:
+            board.set_status(job_id, "failed" if failed else "canceled")
+        if failed:
+            events.publish(job_id, {"job_id": job_id, "status": "failed", "error": str(e)})
         # Cleanup partial files on failure
         file_manager.cleanup_job_files(job_id=job_id, base_dir=settings.DOWNLOAD_DIR)
+    finally:
+        stats = progress_service.stats()
+        logger.info(
+            "job_id=%s progress hooks received=%d writes issued=%d cancel checks=%d",
+            job_id,
+            stats["hooks_received"],
+            stats["writes_issued"],
+            cancel_token.checks,
+        )
+        if dispatcher is not None:
+            dispatcher.complete(queue_for_platform(job.platform), job_id)
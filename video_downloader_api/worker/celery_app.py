@@ -1,7 +1,17 @@
 from __future__ import annotations
 
 from celery import Celery
+from celery.signals import celeryd_init, worker_process_init, worker_ready, worker_shutdown
+from kombu import Queue
+
 from video_downloader_api.core.config import get_settings
+from video_downloader_api.services.download_queues import (
+    DEFAULT_QUEUE,
+    PRIORITY_SEP,
+    PRIORITY_STEPS,
+    all_lanes,
+    select_lanes,
+)
 
 settings = get_settings()
 
@@ -11,13 +21,87 @@ celery_app = Celery(
     backend=settings.REDIS_URL,
 )
 
-celery_app.conf.task_default_queue = "downloads"
+# One queue per platform ("downloads.youtube", ...) + "downloads" as the fallback.
+# DownloadService picks the queue from DownloadJob.platform when it enqueues.
+celery_app.conf.task_queues = [Queue(lane.queue) for lane in all_lanes()]
+celery_app.conf.task_default_queue = DEFAULT_QUEUE
 celery_app.conf.task_routes = {
-    "worker.tasks.run_download": {"queue": "downloads"},
+    "worker.tasks.run_download": {"queue": DEFAULT_QUEUE},
+}
+
+# Redis priority lists per queue, checked in priority order (0 first): shortest-job-first
+# within a lane (see services/download_scheduler.py). Messages without a priority use 0.
+celery_app.conf.broker_transport_options = {
+    "priority_steps": list(PRIORITY_STEPS),
+    "sep": PRIORITY_SEP,
+    "queue_order_strategy": "priority",
 }
 
-# Run multiple download tasks in parallel (override with: celery -A ... worker --concurrency=N)
-celery_app.conf.worker_concurrency = settings.MAX_CONCURRENT_DOWNLOADS
+# Queue subset for this worker (WORKER_QUEUES; -Q on the command line wins)
+_worker_lanes = select_lanes(settings.WORKER_QUEUES)
+
+# Run multiple download tasks in parallel (override with: celery -A ... worker --concurrency=N).
+# A worker on a lane subset gets the sum of those lanes' caps.
+if settings.WORKER_QUEUES:
+    celery_app.conf.worker_concurrency = sum(lane.concurrency for lane in _worker_lanes)
+else:
+    celery_app.conf.worker_concurrency = settings.MAX_CONCURRENT_DOWNLOADS
+celery_app.conf.worker_prefetch_multiplier = min(lane.prefetch_multiplier for lane in _worker_lanes)
+
+# Warm-up runs inside worker_process_init: give slow starts (DB connect, yt-dlp import) more than the 4s default
+celery_app.conf.worker_proc_alive_timeout = 30.0
+
+
+@celeryd_init.connect
+def _select_worker_queues(sender=None, instance=None, options=None, **_kwargs) -> None:
+    """Consume only the WORKER_QUEUES lanes unless the worker was started with -Q."""
+    if not settings.WORKER_QUEUES or (options or {}).get("queues"):
+        return
+    instance.app.amqp.queues.select([lane.queue for lane in _worker_lanes])
+
+
+@worker_ready.connect
+def _start_priority_aging(**_kwargs) -> None:
+    """Main worker process: re-enqueue long-waiting jobs one priority step higher."""
+    if not settings.DOWNLOAD_SJF_ENABLED:
+        return
+    from video_downloader_api.services.download_scheduler import get_priority_ager
+
+    get_priority_ager().start()
+
+
+@worker_ready.connect
+def _start_fair_dispatch_pump(**_kwargs) -> None:
+    """Main worker process: reconcile fair-queue leases with the DB and release tenant backlogs."""
+    from video_downloader_api.services.fair_queue import get_fair_dispatcher
+
+    dispatcher = get_fair_dispatcher()
+    if dispatcher is None:
+        return
+    from video_downloader_api.db.session import SessionLocal
+
+    dispatcher.start_pump(SessionLocal)
+
+
+@worker_shutdown.connect
+def _stop_fair_dispatch_pump(**_kwargs) -> None:
+    """Main worker process: stop the pump before the broker/DB connections go away."""
+    from video_downloader_api.services.fair_queue import get_fair_dispatcher
+
+    dispatcher = get_fair_dispatcher()
+    if dispatcher is not None:
+        dispatcher.stop_pump()
+
+
+@worker_process_init.connect
+def _warm_up_process(**_kwargs) -> None:
+    """Each prefork child warms up before it accepts its first task."""
+    if not settings.WORKER_WARMUP_ENABLED:
+        return
+    from video_downloader_api.worker.warmup import warm_up_worker
+
+    warm_up_worker()
+
 
 # ✅ simplest: directly import tasks so they register
 import video_downloader_api.worker.tasks  # noqa: F401
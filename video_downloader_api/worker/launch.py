@@ -0,0 +1,105 @@
+# video_downloader_api/worker/launch.py
+"""
+Start one Celery worker per download lane, each with its own concurrency and prefetch
+(DOWNLOAD_QUEUE_CONCURRENCY / DOWNLOAD_QUEUE_PREFETCH), so a backlog on one platform
+cannot take the slots of another.
+
+    python -m video_downloader_api.worker.launch                          # all lanes
+    python -m video_downloader_api.worker.launch --queues youtube,tiktok  # subset
+    python -m video_downloader_api.worker.launch --queues default -- --pool=solo
+
+Arguments after "--" are passed to every `celery worker`. If one worker exits,
+the others are stopped and its exit code is returned (let the supervisor restart).
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+from typing import List
+
+from video_downloader_api.core.config import get_settings
+from video_downloader_api.core.logger import get_logger
+from video_downloader_api.services.download_queues import QueueLane, select_lanes
+
+logger = get_logger("worker.launch")
+
+
+def worker_command(lane: QueueLane, loglevel: str, extra: List[str]) -> List[str]:
+    return [
+        sys.executable, "-m", "celery",
+        "-A", "video_downloader_api.worker.celery_app",
+        "worker",
+        "-Q", lane.queue,
+        "--concurrency", str(lane.concurrency),
+        "--prefetch-multiplier", str(lane.prefetch_multiplier),
+        "--hostname", f"{lane.name}@%h",
+        "--loglevel", loglevel,
+        *extra,
+    ]
+
+
+def main(argv: List[str] | None = None) -> int:
+    argv = list(sys.argv[1:] if argv is None else argv)
+    extra: List[str] = []
+    if "--" in argv:
+        extra = argv[argv.index("--") + 1:]
+        argv = argv[: argv.index("--")]
+
+    parser = argparse.ArgumentParser(description=__doc__.strip().split("\n\n")[0])
+    parser.add_argument(
+        "--queues",
+        default=get_settings().WORKER_QUEUES,
+        help='lanes to run, CSV of platform names and/or "default" (default: WORKER_QUEUES or all)',
+    )
+    parser.add_argument("--loglevel", default="info")
+    args = parser.parse_args(argv)
+
+    try:
+        lanes = select_lanes(args.queues)
+    except ValueError as e:
+        parser.error(str(e))
+
+    procs: List[subprocess.Popen] = []
+    for lane in lanes:
+        # Child settings see only its own lane (celery_app sizes the worker from WORKER_QUEUES)
+        env = {**os.environ, "WORKER_QUEUES": lane.name}
+        logger.info(
+            "Starting worker lane=%s queue=%s concurrency=%d prefetch=%d",
+            lane.name, lane.queue, lane.concurrency, lane.prefetch_multiplier,
+        )
+        procs.append(subprocess.Popen(worker_command(lane, args.loglevel, extra), env=env))
+
+    def _stop(signum: int, _frame: object = None) -> None:
+        for proc in procs:
+            if proc.poll() is None:
+                proc.send_signal(signum)
+
+    signal.signal(signal.SIGTERM, _stop)
+    signal.signal(signal.SIGINT, _stop)
+
+    exit_code = 0
+    try:
+        while procs:
+            for proc in list(procs):
+                code = proc.poll()
+                if code is None:
+                    continue
+                procs.remove(proc)
+                if code and not exit_code:
+                    # One lane died: stop the rest (warm shutdown) instead of running degraded
+                    exit_code = code
+                    _stop(signal.SIGTERM)
+            time.sleep(0.5)
+    finally:
+        for proc in procs:
+            proc.wait()
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,70 @@
+# video_downloader_api/worker/warmup.py
+
+from __future__ import annotations
+
+import shutil
+import time
+from typing import Callable, Dict
+
+from sqlalchemy import text
+
+from video_downloader_api.core.logger import get_logger
+
+logger = get_logger("worker.warmup")
+
+
+def _warm_db() -> None:
+    from video_downloader_api.db.session import engine
+
+    # Connections inherited from the parent process must not be reused after fork
+    engine.dispose(close=False)
+    with engine.connect() as conn:
+        conn.execute(text("SELECT 1"))
+
+
+def _check_ffmpeg() -> None:
+    if not shutil.which("ffmpeg"):
+        # Quality downloads merge bestvideo+bestaudio and convert to mp4: both need ffmpeg
+        logger.warning("Warm-up: ffmpeg not found on PATH; merged (video+audio) downloads will fail.")
+
+
+def _warm_downloader() -> None:
+    from video_downloader_api.downloader.ytdlp_downloader import YtDlpDownloader
+
+    YtDlpDownloader().warm_up()
+
+
+_STEPS: Dict[str, Callable[[], None]] = {
+    "db": _warm_db,
+    "ffmpeg": _check_ffmpeg,
+    "downloader": _warm_downloader,
+}
+
+
+def warm_up_worker() -> Dict[str, float]:
+    """
+    Preload everything the first download would otherwise pay for
+    (yt-dlp import + extractors, DB pool, ffmpeg lookup, pooled YoutubeDL).
+
+    Each step is independent: a failure is logged and the worker still starts.
+
+    Returns:
+        Step durations in milliseconds (plus "total").
+    """
+    timings: Dict[str, float] = {}
+    started = time.perf_counter()
+    for name, step in _STEPS.items():
+        t = time.perf_counter()
+        try:
+            step()
+        except Exception:
+            logger.exception("Warm-up step '%s' failed (worker continues).", name)
+        timings[name] = round((time.perf_counter() - t) * 1000.0, 1)
+    timings["total"] = round((time.perf_counter() - started) * 1000.0, 1)
+
+    logger.info(
+        "Worker warm-up done in %.1f ms (%s)",
+        timings["total"],
+        ", ".join(f"{k}={v}ms" for k, v in timings.items() if k != "total"),
+    )
+    return timings